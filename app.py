@@ -1,7 +1,14 @@
 import os
 import streamlit as st
-from graph import build_graph
-from graph.state import GraphState
+
+from llm.llm_client import load_env
+load_env()   # before the graph modules read their settings
+from graph import get_graph
+from graph.session import ConversationSession
+from graph.session_store import make_session_store
+from graph.streaming import stream_turn
+from graph.warmup import warm_up
+from telemetry import metrics, profiling
 from graph.tools.location import get_client_location_data
 from streamlit_js_eval import get_geolocation
 
@@ -164,22 +171,56 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Lazy-build the compiled graph and stash it in the session
-if "graph" not in st.session_state:
-    st.session_state.graph = build_graph()
+def _facts_markdown(facts: dict) -> str:
+    """Fetched facts (a streaming "facts" event) as a short markdown block shown while the answer is written."""
+    lines = []
+    wx = facts.get("weather")
+    if wx:
+        deg = lambda v: "?" if v is None else f"{v:g}°"
+        days = [f"{d['date']}: {deg(d['tmax'])}/{deg(d['tmin'])}" + (f" ({d['precip']}%)" if d["precip"] is not None else "")
+                for d in wx["days"][:3]]
+        more = f" … +{len(wx['days']) - 3} days" if len(wx["days"]) > 3 else ""
+        lines.append(f"🌤️ **{wx['place']}** — " + "; ".join(days) + more)
+    cf = facts.get("country")
+    if cf:
+        lines.append(f"🌍 **{cf['name']}** — capital {cf['capital']}, currency {', '.join(cf['currencies'])}")
+    if facts.get("web"):
+        lines.append(f"🔎 {len(facts['web'])} web results")
+    if facts.get("unavailable"):
+        lines.append(f"⚠️ Unavailable: {', '.join(facts['unavailable'])}")
+    return "  \n".join(lines)
+
+@st.cache_resource
+def _shared_graph():
+    """Process-wide compiled graph, warmed up once when the first session starts."""
+    print(f"DEBUG: warm-up: {warm_up()}")
+    return get_graph()
+
+@st.cache_resource
+def _session_store():
+    """Process-wide durable session store (SESSION_STORE), or None when disabled."""
+    return make_session_store()
+
+# All sessions share the compiled graph (and its checkpointer, GRAPH_CHECKPOINTER,
+# default "memory"); each session keeps its conversation under its own thread id.
+# With a session store the thread id is kept in the URL (?sid=...), so a reload or a
+# restarted server resumes the conversation from the store.
+if "session" not in st.session_state:
+    store = _session_store()
+    record = store.load(st.query_params["sid"]) if store and "sid" in st.query_params else None
+    if record:
+        st.session_state.session = ConversationSession.resume(_shared_graph(), record)
+        st.session_state.chat_started = True
+    else:
+        st.session_state.session = ConversationSession(_shared_graph())
+        if store:
+            st.query_params["sid"] = st.session_state.session.thread.thread_id
 
 # ---------- 2) Session state (persist across turns) ----------
-for key, default in [
-    ("history", []),              # list[dict]: {"role": "user"/"assistant", "content": "..."}
-    ("intent", None),             # last intent (for sticky-travel rule)
-    ("offtopic_count", 0),        # consecutive smalltalk turns
-    ("summary", ""),              # running TL;DR
-    ("user_profile", {}),         # destinations MRU, dates, style, etc.
-    ("data", {}),                 # tool facts, caches, flags (web_allowed, units), etc.
-    ("chat_started", False),      # Track if user has started chatting
-]:
-    if key not in st.session_state:
-        st.session_state[key] = default
+# Conversation state (history, intent, summary, profile, data) lives on the ConversationSession
+if "chat_started" not in st.session_state:
+    st.session_state.chat_started = False  # Track if user has started chatting
+session: ConversationSession = st.session_state.session
 
 location = get_geolocation()
 
@@ -195,8 +236,7 @@ if location and isinstance(location, dict) and "coords" in location:
         else:
             location_data = None
         if location_data:
-            st.session_state.user_profile["current_location"] = location_data["location_string"]
-            st.session_state.user_profile["location_data"] = location_data
+            session.set_location(location_data)
             st.session_state["location_detected"] = True
         else:
             st.session_state["location_detected"] = True
@@ -242,7 +282,14 @@ if not st.session_state.chat_started:
 st.markdown('<div class="chat-container">', unsafe_allow_html=True)
 
 # ---------- 3) Chat transcript ----------
-for msg in st.session_state.history:
+# Older turns are compacted; decompress and render them only when asked
+n_cold = session.history.cold_count()
+if n_cold and st.toggle(f"Show {n_cold} earlier messages"):
+    for msg in session.history.cold():
+        with st.chat_message(msg["role"]):
+            st.write(msg["content"])
+
+for msg in session.history.hot():
     with st.chat_message(msg["role"]):
         st.write(msg["content"])
 
@@ -253,7 +300,6 @@ if user_msg:
     st.session_state.chat_started = True
     
     # Show user's bubble immediately
-    st.session_state.history.append({"role": "user", "content": user_msg})
     with st.chat_message("user"):
         st.write(user_msg)
 
@@ -264,39 +310,30 @@ if user_msg:
     with assistant_placeholder.container():
         with st.chat_message("assistant"):
             st.write("Thinking...")
-    
-    # Prepare graph input state
-    state: GraphState = {
-        "history": st.session_state.history,
-        "user_msg": user_msg,
-        "user_profile": st.session_state.user_profile,
-        "summary": st.session_state.summary,
-        "data": {**(st.session_state.data or {}), "web_allowed": True, "units": "metric"},
-        "intent": st.session_state.intent,
-        "offtopic_count": st.session_state.offtopic_count,
-    }
-
-    # Run the graph
-    out = st.session_state.graph.invoke(state)
-
-    # Persist fields across turns
-    st.session_state.intent = out.get("intent", st.session_state.intent)
-    st.session_state.offtopic_count = out.get("offtopic_count", st.session_state.offtopic_count)
-    st.session_state.summary = out.get("summary", st.session_state.summary)
-    st.session_state.user_profile = out.get("user_profile", st.session_state.user_profile)
-    st.session_state.data = out.get("data", st.session_state.data)
 
-    # Get the final response
-    assistant_text = out.get("final")
-    if not assistant_text:
-        assistant_text = out.get("draft", "(no reply)")
-
-    # Replace the entire assistant message with the final response
-    with assistant_placeholder.container():
-        with st.chat_message("assistant"):
-            st.write(assistant_text)
+    with profiling.profile_turn():  # no-op unless PROFILE_TURNS is set
+        # Stream the graph; the placeholder shows the running stage and, once fetched, the facts.
+        # The session records both messages and carries state to the next turn.
+        assistant_text, facts_md = "(no reply)", ""
+        for ev in stream_turn(session, user_msg):
+            kind, data = ev["event"], ev["data"]
+            if kind == "stage":
+                with assistant_placeholder.container():
+                    with st.chat_message("assistant"):
+                        # One element, so the final reply below replaces all of it
+                        st.markdown(f"_{data['label']}_" + (f"  \n{facts_md}" if facts_md else ""))
+            elif kind == "facts":
+                facts_md = _facts_markdown(data)
+            elif kind == "done":
+                assistant_text = data["reply"]
+                print(f"DEBUG: turn timings (ms): {data['timings']} total={data['total_ms']}")
+        if _session_store():
+            _session_store().save(session.thread.thread_id, session.sections())  # written in the background
+        metrics.export()  # no-op unless METRICS_EXPORT is set
 
-    # Add to history
-    st.session_state.history.append({"role": "assistant", "content": assistant_text})
+        # Replace the entire assistant message (status and facts) with the final response
+        with assistant_placeholder.container():
+            with st.chat_message("assistant"):
+                st.write(assistant_text)
 
 st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1 @@
+# Microbenchmarks for per-turn pure-Python code; run with `python -m benchmarks.run`.
@@ -0,0 +1,208 @@
+from __future__ import annotations
+from datetime import timedelta
+from typing import Callable, Dict, List, NamedTuple
+
+from . import fixtures as fx
+
+# Benchmark cases. Each case is a setup function that builds its inputs once and returns the
+# zero-argument callable to time; `ops` is how many operations one call performs, so results
+# are reported per operation (e.g. per message of a corpus).
+
+
+class Case(NamedTuple):
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    ops: int
+
+
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, ops: int = 1):
+    def register(setup: Callable[[], Callable[[], object]]):
+        CASES[name] = Case(name, setup, ops)
+        return setup
+    return register
+
+
+def select(patterns: List[str]) -> List[Case]:
+    """Cases whose name contains any of `patterns` (all cases if none given)."""
+    return [c for c in CASES.values() if not patterns or any(p in c.name for p in patterns)]
+
+
+# ------------------------------ merge --------------------------------
+
+@case("merge.deep_merge.node_update")
+def _deep_merge_small():
+    from graph.helpers.merge import deep_merge
+    state, update = fx.compose_state(days=3), fx.profile_update()
+    return lambda: deep_merge(state, update)
+
+
+@case("merge.deep_merge.large_profile")
+def _deep_merge_large():
+    from graph.helpers.merge import deep_merge
+    state = fx.compose_state()
+    update = {"user_profile": fx.large_profile(80), "data": {"facts": {"weather_by_place": fx.weather_by_place()}}}
+    return lambda: deep_merge(state, update)
+
+
+@case("merge.deep_merge.unchanged")
+def _deep_merge_unchanged():
+    # plan_tools on a follow-up: same plan and flags as the previous turn
+    from graph.helpers.merge import deep_merge
+    data = deep_merge(fx.compose_state()["data"], {"plan": {"weather": True, "place": "Paris"}, "web_allowed": True})
+    return lambda: deep_merge(data, {"plan": {"weather": True, "place": "Paris"}, "web_allowed": True})
+
+
+@case("merge.fetch_data_facts")
+def _fetch_data_facts():
+    # fetch_data's facts update: new per-turn facts, weather_by_place replaced after put_place
+    from graph.helpers.facts_store import prune, put_place
+    from graph.helpers.merge import deep_merge, updated
+    data = deep_merge(fx.compose_state()["data"], {})
+    prev = data["facts"]
+    new = {"now": "2025-03-14T10:00:00+01:00", "today": "2025-03-14", "timezone": "Europe/Paris",
+           "weather_current": "Rome", "unavailable": [], "target_dates": ["2025-03-15", "2025-03-16"]}
+    place = {"name": "Rome", "country": "IT", "latitude": 41.9, "longitude": 12.5}
+    wx = fx.forecast_payload(seed=99)
+
+    def run():
+        wbp = put_place(prev["weather_by_place"], "Rome", place, wx, now=fx.NOW_TS)
+        return updated(data, facts=updated(deep_merge(prev, new), weather_by_place=prune(wbp, fx.NOW_TS)))
+    return run
+
+
+# ---------------------------- destinations ----------------------------
+
+def _message_states() -> List[dict]:
+    profile = fx.large_profile()
+    return [{"user_msg": m, "user_profile": profile, "data": {}} for m in fx.MESSAGES]
+
+
+@case("destinations.resolve_place", ops=len(fx.MESSAGES))
+def _resolve_place():
+    from graph.helpers.destinations import resolve_place
+    states = _message_states()
+    return lambda: [resolve_place(s) for s in states]
+
+
+@case("destinations.score_place", ops=len(fx.MESSAGES))
+def _score_place():
+    from graph.helpers.destinations import score_place
+    states = _message_states()
+    return lambda: [score_place(s) for s in states]
+
+
+@case("destinations.extract_country_and_city", ops=len(fx.MESSAGES))
+def _extract_country_and_city():
+    from graph.helpers.destinations import _extract_country_and_city
+    return lambda: [_extract_country_and_city(m) for m in fx.MESSAGES]
+
+
+# ------------------------------ policies ------------------------------
+
+@case("policies.hint_weather", ops=len(fx.MESSAGES))
+def _hint_weather():
+    from graph.policies import hint_weather
+    return lambda: [hint_weather(m) for m in fx.MESSAGES]
+
+
+@case("policies.hint_country_facts", ops=len(fx.MESSAGES))
+def _hint_country_facts():
+    from graph.policies import hint_country_facts
+    return lambda: [hint_country_facts(m) for m in fx.MESSAGES]
+
+
+@case("policies.hint_web_search", ops=len(fx.MESSAGES))
+def _hint_web_search():
+    from graph.policies import hint_web_search
+    return lambda: [hint_web_search(m) for m in fx.MESSAGES]
+
+
+@case("keywords.scan.uncached", ops=len(fx.MESSAGES))
+def _scan_uncached():
+    # The one pass per message that the cached hint_*/follow-up/pronoun checks share
+    from graph.helpers.keywords import scan
+    return lambda: [scan.__wrapped__(m) for m in fx.MESSAGES]
+
+
+# ------------------------------- dates --------------------------------
+
+_BASES = [(fx.BASE_DATE + timedelta(days=i)).isoformat() for i in range(7)]
+
+
+@case("timeplan.resolve_relative_dates", ops=3 * len(_BASES))
+def _resolve_relative_dates():
+    from graph.helpers.timeplan import resolve_relative_dates
+    return lambda: [resolve_relative_dates(t, b) for b in _BASES for t in ("today", "tomorrow", "weekend")]
+
+
+@case("timeparse.parse_time_expression", ops=len(fx.MESSAGES))
+def _parse_time_expression():
+    from graph.helpers.timeparse import parse_time_expression
+    return lambda: [parse_time_expression(m, fx.BASE_DATE) for m in fx.MESSAGES]
+
+
+# -------------------------------- llm ---------------------------------
+
+@case("llm.clean_json_response", ops=len(fx.llm_json_responses()))
+def _clean_json_response():
+    from llm.llm_client import _clean_json_response
+    responses = fx.llm_json_responses()
+    return lambda: [_clean_json_response(r) for r in responses]
+
+
+# ------------------------------ compose -------------------------------
+
+@case("compose.facts_brief.1day")
+def _facts_brief_1day():
+    from graph.nodes import build_facts_brief
+    state = fx.compose_state(days=1)
+    return lambda: build_facts_brief(state, "Paris")
+
+
+@case("compose.facts_brief.3day")
+def _facts_brief_3day():
+    from graph.nodes import build_facts_brief
+    state = fx.compose_state(days=3)
+    return lambda: build_facts_brief(state, "Paris")
+
+
+@case("compose.facts_brief.16day")
+def _facts_brief_16day():
+    from graph.nodes import build_facts_brief
+    state = fx.compose_state(days=16)
+    return lambda: build_facts_brief(state, "Paris")
+
+
+@case("compose.weather_template.3day")
+def _weather_template():
+    from graph.helpers.weather_answer import render
+    state = {**fx.compose_state(days=3), "intent": "weather", "user_msg": "weather in Paris this weekend?"}
+    return lambda: render(state, "Paris", fx.BASE_DATE.isoformat())
+
+
+@case("compose.fact_check.3day")
+def _fact_check():
+    from graph.helpers.fact_check import check_draft
+    from graph.helpers.merge import updated
+    state = fx.compose_state(days=3)
+    state = {**state, "data": updated(state["data"], plan={"weather": True})}
+    draft = ("Paris looks warm with rain later.\n- 2025-03-14: 27°/17° (precip 33%)\n"
+             "- 2025-03-15: 25°/15° (precip 7%)\n- 2025-03-16: 18°/8° (precip 70%)")
+    return lambda: check_draft(draft, state, "Paris")
+
+
+@case("compose.template_format")
+def _compose_format():
+    from graph.nodes import build_facts_brief
+    from graph.prompts import COMPOSE_TMPL, REASONING_CHECKLIST, STRICT_FACTS_POLICY, SYSTEM_PROMPT
+    state = fx.compose_state(days=3)
+    facts = build_facts_brief(state, "Paris")
+    recent = "\n".join(f"{m['role']}: {m['content']}" for m in state["history"][-4:])
+    return lambda: COMPOSE_TMPL.format(
+        system=SYSTEM_PROMPT, facts=facts, summary=state["summary"], recent=recent,
+        facts_policy=STRICT_FACTS_POLICY, checklist=REASONING_CHECKLIST,
+        user_msg=state["user_msg"], now=fx.BASE_DATE.isoformat(),
+    )
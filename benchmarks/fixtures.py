@@ -0,0 +1,156 @@
+from __future__ import annotations
+import json
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from graph.helpers.facts_store import put_place
+
+# Deterministic, realistically sized inputs for the microbenchmarks.
+# Sizes follow what a long session accumulates: a profile with dozens of past destinations,
+# a full facts store of 16-day forecasts, and chatty history.
+
+BASE_DATE = date(2025, 3, 14)   # a Friday
+NOW_TS = 1_741_950_000.0         # fixed fetched_at so the facts store never expires entries
+
+CITIES = [
+    ("Paris", "FR", 48.85, 2.35), ("Tokyo", "JP", 35.68, 139.69), ("Rome", "IT", 41.9, 12.5),
+    ("Lisbon", "PT", 38.72, -9.14), ("Barcelona", "ES", 41.39, 2.17), ("Sofia", "BG", 42.7, 23.32),
+    ("Tel Aviv", "IL", 32.08, 34.78), ("New York", "US", 40.71, -74.0), ("Berlin", "DE", 52.52, 13.4),
+    ("Cairo", "EG", 30.04, 31.24), ("Amman", "JO", 31.95, 35.93), ("Athens", "GR", 37.98, 23.73),
+]
+
+MESSAGES = [
+    "What's the weather like in Paris today?",
+    "and tomorrow?",
+    "Suggest a destination 2 hours away from me",
+    "What should I pack for a trip to Tokyo in December?",
+    "What are the top attractions in Rome?",
+    "Compare the weather in Barcelona vs Madrid",
+    "I'm traveling to bulgaria to sofia next week, will it rain?",
+    "going to lisbon, portugal from 2025-03-20 to 2025-03-27",
+    "what currency do they use there and do I need a visa?",
+    "is the Louvre open today or closed for the strike?",
+    "thanks!",
+    "how about the previous one?",
+    "2",
+    "Weather in New York this weekend please",
+    "what's the latest news about events this weekend in Berlin",
+    "visiting italy in the summer, what plug type do they use?",
+    "what time zone is Cairo in",
+    "Is it going to be sunny in Athens on Saturday?",
+    "ok what about the first city we talked about",
+    "I want somewhere warm with beaches, not too far, maybe 3-4 hours flight, in late April with kids",
+    "hi there",
+    "Tell me more about Tel Aviv, what's the temperature there next Tuesday?",
+    "and the day after tomorrow",
+    "how far is Amman from here and what's the weather for the next 10 days",
+]
+
+
+def forecast_payload(days: int = 16, start: date = BASE_DATE, seed: int = 0) -> Dict[str, Any]:
+    """An Open-Meteo daily forecast response with `days` days."""
+    rng = random.Random(seed)
+    tmax = [round(rng.uniform(8, 31), 1) for _ in range(days)]
+    return {
+        "timezone": "Europe/Paris",
+        "daily": {
+            "time": [(start + timedelta(days=i)).isoformat() for i in range(days)],
+            "temperature_2m_max": tmax,
+            "temperature_2m_min": [round(t - rng.uniform(4, 11), 1) for t in tmax],
+            "precipitation_probability_max": [rng.randrange(0, 101) for _ in range(days)],
+        },
+    }
+
+
+def weather_by_place(places: int = 8, days: int = 16) -> Dict[str, Any]:
+    wbp: Dict[str, Any] = {}
+    for i, (name, cc, lat, lon) in enumerate(CITIES[:places]):
+        place = {"name": name, "country": cc, "latitude": lat, "longitude": lon, "timezone": "Europe/Paris"}
+        wbp = put_place(wbp, name, place, forecast_payload(days, seed=i), now=NOW_TS)
+    return wbp
+
+
+def large_profile(destinations: int = 40) -> Dict[str, Any]:
+    names = [f"{CITIES[i % len(CITIES)][0]}" + ("" if i < len(CITIES) else f" {i}") for i in range(destinations)]
+    return {
+        "destinations": names,
+        "active_destination": names[-1],
+        "destination": names[-1],
+        "current_location": "Lyon, Auvergne-Rhône-Alpes, France",
+        "location_data": {
+            "location_string": "Lyon, Auvergne-Rhône-Alpes, France",
+            "latitude": 45.764, "longitude": 4.8357, "country_code": "FR", "timezone": "Europe/Paris",
+        },
+        "travel_dates": {"start": "2025-03-20", "end": "2025-03-27"},
+        "preferences": {
+            "style": "relaxed", "budget": "mid", "interests": ["museums", "food", "hiking", "beaches", "wine"],
+            "companions": {"adults": 2, "children": 2, "ages": [6, 9]},
+            "units": "metric", "language": "en",
+        },
+        "notes": {f"note_{i}": f"remember detail {i} about the trip" for i in range(20)},
+    }
+
+
+def long_history(messages: int = 200) -> List[Dict[str, str]]:
+    rng = random.Random(1)
+    out = []
+    for i in range(messages):
+        if i % 2 == 0:
+            out.append({"role": "user", "content": MESSAGES[i // 2 % len(MESSAGES)]})
+        else:
+            words = " ".join(rng.choice(("sunny", "mild", "pack", "layers", "umbrella", "museum", "walk"))
+                             for _ in range(rng.randrange(30, 90)))
+            out.append({"role": "assistant", "content": f"Here is what I found: {words}."})
+    return out
+
+
+def compose_state(days: int = 16, place: str = "Paris") -> Dict[str, Any]:
+    """State as compose_answer sees it after fetch_data for a `days`-day weather question."""
+    wbp = weather_by_place()
+    target = [(BASE_DATE + timedelta(days=i)).isoformat() for i in range(days)]
+    return {
+        "user_msg": f"What's the weather in {place} for the next {days} days?",
+        "intent": "weather",
+        "history": long_history(12),
+        "summary": "User lives in Lyon, is planning a family trip in late March and compared Paris, Rome and Tokyo. "
+                   "Prefers mild weather and museums; travels with two children.",
+        "user_profile": large_profile(),
+        "data": {
+            "resolved_place": place,
+            "facts": {
+                "now": f"{BASE_DATE.isoformat()}T09:30:00+01:00",
+                "today": BASE_DATE.isoformat(),
+                "target_dates": target,
+                "weather_by_place": wbp,
+                "weather_current": place,
+                "country": {"name": "France", "capital": "Paris", "currencies": ["EUR"]},
+                "web": [{"title": f"Things to do in {place} ({i})", "url": f"https://example.com/{i}"} for i in range(5)],
+            },
+        },
+    }
+
+
+def profile_update() -> Dict[str, Any]:
+    """A typical node return merged into state: a new facts entry plus profile slots."""
+    return {
+        "data": {"facts": {"today": BASE_DATE.isoformat(), "target_dates": [BASE_DATE.isoformat()]},
+                 "resolved_place": "Rome"},
+        "user_profile": {"active_destination": "Rome", "preferences": {"style": "active"}},
+    }
+
+
+def llm_json_responses() -> List[str]:
+    """Raw structured-output strings as models return them: fenced, prefixed, with control chars."""
+    answer = {"answer": "Paris will be mild this week: highs of 14–18°C, lows around 8°C, "
+                        "with showers likely on Tuesday and Wednesday. Pack a light rain jacket.",
+              "confidence": 0.82}
+    plan = {"intent": "weather", "needs": ["weather", "country"], "place": "Paris", "dates": ["2025-03-14"]}
+    long_answer = {"answer": " ".join(f"Day {i}: {15 + i % 7}°C, precip {i * 5 % 90}%." for i in range(16)),
+                   "confidence": 0.9}
+    return [
+        json.dumps(answer),
+        "```json\n" + json.dumps(plan, indent=2) + "\n```",
+        "Sure! Here is the JSON you asked for:\n" + json.dumps(answer) + "\nLet me know if you need more.",
+        json.dumps(long_answer).replace("Day 3", "Day\x0b 3").replace("Day 9", "Day\x01 9"),
+    ]
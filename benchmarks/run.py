@@ -0,0 +1,133 @@
+"""Microbenchmarks for the pure-Python code that runs on every turn.
+
+    python -m benchmarks.run                       # run all cases, compare with the baseline
+    python -m benchmarks.run --save                # record the baseline
+    python -m benchmarks.run merge policies        # only cases whose name contains these
+
+Each case is timed in batches that take at least --min-time seconds; the median of --repeat
+batches is reported per operation. Against a baseline, a case whose median is more than
+--threshold slower is flagged as a regression and the exit status is 1. Baselines are machine
+specific: record one on the machine you compare on.
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from .cases import Case, select
+
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+
+
+def _loops(fn, min_time: float) -> int:
+    """Smallest power-of-ten loop count whose batch takes at least min_time."""
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - t0 >= min_time or loops >= 10**7:
+            return loops
+        loops *= 10
+
+
+def measure(c: Case, repeat: int, min_time: float) -> Dict[str, Any]:
+    fn = c.setup()
+    fn()  # warm caches and lazy imports
+    loops = _loops(fn, min_time)
+    per_op = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        per_op.append((time.perf_counter() - t0) / (loops * c.ops) * 1e6)
+    return {
+        "median_us": round(statistics.median(per_op), 4),
+        "min_us": round(min(per_op), 4),
+        "stdev_us": round(statistics.stdev(per_op), 4) if len(per_op) > 1 else 0.0,
+        "ops": c.ops,
+        "loops": loops,
+    }
+
+
+def environment() -> Dict[str, str]:
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "machine": platform.machine(), "system": platform.system()}
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Per-case change against the baseline; status is ok, regression, faster or new."""
+    rows = []
+    for name, r in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            rows.append({"case": name, "status": "new", "median_us": r["median_us"]})
+            continue
+        ratio = r["median_us"] / base["median_us"] if base["median_us"] else 1.0
+        status = "regression" if ratio > 1 + threshold else "faster" if ratio < 1 / (1 + threshold) else "ok"
+        rows.append({"case": name, "status": status, "median_us": r["median_us"],
+                     "baseline_us": base["median_us"], "change_pct": round((ratio - 1) * 100, 1)})
+    return rows
+
+
+def _load(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("cases", nargs="*", help="only run cases whose name contains one of these")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE, help=f"baseline file (default {DEFAULT_BASELINE})")
+    ap.add_argument("--save", action="store_true", help="write these results as the baseline")
+    ap.add_argument("--threshold", type=float, default=0.15, help="slowdown that counts as a regression (0.15 = 15%%)")
+    ap.add_argument("--repeat", type=int, default=7, help="timed batches per case")
+    ap.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per batch")
+    ap.add_argument("--json", action="store_true", help="print results as JSON")
+    args = ap.parse_args(argv)
+
+    cases = select(args.cases)
+    if not cases:
+        print(f"no cases match {args.cases}", file=sys.stderr)
+        return 2
+    results = {}
+    for c in cases:
+        results[c.name] = measure(c, args.repeat, args.min_time)
+        if not args.json:
+            r = results[c.name]
+            print(f"{c.name:<42} {r['median_us']:>12.3f} us/op  (min {r['min_us']:.3f}, ±{r['stdev_us']:.3f})")
+
+    if args.save:
+        # Keep baselines for cases that were not run this time
+        saved = _load(args.baseline) or {}
+        merged = {**saved.get("results", {}), **results}
+        with open(args.baseline, "w") as f:
+            json.dump({"environment": environment(), "results": merged}, f, indent=2, sort_keys=True)
+        print(f"saved baseline for {len(results)} cases to {args.baseline}")
+        return 0
+
+    baseline = _load(args.baseline)
+    rows = compare(results, baseline, args.threshold) if baseline else []
+    if args.json:
+        print(json.dumps({"environment": environment(), "results": results, "comparison": rows}, indent=2))
+    elif baseline:
+        if baseline.get("environment") != environment():
+            print(f"note: baseline recorded on {baseline.get('environment')}, running on {environment()}")
+        for row in rows:
+            if row["status"] != "ok":
+                change = f"{row['change_pct']:+.1f}%" if "change_pct" in row else ""
+                print(f"{row['status'].upper():<11} {row['case']:<42} {change}")
+    else:
+        print(f"no baseline at {args.baseline}; record one with --save")
+    regressions = [r for r in rows if r["status"] == "regression"]
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
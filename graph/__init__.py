@@ -1,12 +1,19 @@
 from __future__ import annotations
 import os
+import threading
+from functools import lru_cache, wraps
+from typing import TYPE_CHECKING
 from langgraph.graph import StateGraph, START, END
 from .state import GraphState
+from telemetry.metrics import timed
+from telemetry.profiling import node_scope
 
-from langsmith import Client
-from langchain_core.tracers import LangChainTracer
+if TYPE_CHECKING:   # imported on first use; see _get_langsmith_client
+    from langsmith import Client
+    from langchain_core.tracers import LangChainTracer
 
 from .nodes import (
+    preplan,
     route_intent,
     smalltalk,
     handler,
@@ -23,6 +30,10 @@ from .nodes import (
 
 # ---------------------- Gate functions (conditions) ----------------------
 
+def _after_preplan(state: GraphState) -> str:
+    """Continue where the rule-based preplanner pointed; default to the LLM router."""
+    return state.get("preplan") or "route"
+
 def _after_route(state: GraphState) -> str:
     """If router chose smalltalk → smalltalk, else proceed to normal flow."""
     return "smalltalk" if state.get("intent") == "smalltalk" else "normal"
@@ -55,13 +66,16 @@ def _get_langsmith_client() -> Client | None:
     """Initialize LangSmith client if API key is available."""
     api_key = os.getenv("LANGCHAIN_API_KEY")
     if api_key:
+        from langsmith import Client
         return Client(api_key=api_key)
     return None
 
+@lru_cache(maxsize=1)
 def _get_langsmith_tracer() -> LangChainTracer | None:
-    """Get LangSmith tracer for tracing."""
+    """Get LangSmith tracer for tracing (one per process)."""
     client = _get_langsmith_client()
     if client:
+        from langchain_core.tracers import LangChainTracer
         return LangChainTracer(
             client=client,
             project_name=os.getenv("LANGCHAIN_PROJECT", "travel-assistant")
@@ -70,25 +84,49 @@ def _get_langsmith_tracer() -> LangChainTracer | None:
 
 # ---------------------------- Build function -----------------------------
 
-def build_graph():
+def _instrument(name: str, fn):
+    """Wrap a node for latency metrics and, in profiled turns, per-node allocation snapshots."""
+    @wraps(fn)
+    def node(state):
+        with node_scope(name):
+            return fn(state)
+    return timed(f"node.{name}")(node)
+
+def build_graph(checkpointer=None):
+    """Compile the travel graph.
+
+    Pass a checkpointer (see graph.checkpoint.make_checkpointer) to keep conversation
+    state per thread id; turns then only need graph.checkpoint.turn_input(msg).
+    """
     g = StateGraph(GraphState)
 
-    # Register nodes
-    g.add_node("route", route_intent)
-    g.add_node("smalltalk", smalltalk)
-    g.add_node("handler", handler)
-    g.add_node("resolve_place", resolve_place_llm)
-    g.add_node("plan", plan_tools)
-    g.add_node("plan_time", plan_time)
-    g.add_node("clarify", clarify_missing)
-    g.add_node("fetch", fetch_data)
-    g.add_node("compose", compose_answer)
-    g.add_node("critique", critique)
-    g.add_node("revise", revise)
-    g.add_node("update_summary", update_summary)
-
-    # Start → Router
-    g.add_edge(START, "route")
+    # Register nodes (each wrapped for per-node latency metrics and profiling)
+    g.add_node("preplan", _instrument("preplan", preplan))
+    g.add_node("route", _instrument("route", route_intent))
+    g.add_node("smalltalk", _instrument("smalltalk", smalltalk))
+    g.add_node("handler", _instrument("handler", handler))
+    g.add_node("resolve_place", _instrument("resolve_place", resolve_place_llm))
+    g.add_node("plan", _instrument("plan", plan_tools))
+    g.add_node("plan_time", _instrument("plan_time", plan_time))
+    g.add_node("clarify", _instrument("clarify", clarify_missing))
+    g.add_node("fetch", _instrument("fetch", fetch_data))
+    g.add_node("compose", _instrument("compose", compose_answer))
+    g.add_node("critique", _instrument("critique", critique))
+    g.add_node("revise", _instrument("revise", revise))
+    g.add_node("update_summary", _instrument("update_summary", update_summary))
+
+    # Start → Preplanner → Router (or straight to a later node for trivial turns)
+    g.add_edge(START, "preplan")
+    g.add_conditional_edges(
+        "preplan",
+        _after_preplan,
+        {
+            "route": "route",
+            "smalltalk": "smalltalk",
+            "plan": "plan",
+            "plan_time": "plan_time",
+        },
+    )
 
     # Router branch
     g.add_conditional_edges(
@@ -147,7 +185,7 @@ def build_graph():
     g.add_edge("revise", "update_summary")
 
     # Compile the graph with optional LangSmith tracing
-    compiled_graph = g.compile()
+    compiled_graph = g.compile(checkpointer=checkpointer)
     
     # Add LangSmith tracer if available
     tracer = _get_langsmith_tracer()
@@ -155,3 +193,22 @@ def build_graph():
         compiled_graph = compiled_graph.with_config({"callbacks": [tracer]})
     
     return compiled_graph
+
+# ------------------------- Process-wide shared graph -------------------------
+
+_shared_graph = None
+_shared_lock = threading.Lock()
+
+def get_graph():
+    """Return the process-wide compiled graph, building it on first use.
+
+    All sessions share one compiled graph and one checkpointer; each session keeps
+    its own thread id (see graph.checkpoint.Thread).
+    """
+    global _shared_graph
+    if _shared_graph is None:
+        with _shared_lock:
+            if _shared_graph is None:
+                from .checkpoint import make_checkpointer
+                _shared_graph = build_graph(checkpointer=make_checkpointer())
+    return _shared_graph
@@ -0,0 +1,101 @@
+from __future__ import annotations
+import os
+import sqlite3
+import uuid
+import weakref
+from typing import Any, Dict, Optional
+
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+# Checkpointer-backed sessions.
+# With a checkpointer the graph keeps each conversation's state under a thread id, so a turn
+# only sends the new user message and LangGraph persists the channels that changed.
+
+CHECKPOINTER = os.getenv("GRAPH_CHECKPOINTER", "memory")   # "memory", "sqlite" or "none"
+SQLITE_PATH = os.getenv("GRAPH_CHECKPOINT_DB", "checkpoints.sqlite")
+
+# Per-turn outputs; reset on every checkpointed turn so a previous turn's answer does not
+# leak into gates such as _after_resolve.
+TURN_RESET: Dict[str, Any] = {"final": "", "draft": "", "critique_needed": False, "draft_issues": [], "critique_notes": None}
+
+
+class LatestCheckpointSaver(InMemorySaver):
+    """InMemorySaver that keeps only the latest checkpoint of each thread.
+
+    Sessions only ever resume from their latest checkpoint, so older checkpoints, their
+    pending writes and channel blobs no longer referenced are dropped on every put. A
+    thread's memory then tracks its current state instead of its number of steps.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._versions: Dict[str, Dict[str, Dict[str, Any]]] = {}   # thread -> ns -> channel -> stored version
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        out = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = out["configurable"]["thread_id"]
+        ns = out["configurable"]["checkpoint_ns"]
+        latest = checkpoint["id"]
+        saved = self.storage[thread_id][ns]
+        # Checkpoint ids sort by time; never drop one newer than this (puts may land out of order)
+        for cid in [c for c in saved if c < latest]:
+            del saved[cid]
+            self.writes.pop((thread_id, ns, cid), None)
+        stored = self._versions.setdefault(thread_id, {}).setdefault(ns, {})
+        for channel, version in new_versions.items():
+            old = stored.get(channel)
+            if old is not None and old != version:
+                self.blobs.pop((thread_id, ns, channel, old), None)
+            stored[channel] = version
+        return out
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        self._versions.pop(thread_id, None)
+
+
+def _serde() -> JsonPlusSerializer:
+    # Compact forecasts hold array.array columns, which msgpack cannot encode
+    return JsonPlusSerializer(pickle_fallback=True)
+
+
+def make_checkpointer(kind: Optional[str] = None, path: Optional[str] = None):
+    """Return a LangGraph checkpointer for `kind` ("memory", "sqlite"), or None when disabled."""
+    kind = (kind if kind is not None else CHECKPOINTER).lower()
+    if kind in ("", "none", "off"):
+        return None
+    if kind == "memory":
+        return LatestCheckpointSaver(serde=_serde())
+    if kind == "sqlite":
+        try:
+            from langgraph.checkpoint.sqlite import SqliteSaver
+        except ImportError as e:
+            raise RuntimeError("GRAPH_CHECKPOINTER=sqlite requires the langgraph-checkpoint-sqlite package") from e
+        conn = sqlite3.connect(path or SQLITE_PATH, check_same_thread=False)
+        return SqliteSaver(conn, serde=_serde())
+    raise ValueError(f"Unknown checkpointer: {kind!r}")
+
+
+def thread_config(thread_id: str) -> Dict[str, Any]:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def turn_input(user_msg: str) -> Dict[str, Any]:
+    """Delta input for one checkpointed turn: the new message plus per-turn resets."""
+    return {"user_msg": user_msg, "history": [{"role": "user", "content": user_msg}], **TURN_RESET}
+
+
+class Thread:
+    """A conversation's thread id on a shared checkpointer.
+
+    The thread's checkpoints are deleted when this object is garbage collected (e.g. when
+    the Streamlit session holding it ends), so a process-wide checkpointer does not keep
+    state for sessions that are gone.
+    """
+
+    def __init__(self, checkpointer, thread_id: Optional[str] = None):
+        self.thread_id = thread_id or uuid.uuid4().hex
+        self.config = thread_config(self.thread_id)
+        if checkpointer is not None:
+            weakref.finalize(self, checkpointer.delete_thread, self.thread_id)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from .facts_store import MAX_AGE_S
+
+# Process-wide cache of composed answers, checked by compose_answer before its LLM call.
+# A turn's key is exact: intent, resolved place, target dates, today, a fingerprint of the facts
+# brief and a fingerprint of the conversation context the prompt carries (summary and recent
+# messages), so only turns answered from identical facts and context share a bucket. Within a
+# bucket the message only has to be a near-duplicate: Jaccard similarity of character-trigram
+# shingles over the normalized message (lowercased, filler words dropped) of at least SIMILARITY,
+# and exact agreement on numbers, negations and the order of the words both messages share
+# ("with kids" is not "without kids", "airport to center" is not "center to airport").
+# An answer lives as long as the facts it was written from (see freshness_ttl).
+# The cache is shared by every session the process serves.
+
+ENABLED = os.getenv("ANSWER_CACHE", "1").lower() not in ("0", "false", "no", "off")
+SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.75"))
+MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX", "1024"))
+BUCKET_MAX = 8                                                           # paraphrase variants kept per key
+WEB_TTL_S = float(os.getenv("ANSWER_CACHE_WEB_TTL_S", "900"))            # web results go stale fast
+STATIC_TTL_S = float(os.getenv("ANSWER_CACHE_STATIC_TTL_S", "86400"))    # country facts barely change
+
+# Words that do not change what is being asked ("what's the weather in Paris" ~ "weather Paris")
+FILLER_WORDS = frozenset(
+    "a an the is are what what's whats s like please tell me can you could i do does it be will going to "
+    "for in at of on".split()
+)
+# Words that flip the meaning of a request
+NEGATIONS = frozenset("no not without never non nor except avoid don't doesn't isn't aren't won't can't".split())
+_PUNCT = re.compile(r"[^\w\s']")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?")
+
+Key = Tuple[Any, ...]
+Guard = Tuple[Tuple[str, ...], FrozenSet[str], Tuple[str, ...]]
+
+
+def shingles(text: str, k: int = 3) -> FrozenSet[str]:
+    """Character k-grams of the normalized message."""
+    words = sorted(set(w for w in _PUNCT.sub(" ", text.lower()).split() if w not in FILLER_WORDS))
+    norm = f" {' '.join(words)} "
+    return frozenset(norm[i:i + k] for i in range(max(1, len(norm) - k + 1)))
+
+
+def guard(text: str) -> Guard:
+    """What two near-duplicates must share exactly: numbers, negations and content words in order."""
+    lowered = text.lower()
+    words = [w for w in _PUNCT.sub(" ", lowered).split() if w not in FILLER_WORDS]
+    return tuple(_NUMBER.findall(lowered)), frozenset(w for w in words if w in NEGATIONS), tuple(dict.fromkeys(words))
+
+
+def agrees(a: Guard, b: Guard) -> bool:
+    if a[0] != b[0] or a[1] != b[1]:
+        return False
+    shared = set(a[2]) & set(b[2])
+    return [w for w in a[2] if w in shared] == [w for w in b[2] if w in shared]
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 1.0
+
+
+def freshness_ttl(facts: Dict[str, Any], place: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Seconds an answer written from these facts stays valid; None if it should not be cached.
+
+    Weather answers expire with the forecast they quote, web answers after WEB_TTL_S and
+    country facts after STATIC_TTL_S; an answer mixing them gets the shortest. Answers written
+    while a service was unavailable are not cached.
+    """
+    if facts.get("unavailable"):
+        return None
+    now = time.time() if now is None else now
+    ttls: List[float] = []
+    wx = (facts.get("weather_by_place") or {}).get(place) if place else None
+    if wx:
+        ttls.append(wx.get("fetched_at", now) + MAX_AGE_S - now)
+    if facts.get("web"):
+        ttls.append(WEB_TTL_S)
+    if facts.get("country"):
+        ttls.append(STATIC_TTL_S)
+    if not ttls:
+        return None
+    ttl = min(ttls)
+    return ttl if ttl > 0 else None
+
+
+def context_fingerprint(summary: str, recent: List[Dict[str, Any]], user_msg: str) -> str:
+    """Hash of the conversation context the compose prompt carries, minus the current message."""
+    if recent and recent[-1].get("role") == "user" and recent[-1].get("content") == user_msg:
+        recent = recent[:-1]
+    text = "\x1e".join([summary or ""] + [f"{m.get('role')}:{m.get('content')}" for m in recent])
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def turn_key(state: Dict[str, Any], place: Optional[str], facts_brief: str,
+             recent: List[Dict[str, Any]]) -> Optional[Tuple[Key, float]]:
+    """(key, ttl) for this turn's answer, or None when it depends on more than the fetched facts.
+
+    `recent` is the history window the compose prompt includes.
+    """
+    if not ENABLED or not facts_brief:
+        return None
+    facts = (state.get("data") or {}).get("facts") or {}
+    ttl = freshness_ttl(facts, place)
+    if ttl is None:
+        return None
+    fingerprint = hashlib.blake2b(facts_brief.encode(), digest_size=16).hexdigest()
+    context = context_fingerprint(state.get("summary", ""), recent, state.get("user_msg", ""))
+    key = (state.get("intent", ""), (place or "").lower(), tuple(facts.get("target_dates") or ()),
+           facts.get("today", ""), fingerprint, context)
+    return key, ttl
+
+
+class AnswerCache:
+    """Buckets of (shingles, guard, answer, expires_at) per exact key, evicted least recently used."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, threshold: float = SIMILARITY):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._buckets: "OrderedDict[Key, List[Tuple[FrozenSet[str], Guard, str, float]]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Key, msg: str, now: Optional[float] = None) -> Optional[str]:
+        """Cached answer for a near-duplicate of `msg` under `key`, if one is still fresh."""
+        now = time.time() if now is None else now
+        sig, g = shingles(msg), guard(msg)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if not bucket:
+                return None
+            fresh = [e for e in bucket if e[3] > now]
+            self._size -= len(bucket) - len(fresh)
+            if not fresh:
+                del self._buckets[key]
+                return None
+            self._buckets[key] = fresh
+            self._buckets.move_to_end(key)
+            scored = [(jaccard(sig, s), a) for s, eg, a, _ in fresh if agrees(g, eg)]
+            if not scored:
+                return None
+            score, answer = max(scored, key=lambda x: x[0])
+            return answer if score >= self.threshold else None
+
+    def put(self, key: Key, msg: str, answer: str, ttl: float, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        sig = shingles(msg)
+        with self._lock:
+            old = self._buckets.pop(key, [])
+            bucket = [e for e in old if e[3] > now and e[0] != sig]
+            bucket.append((sig, guard(msg), answer, now + ttl))
+            bucket = bucket[-BUCKET_MAX:]
+            self._size += len(bucket) - len(old)
+            self._buckets[key] = bucket
+            while self._size > self.max_entries and self._buckets:
+                _, evicted = self._buckets.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+
+ANSWERS = AnswerCache()
@@ -2,23 +2,23 @@ from __future__ import annotations
 from typing import Dict, Any, Optional, Tuple, List
 import re
 
+from .keywords import COMMON_COUNTRIES, scan
+from .merge import updated
+from .places import find_places, lookup
+
 def _push_destination(profile: Dict[str, Any], name: str) -> Dict[str, Any]:
     if not name:
         return profile
     lst = [p for p in profile.get("destinations", []) if p.lower() != name.lower()]
     lst.append(name)
-    profile["destinations"] = lst
-    profile["active_destination"] = name
-    profile["destination"] = name  # legacy mirror
-    return profile
+    # destination is the legacy mirror of active_destination
+    return updated(profile, destinations=lst, active_destination=name, destination=name)
 
 def remember_place(state: Dict[str, Any], place_name: Optional[str]) -> dict:
     """Write normalized place into user_profile MRU list."""
     if not place_name:
         return {}
-    profile = (state.get("user_profile") or {}).copy()
-    profile = _push_destination(profile, place_name)
-    return {"user_profile": profile}
+    return {"user_profile": _push_destination(state.get("user_profile") or {}, place_name)}
 
 def _extract_country_and_city(msg: str) -> Tuple[Optional[str], Optional[str]]:
     """
@@ -51,8 +51,7 @@ def _extract_country_and_city(msg: str) -> Tuple[Optional[str], Optional[str]]:
     if match:
         place = match.group(1).strip().title()
         # Heuristic: if it's a common country name, treat as country
-        common_countries = {'italy', 'france', 'spain', 'germany', 'bulgaria', 'romania', 'greece', 'turkey', 'israel', 'jordan', 'egypt'}
-        if place.lower() in common_countries:
+        if place.lower() in COMMON_COUNTRIES:
             return place, None
         else:
             return None, place
@@ -64,15 +63,17 @@ def _extract_place_from_message(msg: str) -> Optional[str]:
     toks = [t.strip(",.!?") for t in msg.split() if t[:1].isupper()]
     return toks[0] if toks else None
 
-def _resolve_pronoun_to_place(msg_lower: str, profile: Dict[str, Any]) -> Optional[str]:
+def _resolve_pronoun_to_place(msg: str, profile: Dict[str, Any]) -> Optional[str]:
     lst = profile.get("destinations", [])
     if not lst:
         return None
-    if "previous" in msg_lower or "last one" in msg_lower or "the one before" in msg_lower:
+    features = scan(msg)
+    if "ord_previous" in features:
         return lst[-2] if len(lst) >= 2 else lst[-1]
-    if "first" in msg_lower or "original" in msg_lower:
+    if "ord_first" in features:
         return lst[0]
-    if "last" in msg_lower and "last one" not in msg_lower:
+    # "last one" is ord_previous, handled above
+    if "ord_last" in features:
         return lst[-1]
     return None
 
@@ -90,7 +91,11 @@ def _resolve_place_selection(msg: str, place_candidates: List[str]) -> Optional[
     for candidate in place_candidates:
         if msg.lower() == candidate.lower():
             return candidate
-    
+
+    # Or the name part of exactly one candidate ("Nice" for "Nice, France")
+    named = [c for c in place_candidates if c.split(",")[0].strip().lower() == msg.lower()]
+    if len(named) == 1:
+        return named[0]
     return None
 
 def resolve_place(state: Dict[str, Any]) -> Optional[str]:
@@ -117,8 +122,7 @@ def resolve_place(state: Dict[str, Any]) -> Optional[str]:
     msg = state.get("user_msg", "")
     
     # Check if message contains pronouns like "there", "here", "this place"
-    msg_lower = msg.lower()
-    if any(pronoun in msg_lower for pronoun in ["there", "here", "this place", "that place"]):
+    if "here" in scan(msg):
         # Use the active destination from profile
         profile = (state.get("user_profile") or {})
         active = profile.get("active_destination") or profile.get("destination")
@@ -130,7 +134,7 @@ def resolve_place(state: Dict[str, Any]) -> Optional[str]:
         return explicit
 
     profile = (state.get("user_profile") or {})
-    pronoun = _resolve_pronoun_to_place(msg.lower(), profile)
+    pronoun = _resolve_pronoun_to_place(msg, profile)
     if pronoun:
         return pronoun
 
@@ -143,3 +147,103 @@ def resolve_country_and_city(state: Dict[str, Any]) -> Tuple[Optional[str], Opti
     """
     msg = state.get("user_msg", "")
     return _extract_country_and_city(msg)
+
+# ------------------------- scored deterministic resolver -------------------------
+
+# Scores per signal; the resolver is trusted at or above PLACE_MIN_CONFIDENCE when no other
+# candidate comes within PLACE_TIE_MARGIN.
+PLACE_MIN_CONFIDENCE = 0.8
+PLACE_TIE_MARGIN = 0.05
+_SIGNAL_SCORES = {
+    "selection": 1.0,   # pick from the last disambiguation candidates
+    "known": 0.95,      # name from the local place dictionary
+    "mru": 0.95,        # a previous destination named again
+    "pronoun": 0.75,    # "there"/"here" -> active destination; alone, confirmed by the LLM
+    "ordinal": 0.7,     # "previous"/"first"/"last" -> MRU list
+    "unknown": 0.5,     # capitalized or "in <word>" token we cannot verify
+}
+
+_NOT_PLACES = {
+    "i", "i'm", "i'd", "i'll", "what", "what's", "how", "is", "are", "can", "could", "should", "would",
+    "will", "do", "does", "any", "and", "or", "but", "the", "a", "an", "please", "thanks", "ok", "okay",
+    "hi", "hello", "hey", "yes", "no", "my", "me", "we", "our", "also", "which", "where", "when", "who",
+    "tell", "give", "show", "find", "suggest", "recommend", "weather", "there", "here", "this", "that",
+    "summer", "winter", "spring", "autumn", "fall", "general", "advance", "total", "time", "case",
+    "today", "tomorrow", "tonight", "weekend", "morning", "evening", "afternoon", "week", "month",
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+    "january", "february", "march", "april", "may", "june", "july", "august", "september",
+    "october", "november", "december", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept",
+    "oct", "nov", "dec", "celsius", "fahrenheit", "eur", "usd",
+}
+
+def _unverified_place_tokens(msg: str, known: List[str], mru: List[str]) -> List[str]:
+    """Tokens that look like a place name but are neither in the dictionary nor the MRU list."""
+    covered = " ".join(known + mru).lower().split()
+    words = re.findall(r"[\w'’-]+", msg)
+    out = []
+    for i, w in enumerate(words):
+        lw = w.lower()
+        if lw in _NOT_PLACES or lw in covered or lw.isdigit() or lookup(lw):
+            continue
+        after_prep = i > 0 and words[i - 1].lower() in ("in", "at", "near", "visiting", "around")
+        capitalized = i > 0 and w[:1].isupper()
+        if (after_prep and len(w) >= 3) or capitalized:
+            out.append(w)
+    return out
+
+def score_place(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Deterministic place resolution with a confidence score.
+
+    Combines place_candidates, the local place dictionary, the destinations MRU list,
+    pronouns and ordinals. Returns {"place", "confidence", "tie", "signals"}; place is None
+    with high confidence when the message references no place at all.
+    """
+    data = state.get("data") or {}
+    profile = state.get("user_profile") or {}
+    msg = state.get("user_msg", "") or ""
+    msg_lower = msg.lower()
+    mru = profile.get("destinations") or []
+    active = profile.get("active_destination") or profile.get("destination")
+
+    signals: List[Tuple[str, float, str]] = []
+    if data.get("place_candidates"):
+        picked = _resolve_place_selection(msg, data["place_candidates"])
+        if picked:
+            signals.append((picked, _SIGNAL_SCORES["selection"], "selection"))
+
+    known = find_places(msg)
+    # A city together with its own country ("Sofia, Bulgaria") resolves to the city
+    cities_cc = {cc for _, cc, kind in known if kind == "city"}
+    for name, cc, kind in known:
+        if kind == "country" and cc in cities_cc:
+            continue
+        signals.append((name, _SIGNAL_SCORES["known"], "known"))
+
+    for name in mru:
+        if re.search(r"(?<!\w)" + re.escape(name.lower()) + r"(?!\w)", msg_lower) and not lookup(name):
+            signals.append((name, _SIGNAL_SCORES["mru"], "mru"))
+
+    if active and "here" in scan(msg):
+        signals.append((active, _SIGNAL_SCORES["pronoun"], "pronoun"))
+
+    ordinal = _resolve_pronoun_to_place(msg, profile)
+    if ordinal:
+        signals.append((ordinal, _SIGNAL_SCORES["ordinal"], "ordinal"))
+
+    unknown = _unverified_place_tokens(msg, [n for n, _, _ in known], mru)
+    for tok in unknown:
+        signals.append((tok, _SIGNAL_SCORES["unknown"], "unknown"))
+
+    if not signals:
+        return {"place": None, "confidence": 0.9, "tie": False, "signals": []}
+
+    best: Dict[str, float] = {}
+    for name, score, _ in signals:
+        best[name] = max(best.get(name, 0.0), score)
+    ranked = sorted(best.items(), key=lambda kv: kv[1], reverse=True)
+    place, confidence = ranked[0]
+    tie = len(ranked) > 1 and ranked[0][1] - ranked[1][1] < PLACE_TIE_MARGIN
+    if unknown and place not in unknown:
+        # An unverified place-like token may be the real destination
+        confidence = min(confidence, _SIGNAL_SCORES["unknown"])
+    return {"place": place, "confidence": confidence, "tie": tie, "signals": signals}
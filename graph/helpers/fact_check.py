@@ -0,0 +1,149 @@
+from __future__ import annotations
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .facts_store import forecast_rows
+from .forecast_summary import RAINY_PCT, SUMMARY_MIN_DAYS, summarize_forecast
+
+# Local check of a composed draft against data.facts; it decides whether critique/revise run.
+# The numbers a draft states (temperatures, precipitation chances, ISO dates, currency codes, the
+# capital) must come from the fetched facts, and facts the user asked for must be in the draft.
+# A temperature on a line with exactly one requested date must match that date's high or low;
+# elsewhere it may match any requested day. Temperatures are compared in the unit the forecast was
+# fetched in (data.units); one stated in the other unit ("72°F" next to a metric forecast) is converted. Numbers the user wrote themselves are always allowed.
+# Each issue states the fact it should have matched, so the notes are enough for revise.
+
+TEMP_TOLERANCE_C = 0.6   # rounding to whole degrees (scaled by 1.8 for a °F forecast)
+PRECIP_TOLERANCE = 1
+
+# Common ISO 4217 codes; other three-letter capitals ("USA", "NYC") are not read as currencies
+CURRENCY_CODES = frozenset("""
+    AED ARS AUD BGN BRL CAD CHF CLP CNY COP CZK DKK EGP EUR GBP HKD HUF IDR ILS INR ISK JOD JPY KRW MAD
+    MXN MYR NOK NZD PEN PHP PLN QAR RON RSD RUB SAR SEK SGD THB TND TRY TWD UAH USD VND ZAR
+""".split())
+
+_NUM = r"[-−]?\d+(?:\.\d+)?"
+_UNIT = r"\s*([CF](?![a-z]))?"   # "°C", "° F"; not the initial of "° Friday"
+_TEMP_RANGE = re.compile(rf"(?<![\d.])({_NUM})\s*(?:°\s*[CF]?)?\s*(?:–|—|-|to)\s*({_NUM})\s*°{_UNIT}")
+_TEMP = re.compile(rf"(?<![\d.])({_NUM})\s*°{_UNIT}")
+_PRECIP = re.compile(r"(?<![\d.])(\d{1,3})\s*%")
+_PRECIP_CONTEXT = re.compile(r"precip|rain|shower|chance|probab|wet")
+_ISO_DATE = re.compile(r"\b\d{4}-\d{2}-\d{2}\b")
+_CODE = re.compile(r"\b[A-Z]{3}\b")
+_CAPITAL = re.compile(
+    r"capital(?:\s+city)?(?:\s+of\s+[A-Z][\w'-]*(?:\s+[A-Z][\w'-]*)*)?\s*(?:is|:|—|-|,)?\s+([A-Z][\w'-]*(?:\s+[A-Z][\w'-]*)*)"
+)
+
+
+def _num(s: str) -> float:
+    return float(s.replace("−", "-"))
+
+
+def _to_unit(v: float, stated: Optional[str], unit: str) -> float:
+    if not stated or stated == unit:
+        return v
+    return round(v * 9 / 5 + 32, 1) if unit == "F" else round((v - 32) * 5 / 9, 1)
+
+
+def _temps(line: str, unit: str) -> Set[Tuple[float, str, float]]:
+    """(value as written, unit as written, value in the forecast's unit) for each temperature."""
+    found = {(_num(v), m.group(3) or unit) for m in _TEMP_RANGE.finditer(line) for v in m.group(1, 2)}
+    found |= {(_num(m.group(1)), m.group(2) or unit) for m in _TEMP.finditer(line)}
+    return {(v, u, _to_unit(v, u, unit)) for v, u in found}
+
+
+def _close(v: float, allowed, tol: float) -> bool:
+    return any(abs(v - a) <= tol for a in allowed)
+
+
+def _fmt(v: Optional[float], unit: str = "C") -> str:
+    return "?" if v is None else f"{v:g}°{unit}"
+
+
+def _check_weather(draft: str, rows: list, summary: Optional[Dict[str, Any]], user_nums: Set[float],
+                   allowed_dates: Set[str], place: str, unit: str = "C") -> List[str]:
+    issues: List[str] = []
+    tol = TEMP_TOLERANCE_C * (1.8 if unit == "F" else 1)
+    by_date = {d: (tmax, tmin, p) for d, tmax, tmin, p in rows}
+    all_temps = {t for _, tmax, tmin, _ in rows for t in (tmax, tmin) if t is not None}
+    all_precip = {p for *_, p in rows if p is not None} | {RAINY_PCT}
+    if summary:
+        all_temps |= {v for v in (summary["mean_temp"], summary["high_max"], summary["high_min"], summary["low_min"]) if v is not None}
+    highs = [r[1] for r in rows if r[1] is not None]
+    lows = [r[2] for r in rows if r[2] is not None]
+    overall = (f"highs {_fmt(min(highs, default=None), unit)}–{_fmt(max(highs, default=None), unit)}, "
+               f"lows {_fmt(min(lows, default=None), unit)}–{_fmt(max(lows, default=None), unit)}")
+
+    quoted = False
+    for line in draft.splitlines():
+        dates = _ISO_DATE.findall(line)
+        for d in dates:
+            if d not in allowed_dates:
+                issues.append(f"{d} is not one of the requested dates ({', '.join(sorted(by_date))})")
+        day = by_date.get(dates[0]) if len(dates) == 1 else None
+        temps = _temps(line, unit)
+        quoted = quoted or bool(temps)
+        for raw, stated, t in sorted(temps):
+            if raw in user_nums:
+                continue
+            if day:
+                if not _close(t, [v for v in day[:2] if v is not None], tol):
+                    issues.append(f"{dates[0]}: {raw:g}°{stated} does not match the forecast "
+                                  f"(high {_fmt(day[0], unit)}, low {_fmt(day[1], unit)})")
+            elif not _close(t, all_temps, tol):
+                issues.append(f"{raw:g}°{stated} does not match the forecast for {place} ({overall})")
+        lowered = line.lower()
+        for m in _PRECIP.finditer(line):
+            if not _PRECIP_CONTEXT.search(lowered[max(0, m.start() - 30):m.end() + 20]):
+                continue
+            p = int(m.group(1))
+            allowed = ({day[2], RAINY_PCT} - {None}) if day else all_precip
+            if p not in user_nums and not _close(p, allowed, PRECIP_TOLERANCE):
+                expected = f"{day[2]}%" if day and day[2] is not None else ", ".join(f"{v}%" for v in sorted(all_precip - {RAINY_PCT}))
+                issues.append(f"precipitation {p}% does not match the forecast ({expected or 'none given'})")
+    if not quoted:
+        issues.append(f"missing: the forecast temperatures for {place} ({overall})")
+    return issues
+
+
+def _check_country(draft: str, msg: str, cf: Dict[str, Any]) -> List[str]:
+    issues: List[str] = []
+    codes = set(cf.get("currencies") or [])
+    mentioned = {c for c in _CODE.findall(draft) if c in CURRENCY_CODES}
+    for c in sorted(mentioned - codes):
+        issues.append(f"currency {c} does not match {cf['name']} ({', '.join(sorted(codes)) or 'unknown'})")
+    capital = cf.get("capital") or ""
+    for m in _CAPITAL.finditer(draft):
+        named = m.group(1)
+        if capital and capital != "?" and not (named.lower().startswith(capital.lower()) or capital.lower().startswith(named.lower())):
+            issues.append(f"capital given as {named}; the capital of {cf['name']} is {capital}")
+    asked = msg.lower()
+    if "currenc" in asked and codes and not (mentioned & codes):
+        issues.append(f"missing: the currency of {cf['name']} ({', '.join(sorted(codes))})")
+    if "capital" in asked and capital and capital != "?" and capital.lower() not in draft.lower():
+        issues.append(f"missing: the capital of {cf['name']} ({capital})")
+    return issues
+
+
+def check_draft(draft: str, state: Dict[str, Any], place: Optional[str]) -> List[str]:
+    """Mismatches between the draft and data.facts, and facts it leaves out; [] when consistent."""
+    data = state.get("data") or {}
+    facts = data.get("facts") or {}
+    plan = data.get("plan") or {}   # facts persist across turns; check what this turn fetched
+    msg = state.get("user_msg", "") or ""
+    user_nums = {_num(v) for v in re.findall(_NUM, msg)}
+    issues: List[str] = []
+
+    wx = (facts.get("weather_by_place") or {}).get(place) if place else None
+    target_dates = [d for d in (facts.get("target_dates") or [facts.get("today")]) if d]
+    if wx and target_dates and plan.get("weather"):
+        rows = forecast_rows(wx["forecast"], target_dates)
+        if rows:
+            summary = summarize_forecast(wx["forecast"], target_dates) if len(target_dates) >= SUMMARY_MIN_DAYS else None
+            allowed_dates = set(target_dates) | {facts.get("today"), (facts.get("now") or "")[:10]} | set(_ISO_DATE.findall(msg))
+            unit = "C" if data.get("units", "metric") == "metric" else "F"
+            issues += _check_weather(draft, rows, summary, user_nums, allowed_dates, wx["place"]["name"], unit)
+
+    if facts.get("country") and plan.get("country"):
+        issues += _check_country(draft, msg, facts["country"])
+    return issues
@@ -0,0 +1,105 @@
+from __future__ import annotations
+import copy
+import os
+import sys
+import time
+from array import array
+from typing import Dict, Any, List, Optional, Tuple
+
+# Bounded per-session store for facts.weather_by_place.
+# Entries are kept in LRU order (oldest first, dicts preserve insertion order), capped at
+# MAX_PLACES and dropped once older than MAX_AGE_S. Forecasts are stored as compact columns
+# holding only what compose_answer reads instead of the raw Open-Meteo payload.
+
+MAX_PLACES = int(os.getenv("FACTS_MAX_PLACES", "8"))
+MAX_AGE_S = float(os.getenv("FACTS_MAX_AGE_S", str(3 * 3600)))
+# report() deep-copies and walks the whole data block, so fetch_data only logs it when asked
+REPORT_ENABLED = os.getenv("FACTS_REPORT", "").lower() in ("1", "true", "yes")
+
+# Temperatures are stored as int16 tenths of a degree, precipitation as int8 percent.
+TEMP_SCALE = 10
+MISSING_TEMP = -32768
+MISSING_PRECIP = -1
+
+
+def compact_forecast(wx: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce an Open-Meteo daily forecast to typed columns."""
+    daily = wx.get("daily") or {}
+    dates = list(daily.get("time") or [])
+    n = len(dates)
+
+    def col(key: str) -> list:
+        values = list(daily.get(key) or [])
+        return (values + [None] * n)[:n]
+
+    return {
+        "timezone": wx.get("timezone"),
+        "time": tuple(dates),
+        "tmax": array("h", [MISSING_TEMP if v is None else round(v * TEMP_SCALE) for v in col("temperature_2m_max")]),
+        "tmin": array("h", [MISSING_TEMP if v is None else round(v * TEMP_SCALE) for v in col("temperature_2m_min")]),
+        "precip": array("b", [MISSING_PRECIP if v is None else int(v) for v in col("precipitation_probability_max")]),
+    }
+
+
+def _temp(v: int) -> Optional[float]:
+    return None if v == MISSING_TEMP else v / TEMP_SCALE
+
+
+def forecast_rows(forecast: Dict[str, Any], dates: List[str]) -> List[Tuple[str, Optional[float], Optional[float], Optional[int]]]:
+    """Return (date, tmax, tmin, precip) for each requested date present in the forecast."""
+    index = {d: i for i, d in enumerate(forecast.get("time") or ())}
+    rows = []
+    for d in dates:
+        i = index.get(d)
+        if i is None:
+            continue
+        p = forecast["precip"][i]
+        rows.append((d, _temp(forecast["tmax"][i]), _temp(forecast["tmin"][i]), None if p == MISSING_PRECIP else p))
+    return rows
+
+
+def put_place(
+    wbp: Dict[str, Any],
+    name: str,
+    place: Dict[str, Any],
+    wx: Dict[str, Any],
+    now: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Return a new weather_by_place with `name` stored as most recent, then pruned."""
+    now = time.time() if now is None else now
+    out = {k: v for k, v in (wbp or {}).items() if k != name}
+    out[name] = {"place": place, "forecast": compact_forecast(wx), "fetched_at": now}
+    return prune(out, now)
+
+
+def prune(wbp: Dict[str, Any], now: Optional[float] = None) -> Dict[str, Any]:
+    """Drop expired entries and evict least recently stored places beyond MAX_PLACES."""
+    now = time.time() if now is None else now
+    fresh = [(k, v) for k, v in (wbp or {}).items() if now - v.get("fetched_at", now) <= MAX_AGE_S]
+    return dict(fresh[-MAX_PLACES:])
+
+
+def _deep_sizeof(obj: Any, seen: set) -> int:
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(v, seen) for v in obj)
+    return size
+
+
+def report(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Approximate memory held by a session's data block and the cost of copying it (debugging aid)."""
+    wbp = ((data or {}).get("facts") or {}).get("weather_by_place") or {}
+    t0 = time.perf_counter()
+    copy.deepcopy(data)
+    copy_ms = (time.perf_counter() - t0) * 1000
+    return {
+        "places": len(wbp),
+        "data_bytes": _deep_sizeof(data, set()),
+        "weather_bytes": _deep_sizeof(wbp, set()),
+        "copy_ms": round(copy_ms, 3),
+    }
@@ -0,0 +1,99 @@
+from __future__ import annotations
+import warnings
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+
+from .facts_store import TEMP_SCALE, MISSING_TEMP, MISSING_PRECIP
+
+if TYPE_CHECKING:   # numpy is imported on first summary, not at graph import
+    import numpy as np
+
+# Date ranges at least this long get one aggregate summary instead of one line per day.
+SUMMARY_MIN_DAYS = 4
+# A day counts as rainy at or above this precipitation probability.
+RAINY_PCT = 50
+# Comfort score used to pick best/worst days: distance from an ideal high, plus a rain penalty.
+IDEAL_HIGH_C = 22.0
+RAIN_WEIGHT = 0.1
+
+
+def _temps(col) -> np.ndarray:
+    import numpy as np
+    arr = np.frombuffer(col, dtype=np.int16).astype(np.float64)
+    arr[arr == MISSING_TEMP] = np.nan
+    return arr / TEMP_SCALE
+
+
+def summarize_forecast(forecast: Dict[str, Any], target_dates: List[str]) -> Optional[Dict[str, Any]]:
+    """Aggregate a compact forecast over `target_dates` in one vectorized pass.
+
+    Returns None when none of the target dates are inside the forecast window.
+    """
+    import numpy as np
+    dates = np.asarray(forecast.get("time") or (), dtype="datetime64[D]")
+    if not len(dates) or not target_dates:
+        return None
+    targets = np.asarray(sorted(target_dates), dtype="datetime64[D]")
+    pos = np.searchsorted(dates, targets)
+    pos_clipped = np.minimum(pos, len(dates) - 1)
+    found = (pos < len(dates)) & (dates[pos_clipped] == targets)
+    idx = pos_clipped[found]
+    if not len(idx):
+        return None
+
+    tmax = _temps(forecast["tmax"])[idx]
+    tmin = _temps(forecast["tmin"])[idx]
+    precip = np.frombuffer(forecast["precip"], dtype=np.int8).astype(np.float64)[idx]
+    precip[precip == MISSING_PRECIP] = np.nan
+    day_dates = dates[idx]
+
+    score = -np.abs(np.nan_to_num(tmax, nan=IDEAL_HIGH_C) - IDEAL_HIGH_C) - RAIN_WEIGHT * np.nan_to_num(precip, nan=0.0)
+    best, worst = int(np.argmax(score)), int(np.argmin(score))
+    rainy = precip >= RAINY_PCT
+
+    def _day(i: int) -> Dict[str, Any]:
+        return {
+            "date": str(day_dates[i]),
+            "tmax": None if np.isnan(tmax[i]) else round(float(tmax[i]), 1),
+            "tmin": None if np.isnan(tmin[i]) else round(float(tmin[i]), 1),
+            "precip": None if np.isnan(precip[i]) else int(precip[i]),
+        }
+
+    def _round(v) -> Optional[float]:
+        return None if np.isnan(v) else round(float(v), 1)
+
+    # nan-aggregates over an all-missing column warn and return nan, which _round maps to None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return {
+            "start": str(day_dates[0]),
+            "end": str(day_dates[-1]),
+            "days": int(len(idx)),
+            "missing_days": int(len(targets) - len(idx)),
+            "high_max": _round(np.nanmax(tmax)),
+            "high_min": _round(np.nanmin(tmax)),
+            "low_min": _round(np.nanmin(tmin)),
+            "mean_temp": _round(np.nanmean(np.concatenate([tmax, tmin]))),
+            "rainy_days": int(rainy.sum()),
+            "rainy_dates": [str(d) for d in day_dates[rainy]],
+            "best": _day(best),
+            "worst": _day(worst),
+        }
+
+
+def format_summary(place: str, s: Dict[str, Any]) -> str:
+    """Render a range summary as one compact line for the compose prompt."""
+    def day(d: Dict[str, Any]) -> str:
+        seg = f"{d['date']} ({d['tmax']}°C/{d['tmin']}°C"
+        return seg + (f", precip {d['precip']}%)" if d["precip"] is not None else ")")
+
+    line = (
+        f"Weather summary for {place}, {s['start']} to {s['end']} ({s['days']} days): "
+        f"highs {s['high_min']}–{s['high_max']}°C, lows from {s['low_min']}°C, mean {s['mean_temp']}°C; "
+        f"rainy days (≥{RAINY_PCT}% precip): {s['rainy_days']}"
+    )
+    if s["rainy_dates"]:
+        line += " (" + ", ".join(s["rainy_dates"][:5]) + ("…" if len(s["rainy_dates"]) > 5 else "") + ")"
+    line += f"; best day {day(s['best'])}; worst day {day(s['worst'])}."
+    if s["missing_days"]:
+        line += f" {s['missing_days']} requested day(s) are beyond the forecast window."
+    return line
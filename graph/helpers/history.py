@@ -0,0 +1,94 @@
+from __future__ import annotations
+import json
+import os
+import zlib
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..state import HISTORY_WINDOW
+
+# Chat transcript with bounded memory per session.
+# The newest HISTORY_WINDOW messages stay in a hot ring buffer that the graph reads; older
+# messages are staged and packed into zlib-compressed JSON blocks. Only MAX_COLD_BLOCKS blocks
+# are retained, so memory stays flat however long the conversation runs.
+
+BLOCK_SIZE = int(os.getenv("HISTORY_BLOCK_SIZE", "20"))
+MAX_COLD_BLOCKS = int(os.getenv("HISTORY_MAX_COLD_BLOCKS", "10"))
+
+
+class HistoryStore:
+    def __init__(self, hot_size: int = HISTORY_WINDOW, block_size: int = BLOCK_SIZE, max_cold_blocks: int = MAX_COLD_BLOCKS):
+        self.block_size = block_size
+        self._hot: deque = deque(maxlen=hot_size)
+        self._staged: List[Dict[str, str]] = []
+        self._cold: deque = deque(maxlen=max_cold_blocks)
+        self.total = 0      # messages ever appended
+        self.dropped = 0    # messages evicted with the oldest cold blocks
+
+    def append(self, role: str, content: str) -> None:
+        if len(self._hot) == self._hot.maxlen:
+            self._staged.append(self._hot[0])
+            if len(self._staged) >= self.block_size:
+                self._compact()
+        self._hot.append({"role": role, "content": content})
+        self.total += 1
+
+    def _compact(self) -> None:
+        if len(self._cold) == self._cold.maxlen:
+            self.dropped += self._cold[0][0]
+        block = zlib.compress(json.dumps(self._staged, separators=(",", ":")).encode("utf-8"))
+        self._cold.append((len(self._staged), block))
+        self._staged = []
+
+    def hot(self, n: Optional[int] = None) -> List[Dict[str, str]]:
+        """Most recent messages (all of the hot window by default) for the graph and UI."""
+        msgs = list(self._hot)
+        return msgs if n is None else msgs[-n:]
+
+    def cold_count(self) -> int:
+        return sum(n for n, _ in self._cold) + len(self._staged)
+
+    def cold(self) -> Iterator[Dict[str, str]]:
+        """Older retained messages, oldest first; blocks are decompressed lazily."""
+        for _, block in self._cold:
+            yield from json.loads(zlib.decompress(block))
+        yield from self._staged
+
+    def messages(self) -> Iterator[Dict[str, str]]:
+        yield from self.cold()
+        yield from self._hot
+
+    def __len__(self) -> int:
+        return len(self._hot) + self.cold_count()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "total": self.total,
+            "hot": len(self._hot),
+            "cold": self.cold_count(),
+            "cold_bytes": sum(len(b) for _, b in self._cold),
+            "dropped": self.dropped,
+        }
+
+    def dump(self) -> Dict[str, Any]:
+        """Plain-data form for persistence; cold blocks stay compressed as they are."""
+        return {
+            "hot_size": self._hot.maxlen,
+            "block_size": self.block_size,
+            "max_cold_blocks": self._cold.maxlen,
+            "hot": list(self._hot),
+            "staged": list(self._staged),
+            "cold": [[n, block] for n, block in self._cold],
+            "total": self.total,
+            "dropped": self.dropped,
+        }
+
+    @classmethod
+    def load(cls, d: Dict[str, Any]) -> "HistoryStore":
+        store = cls(d["hot_size"], d["block_size"], d["max_cold_blocks"])
+        store._hot.extend(d["hot"])
+        store._staged = list(d["staged"])
+        store._cold.extend((n, block) for n, block in d["cold"])
+        store.total = d["total"]
+        store.dropped = d["dropped"]
+        return store
@@ -0,0 +1,108 @@
+from __future__ import annotations
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Set
+
+# One-pass keyword scanner for the rule-based heuristics (tool hints, follow-ups, pronouns,
+# ordinals, distance queries, country names).
+# All keywords are compiled into a single alternation inside a lookahead, so one finditer over
+# the lowercased message reports every keyword at every position, overlapping ones included.
+# Keywords match as substrings, exactly like the `in` / re.search checks they replace (e.g.
+# "rain" also matches "train"), except those of WHOLE_WORD_FEATURES ("here" is not in "where"). A keyword also carries the features of every keyword it
+# contains, since the scan only reports the longest match at each position ("open today" also
+# counts as "today"). scan() is cached, so the nodes of one turn share a single scan per message.
+
+# feature -> keywords
+FEATURES: Dict[str, Iterable[str]] = {
+    "weather": ["weather", "rain", "temperature", "forecast", "sunny", "snow", "wind"],
+    "date": ["today", "tomorrow", "weekend"],   # plus ISO dates, see _ISO_DATE
+    "country_fact": ["currency", "visa", "language", "timezone", "plug", "outlet", "capital"],
+    "web": ["open today", "hours", "closed", "latest", "news", "strike", "update"]
+           + [f"{e} {t}" for e in ("event", "events") for t in ("today", "tonight", "this weekend")],
+    "distance": ["hours away", "distance", "near me", "close to me", "nearby", "from here"],
+    # time words that keep a weather conversation going (_is_weather_followup)
+    "time_word": ["weekend", "today", "tomorrow", "tonight", "morning", "evening", "afternoon",
+                  "next week", "this week"],
+    # time words a bare follow-up ("and tomorrow?") must contain
+    "followup_time": ["today", "tomorrow", "tonight", "weekend", "morning", "evening", "afternoon", "week"],
+    # references to the active destination
+    "here": ["there", "here", "this place", "that place"],
+    # references into the destinations MRU list
+    "ord_previous": ["previous", "last one", "the one before"],
+    "ord_first": ["first", "original"],
+    "ord_last": ["last"],
+    # asks for more than a forecast (keeps the weather template out of the way)
+    "beyond_weather": ["to do", "to see", "visit", "museum", "restaurant", "food", "itinerary", "plan",
+                       "recommend", "suggest", "compare", "versus", "why", "hotel", "flight", "activit",
+                       "hike", "hiking", "beach", "ski", "tour", "should i", "can i", "worth", "instead",
+                       "better", "pack", "wear", "bring", "how do", "how to", "how much", "price", "cost"],
+}
+
+# Features whose keywords only match as whole words
+WHOLE_WORD_FEATURES = frozenset(["here"])
+
+# Country names recognized without the place dictionary (_extract_country_and_city)
+COMMON_COUNTRIES = frozenset([
+    "italy", "france", "spain", "germany", "bulgaria", "romania", "greece", "turkey", "israel", "jordan", "egypt",
+])
+
+# Short acknowledgements: never weather follow-ups, and answered as smalltalk without routing.
+# No words that are also place names ("nice").
+ACKNOWLEDGEMENTS = frozenset([
+    "thanks", "thank you", "thx", "ty", "ok", "okay", "k", "got it", "perfect", "great", "awesome",
+    "cool", "sounds good", "ok thanks", "okay thanks", "thanks a lot", "many thanks", "cheers",
+])
+
+# Words a bare weather follow-up ("and tomorrow?", "what about the weekend") is made of.
+FOLLOWUP_WORDS = frozenset([
+    "and", "what", "about", "how", "for", "the", "this", "next", "then", "also", "is", "it", "there",
+    "today", "tomorrow", "tonight", "weekend", "morning", "evening", "afternoon", "week",
+])
+
+_ISO_DATE = r"\b\d{4}-\d{2}-\d{2}\b"
+_WORD_PUNCT = re.compile(r"[^\w\s']")
+
+
+def _build() -> tuple:
+    features: Dict[str, Set[str]] = {}
+    for feature, words in FEATURES.items():
+        for w in words:
+            features.setdefault(w, set()).add(feature)
+    for c in COMMON_COUNTRIES:
+        features.setdefault(c, set()).add("country:" + c)
+    # A keyword found inside a longer one is reported through the longer one
+    closed = {
+        kw: frozenset().union(*(f for other, f in features.items() if other in kw))
+        for kw in features
+    }
+    whole = {w for f in WHOLE_WORD_FEATURES for w in FEATURES[f]}
+    alternation = "|".join(rf"\b{re.escape(k)}\b" if k in whole else re.escape(k)
+                           for k in sorted(closed, key=len, reverse=True))
+    pattern = re.compile(rf"(?=(?P<date>{_ISO_DATE})|(?P<kw>{alternation}))")
+    return pattern, closed
+
+
+_PATTERN, _KEYWORD_FEATURES = _build()
+
+
+@lru_cache(maxsize=1024)
+def scan(text: str) -> FrozenSet[str]:
+    """Features of a message, from one pass over it.
+
+    Keyword features are listed in FEATURES, plus "country:<name>" for COMMON_COUNTRIES; whole-message
+    features are "ack" (a bare acknowledgement) and "followup_words" (only FOLLOWUP_WORDS).
+    """
+    lowered = " ".join(text.lower().split())
+    found: Set[str] = set()
+    for m in _PATTERN.finditer(lowered):
+        kw = m.group("kw")
+        if kw:
+            found |= _KEYWORD_FEATURES[kw]
+        else:
+            found.add("date")
+    words = _WORD_PUNCT.sub(" ", lowered).split()
+    if " ".join(words) in ACKNOWLEDGEMENTS:
+        found.add("ack")
+    if words and all(w in FOLLOWUP_WORDS for w in words):
+        found.add("followup_words")
+    return frozenset(found)
@@ -1,14 +1,96 @@
 from typing import Dict,Any
 
+# Copy-on-write state subtrees.
+# `data` and `user_profile` are updated by building new FrozenDicts along the changed path only;
+# every untouched subtree is shared with the previous state by reference, and values passed in
+# an update are adopted as they are. That sharing is safe because state is never mutated in
+# place: the dicts these helpers build raise on mutation, and any other dict in state (e.g. one
+# that came back from the checkpointer) is only read.
+
+
+class _Remove:
+    def __repr__(self) -> str:
+        return "REMOVE"
+
+
+REMOVE = _Remove()  # value for deep_merge/updated: drop the key
+
+
+class FrozenDict(dict):
+    """Read-only dict. A real dict subclass, so readers, json, msgpack and the checkpointer see a mapping.
+
+    .copy() returns a plain, mutable dict.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenDict is read-only; build a new one with deep_merge() or updated()")
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        # The default dict-subclass pickling refills the object with __setitem__
+        return (FrozenDict, (dict(self),))
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({dict.__repr__(self)})"
+
+
+_SCALARS = frozenset([str, int, float, bool])
+_set = dict.__setitem__  # fill a FrozenDict that is still being built
+_del = dict.__delitem__
+
+
+def _merge(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
+    """deep_merge that returns `a` itself when `b` changes nothing."""
+    out = None
+    for k, v in b.items():
+        cur = a.get(k, REMOVE)
+        if v is cur:
+            continue
+        if isinstance(v, dict) and isinstance(cur, dict):
+            v = _merge(cur, v)
+            if v is cur:
+                continue
+        elif type(v) is type(cur) and type(v) in _SCALARS and v == cur:
+            continue
+        if out is None:
+            out = FrozenDict(a)
+        if v is REMOVE:
+            _del(out, k)
+        else:
+            _set(out, k, v)
+    return a if out is None else out
+
+
 def deep_merge(a: Dict[str,Any], b: Dict[str,Any]) -> Dict[str,Any]:
     """
-    Return a new dict where nested dicts are merged (b overrides a).
-    Non-dict values get replaced. Safe for LangGraph's shallow state merge.
+    Return a new FrozenDict where nested dicts are merged (b overrides a; REMOVE deletes a key).
+    Non-dict values get replaced. Only dicts on changed paths are copied and unchanged subtrees
+    of `a` are shared. When `b` changes nothing, `a` itself is returned, so callers can test
+    `result is a` to skip writing state back. Safe for LangGraph's shallow state merge.
+    """
+    if a is None:
+        return _merge({}, b) if b else FrozenDict()
+    return _merge(a, b) if b else a
+
+
+def updated(a: Dict[str, Any], **changes: Any) -> Dict[str, Any]:
+    """Return `a` with top-level keys replaced (not merged) as a FrozenDict; REMOVE deletes a key.
+
+    Returns `a` itself when every change is already in place.
     """
-    out = dict(a or {})
-    for k, v in (b or {}).items():
-        if isinstance(v,dict) and isinstance(out.get(k), dict):
-            out[k] = deep_merge(out[k],v)
+    a = a if a is not None else {}
+    out = None
+    for k, v in changes.items():
+        cur = a.get(k, REMOVE)
+        if v is cur or (type(v) is type(cur) and type(v) in _SCALARS and v == cur):
+            continue
+        if out is None:
+            out = FrozenDict(a)
+        if v is REMOVE:
+            _del(out, k)
         else:
-            out[k] = v
-    return out
\ No newline at end of file
+            _set(out, k, v)
+    return a if out is None else out
@@ -0,0 +1,298 @@
+from __future__ import annotations
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Local place-name dictionary for the deterministic place resolver.
+# One entry per line: "Name|ISO country|kind" (kind: city or country); "alias=Name" lines map
+# common alternative spellings. Names are matched case-insensitively on word boundaries,
+# longest first, so "New York" wins over "York".
+
+_PLACES = """
+Afghanistan|AF|country
+Albania|AL|country
+Algeria|DZ|country
+Argentina|AR|country
+Armenia|AM|country
+Australia|AU|country
+Austria|AT|country
+Azerbaijan|AZ|country
+Bahrain|BH|country
+Belgium|BE|country
+Bolivia|BO|country
+Bosnia and Herzegovina|BA|country
+Brazil|BR|country
+Bulgaria|BG|country
+Cambodia|KH|country
+Canada|CA|country
+Chile|CL|country
+China|CN|country
+Colombia|CO|country
+Costa Rica|CR|country
+Croatia|HR|country
+Cuba|CU|country
+Cyprus|CY|country
+Czechia|CZ|country
+Denmark|DK|country
+Ecuador|EC|country
+Egypt|EG|country
+Estonia|EE|country
+Ethiopia|ET|country
+Finland|FI|country
+France|FR|country
+Georgia|GE|country
+Germany|DE|country
+Ghana|GH|country
+Greece|GR|country
+Hungary|HU|country
+Iceland|IS|country
+India|IN|country
+Indonesia|ID|country
+Ireland|IE|country
+Israel|IL|country
+Italy|IT|country
+Japan|JP|country
+Jordan|JO|country
+Kenya|KE|country
+Kuwait|KW|country
+Laos|LA|country
+Latvia|LV|country
+Lebanon|LB|country
+Lithuania|LT|country
+Luxembourg|LU|country
+Malaysia|MY|country
+Malta|MT|country
+Mexico|MX|country
+Montenegro|ME|country
+Morocco|MA|country
+Nepal|NP|country
+Netherlands|NL|country
+New Zealand|NZ|country
+North Macedonia|MK|country
+Norway|NO|country
+Oman|OM|country
+Panama|PA|country
+Peru|PE|country
+Philippines|PH|country
+Poland|PL|country
+Portugal|PT|country
+Qatar|QA|country
+Romania|RO|country
+Russia|RU|country
+Saudi Arabia|SA|country
+Serbia|RS|country
+Singapore|SG|country
+Slovakia|SK|country
+Slovenia|SI|country
+South Africa|ZA|country
+South Korea|KR|country
+Spain|ES|country
+Sri Lanka|LK|country
+Sweden|SE|country
+Switzerland|CH|country
+Taiwan|TW|country
+Tanzania|TZ|country
+Thailand|TH|country
+Tunisia|TN|country
+Turkey|TR|country
+Ukraine|UA|country
+United Arab Emirates|AE|country
+United Kingdom|GB|country
+United States|US|country
+Uruguay|UY|country
+Vietnam|VN|country
+Amsterdam|NL|city
+Antalya|TR|city
+Athens|GR|city
+Auckland|NZ|city
+Bangkok|TH|city
+Barcelona|ES|city
+Beijing|CN|city
+Beirut|LB|city
+Belgrade|RS|city
+Berlin|DE|city
+Bern|CH|city
+Bologna|IT|city
+Bordeaux|FR|city
+Boston|US|city
+Bratislava|SK|city
+Brussels|BE|city
+Bucharest|RO|city
+Budapest|HU|city
+Buenos Aires|AR|city
+Cairo|EG|city
+Cancun|MX|city
+Cape Town|ZA|city
+Chicago|US|city
+Copenhagen|DK|city
+Crete|GR|city
+Dubai|AE|city
+Dublin|IE|city
+Dubrovnik|HR|city
+Edinburgh|GB|city
+Eilat|IL|city
+Florence|IT|city
+Frankfurt|DE|city
+Geneva|CH|city
+Granada|ES|city
+Haifa|IL|city
+Hamburg|DE|city
+Hanoi|VN|city
+Helsinki|FI|city
+Ho Chi Minh City|VN|city
+Hod HaSharon|IL|city
+Holon|IL|city
+Hong Kong|HK|city
+Honolulu|US|city
+Istanbul|TR|city
+Jerusalem|IL|city
+Kyiv|UA|city
+Kyoto|JP|city
+Las Vegas|US|city
+Lima|PE|city
+Lisbon|PT|city
+Ljubljana|SI|city
+London|GB|city
+Los Angeles|US|city
+Lyon|FR|city
+Madrid|ES|city
+Malaga|ES|city
+Manchester|GB|city
+Marrakech|MA|city
+Marseille|FR|city
+Melbourne|AU|city
+Mexico City|MX|city
+Miami|US|city
+Milan|IT|city
+Montreal|CA|city
+Moscow|RU|city
+Mumbai|IN|city
+Munich|DE|city
+Naples|IT|city
+New Delhi|IN|city
+New York|US|city
+Nice|FR|city
+Osaka|JP|city
+Oslo|NO|city
+Palermo|IT|city
+Paris|FR|city
+Porto|PT|city
+Prague|CZ|city
+Reykjavik|IS|city
+Rhodes|GR|city
+Riga|LV|city
+Rio de Janeiro|BR|city
+Rome|IT|city
+Salzburg|AT|city
+San Francisco|US|city
+Santorini|GR|city
+Sarajevo|BA|city
+Seattle|US|city
+Seoul|KR|city
+Seville|ES|city
+Shanghai|CN|city
+Sofia|BG|city
+Split|HR|city
+Stockholm|SE|city
+Sydney|AU|city
+Tallinn|EE|city
+Tbilisi|GE|city
+Tel Aviv|IL|city
+Thessaloniki|GR|city
+Tokyo|JP|city
+Toronto|CA|city
+Valencia|ES|city
+Vancouver|CA|city
+Venice|IT|city
+Vienna|AT|city
+Vilnius|LT|city
+Warsaw|PL|city
+Washington|US|city
+Zagreb|HR|city
+Zurich|CH|city
+nyc=New York
+new york city=New York
+la=Los Angeles
+sf=San Francisco
+usa=United States
+us=United States
+uk=United Kingdom
+england=United Kingdom
+uae=United Arab Emirates
+holland=Netherlands
+czech republic=Czechia
+korea=South Korea
+kiev=Kyiv
+lisboa=Lisbon
+roma=Rome
+firenze=Florence
+venezia=Venice
+milano=Milan
+napoli=Naples
+praha=Prague
+wien=Vienna
+munchen=Munich
+münchen=Munich
+zürich=Zurich
+sevilla=Seville
+tel-aviv=Tel Aviv
+saigon=Ho Chi Minh City
+delhi=New Delhi
+"""
+
+# Aliases that are also ordinary English words only count when written in capitals, and as the
+# first word of a sentence ("Nice! What should I pack?", "Split the budget") only in all caps
+# ("LA") or followed by their country ("Lima, Peru")
+_CASE_SENSITIVE = {"la", "us", "nice", "split", "lima"}
+_SENTENCE_END = re.compile(r"(?:^|[.!?])\s*$")
+_COMMA = re.compile(r",\s*")
+
+_entries: Optional[Dict[str, Tuple[str, str, str]]] = None
+_pattern: Optional[re.Pattern] = None
+
+
+def _load() -> Tuple[Dict[str, Tuple[str, str, str]], re.Pattern]:
+    global _entries, _pattern
+    if _entries is None:
+        entries: Dict[str, Tuple[str, str, str]] = {}
+        aliases: Dict[str, str] = {}
+        for line in _PLACES.strip().splitlines():
+            if "=" in line:
+                alias, name = line.split("=", 1)
+                aliases[alias] = name
+            else:
+                name, cc, kind = line.split("|")
+                entries[name.lower()] = (name, cc, kind)
+        for alias, name in aliases.items():
+            entries[alias] = entries[name.lower()]
+        keys = sorted(entries, key=len, reverse=True)
+        _pattern = re.compile(r"(?<![\w-])(" + "|".join(re.escape(k) for k in keys) + r")(?![\w-])", re.I)
+        _entries = entries
+    return _entries, _pattern
+
+
+def lookup(name: str) -> Optional[Tuple[str, str, str]]:
+    """(canonical name, ISO country, kind) for a known place or alias, else None."""
+    entries, _ = _load()
+    return entries.get((name or "").strip().lower())
+
+
+def find_places(msg: str) -> List[Tuple[str, str, str]]:
+    """Known places mentioned in the message, in order, without duplicates."""
+    entries, pattern = _load()
+    found: List[Tuple[str, str, str]] = []
+    for m in pattern.finditer(msg or ""):
+        text = m.group(1)
+        key = text.lower()
+        if key in _CASE_SENSITIVE and not text[:1].isupper():
+            continue
+        if key in _CASE_SENSITIVE and not text.isupper() and _SENTENCE_END.search(msg[:m.start()]):
+            comma = _COMMA.match(msg, m.end())
+            country = comma and pattern.match(msg, comma.end())
+            if not (country and entries[country.group(1).lower()][1:] == (entries[key][1], "country")):
+                continue
+        if key in ("la", "us") and text != text.upper():
+            continue
+        entry = entries[key]
+        if entry not in found:
+            found.append(entry)
+    return found
@@ -0,0 +1,192 @@
+from __future__ import annotations
+import re
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# Rule-based parser for the time expressions users actually type, filling the same fields as
+# TimePlan: today/tomorrow/tonight, (this|next) weekend, weekdays, ISO dates, month names
+# ("Dec 3", "3rd of December"), ranges ("Dec 3-7", "friday to sunday", "2025-12-03 to 2025-12-07"),
+# "in N days/weeks", "the next N days", "this/next week".
+# parse_time_expression() returns None when the message still has a time cue it could not
+# consume, so the caller can fall back to the LLM planner.
+
+MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3, "apr": 4, "april": 4,
+    "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7, "aug": 8, "august": 8, "sep": 9, "sept": 9,
+    "september": 9, "oct": 10, "october": 10, "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+WEEKDAYS = {"monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3, "friday": 4, "saturday": 5, "sunday": 6}
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14,
+}
+
+# Word-bounded, so "10 markets" or "2 junior suites" is not read as a date
+_MONTH = r"\b(" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\b\.?"
+_DAY = r"(\d{1,2})(?:st|nd|rd|th)?"
+_WD = r"(" + "|".join(WEEKDAYS) + r")"
+_NUM = r"(\d{1,2}|" + "|".join(NUMBER_WORDS) + r")"
+_ISO = r"(\d{4}-\d{2}-\d{2})"
+_TO = r"\s*(?:-|–|to|until|till|through|thru)\s*"
+
+# Cues left over after parsing mean "there was a time expression we did not understand".
+# "may" only counts next to a month context, so "may I ask" is not a cue. Weekday abbreviations
+# and "after next" ("the weekend after next") are not parsed, so they go to the LLM.
+_UNPARSED_CUE = re.compile(
+    r"\b(january|february|march|april|june|july|august|september|october|november|december|"
+    r"jan|feb|mar|apr|jun|jul|aug|sept?|oct|nov|dec|"
+    r"(?:in|of|early|mid|late|since|until|by|during|through|for)\s+may|may\s+\d{1,2}|\d{1,2}(?:st|nd|rd|th)|"
+    r"monday|tuesday|wednesday|thursday|friday|saturday|sunday|mon|tues?|wed|thur?s?|fri|sat|sun|after next|"
+    r"today|tonight|tomorrow|weekend|"
+    r"days?|weeks?|months?|fortnight|christmas|easter|holidays?|new year|\d{1,2}/\d{1,2}|\d{4}-\d{2}-\d{2})\b"
+)
+
+_TODAY = re.compile(r"\b(today|tonight|this (morning|afternoon|evening)|later today|right now|now)\b")
+_TOMORROW = re.compile(r"\b(tomorrow)( (morning|afternoon|evening|night))?\b")
+_WEEKEND = re.compile(r"\b((this|next|the|coming) )?weekend\b")
+
+
+def _num(tok: str) -> int:
+    return int(tok) if tok.isdigit() else NUMBER_WORDS[tok]
+
+
+def _month_day(month: str, day: str, base: date, year: Optional[int] = None) -> Optional[date]:
+    """Date for a month/day pair; without a year, the next occurrence on or after base."""
+    try:
+        d = date(year or base.year, MONTHS[month], int(day))
+    except ValueError:
+        return None
+    if year is None and d < base:
+        d = d.replace(year=d.year + 1)
+    return d
+
+
+def _weekday(name: str, base: date, next_: bool = False) -> date:
+    delta = (WEEKDAYS[name] - base.weekday()) % 7
+    if next_ and delta == 0:
+        delta = 7
+    return base + timedelta(days=delta)
+
+
+def _range(text: str, base: date) -> Tuple[Optional[Tuple[date, date]], str]:
+    """Find the first date range; returns it and the text with the match blanked out."""
+    patterns = [
+        (_ISO + _TO + _ISO, lambda m: (date.fromisoformat(m[1]), date.fromisoformat(m[2]))),
+        (_MONTH + r"\s+" + _DAY + _TO + _MONTH + r"\s+" + _DAY,
+         lambda m: (_month_day(m[1], m[2], base), _month_day(m[3], m[4], base))),
+        (_MONTH + r"\s+" + _DAY + _TO + _DAY + r"\b",
+         lambda m: (_month_day(m[1], m[2], base), _month_day(m[1], m[3], base))),
+        (_DAY + r"\s+" + _MONTH + _TO + _DAY + r"\s+" + _MONTH,
+         lambda m: (_month_day(m[2], m[1], base), _month_day(m[4], m[3], base))),
+        (r"\b" + _DAY + _TO + _DAY + r"\s+(?:of\s+)?" + _MONTH,
+         lambda m: (_month_day(m[3], m[1], base), _month_day(m[3], m[2], base))),
+        (r"\b(?:from\s+)?" + _WD + _TO + _WD + r"\b",
+         lambda m: (_weekday(m[1], base), _weekday(m[1], base) + timedelta(days=(WEEKDAYS[m[2]] - WEEKDAYS[m[1]]) % 7))),
+        (r"\b(?:for\s+)?(?:the\s+)?(?:next|coming)\s+" + _NUM + r"\s+days\b",
+         lambda m: (base, base + timedelta(days=_num(m[1]) - 1))),
+        (r"\bnext\s+week\b",
+         lambda m: (base + timedelta(days=7 - base.weekday()), base + timedelta(days=13 - base.weekday()))),
+        (r"\b(?:for\s+)?(?:the\s+)?(?:next|coming)\s+" + _NUM + r"\s+weeks?\b",
+         lambda m: (base, base + timedelta(days=7 * _num(m[1]) - 1))),
+        (r"\b(?:this|the\s+coming)\s+week\b", lambda m: (base, base + timedelta(days=6 - base.weekday()))),
+    ]
+    for pat, build in patterns:
+        m = re.search(pat, text)
+        if m:
+            start, end = build(m)
+            if start and end:
+                if end < start:
+                    end = end.replace(year=end.year + 1)
+                return (start, end), text[:m.start()] + " " + text[m.end():]
+    return None, text
+
+
+def _single_dates(text: str, base: date) -> Tuple[List[date], str]:
+    """Collect explicit single dates; returns them in order and the text with the matches blanked out."""
+    found: List[Tuple[int, date]] = []
+    patterns = [
+        (_ISO, lambda m: date.fromisoformat(m[1])),
+        (_MONTH + r"\s+" + _DAY + r"(?:,?\s+(\d{4}))?\b",
+         lambda m: _month_day(m[1], m[2], base, int(m[3]) if m[3] else None)),
+        (r"\b" + _DAY + r"\s+(?:of\s+)?" + _MONTH + r"(?:,?\s+(\d{4}))?",
+         lambda m: _month_day(m[2], m[1], base, int(m[3]) if m[3] else None)),
+        (r"\b(?:the\s+)?day\s+after\s+tomorrow\b", lambda m: base + timedelta(days=2)),
+        (r"\bin\s+" + _NUM + r"\s+days?\b", lambda m: base + timedelta(days=_num(m[1]))),
+        (r"\bin\s+" + _NUM + r"\s+weeks?\b", lambda m: base + timedelta(days=7 * _num(m[1]))),
+        (r"\b(?:(this|next|on|coming)\s+)?" + _WD + r"\b", lambda m: _weekday(m[2], base, next_=m[1] == "next")),
+    ]
+    for pat, build in patterns:
+        for m in list(re.finditer(pat, text)):
+            d = build(m)
+            if d:
+                found.append((m.start(), d))
+        # Invalid dates ("31 feb") stay in the text so the unparsed-cue check sends them to the LLM
+        text = re.sub(pat, lambda m: " " if build(m) else m[0], text)
+    found.sort(key=lambda x: x[0])
+    dates: List[date] = []
+    for _, d in found:
+        if d not in dates:
+            dates.append(d)
+    return dates, text
+
+
+def parse_time_expression(msg: str, base: date) -> Optional[Dict[str, Any]]:
+    """Parse the time a message refers to into TimePlan fields, relative to `base` (today).
+
+    Returns None if the message contains a time expression the rules do not cover.
+    """
+    text = " " + re.sub(r"[?!,;]", " ", (msg or "").lower()) + " "
+
+    span, text = _range(text, base)
+    if span:
+        return {
+            "target_type": "range", "iso_dates": None,
+            "iso_start": span[0].isoformat(), "iso_end": span[1].isoformat(),
+            "rationale": "Parsed date range",
+        }
+
+    dates, text = _single_dates(text, base)
+    target = "unspecified"
+    for pat, tt in ((_WEEKEND, "weekend"), (_TOMORROW, "tomorrow"), (_TODAY, "today")):
+        if pat.search(text):
+            target = target if target != "unspecified" else tt
+            text = pat.sub(" ", text)
+
+    if _UNPARSED_CUE.search(text):
+        return None
+    if dates:
+        return {
+            "target_type": "date", "iso_dates": [d.isoformat() for d in dates],
+            "iso_start": None, "iso_end": None, "rationale": "Parsed explicit date(s)",
+        }
+    return {
+        "target_type": target, "iso_dates": None, "iso_start": None, "iso_end": None,
+        "rationale": "No time mentioned" if target == "unspecified" else f"Parsed '{target}'",
+    }
+
+
+# ------------------------------- coverage ---------------------------------
+
+LOG_MSG = re.compile(r"^DEBUG: msg='(.*)'$")  # logged by plan_tools for every travel turn
+
+
+def coverage(messages: List[str], base: Optional[date] = None) -> Dict[str, Any]:
+    """How many messages the rules parse, by target type, and which ones need the LLM."""
+    base = base or date.today()
+    by_type: Dict[str, int] = {}
+    fallback: List[str] = []
+    for msg in messages:
+        tp = parse_time_expression(msg, base)
+        if tp is None:
+            fallback.append(msg)
+        else:
+            by_type[tp["target_type"]] = by_type.get(tp["target_type"], 0) + 1
+    total = len(messages)
+    return {
+        "messages": total,
+        "parsed": total - len(fallback),
+        "coverage": round((total - len(fallback)) / total, 3) if total else None,
+        "by_type": by_type,
+        "fallback": fallback,
+    }
+
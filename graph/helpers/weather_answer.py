@@ -0,0 +1,122 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+
+from .facts_store import forecast_rows
+from .forecast_summary import RAINY_PCT, SUMMARY_MIN_DAYS, summarize_forecast
+from .keywords import scan
+
+# Deterministic answers for pure weather questions.
+# When the turn is a weather question and the facts cover every requested date, compose_answer
+# renders the reply here in the house style (one-line summary, then bullets, packing hints last)
+# instead of having the LLM rephrase the numbers. Anything else returns None and is composed by
+# the LLM as before, including imperial units (the labels and thresholds below are Celsius).
+
+HOT_C = 28.0        # a high at or above: sun protection
+WARM_C = 20.0
+COLD_C = 10.0       # a high at or below: warm coat
+FREEZING_C = 0.0    # a low at or below: gloves and hat
+SWING_C = 12.0      # a day's high-low spread at least this wide: layers
+SHOWER_PCT = 30     # precipitation chance worth a compact umbrella (RAINY_PCT and up: rain gear)
+MAX_WORDS = 14      # longer messages usually ask for more than the forecast
+
+# Message features that ask for more than the forecast
+_BEYOND = frozenset(["country_fact", "web", "distance", "beyond_weather"])
+
+
+def is_pure_weather(state: Dict[str, Any]) -> bool:
+    """True for a weather-intent message that asks for nothing but the forecast."""
+    if state.get("intent") != "weather":
+        return False
+    msg = state.get("user_msg", "") or ""
+    return len(msg.split()) <= MAX_WORDS and not (scan(msg) & _BEYOND)
+
+
+def _deg(v: float) -> str:
+    return f"{v:g}°"
+
+
+def packing_hints(highs: List[float], lows: List[float], precips: List[int]) -> List[str]:
+    """What to bring for these days, from temperature and rain thresholds."""
+    hints = []
+    wettest = max(precips, default=0)
+    if wettest >= RAINY_PCT:
+        hints.append("an umbrella or rain jacket")
+    elif wettest >= SHOWER_PCT:
+        hints.append("a compact umbrella")
+    if max(highs) >= HOT_C:
+        hints.append("sunscreen, a hat and light clothes")
+    if min(highs) <= COLD_C:
+        hints.append("a warm coat")
+    if min(lows) <= FREEZING_C:
+        hints.append("gloves and a warm hat")
+    if max(h - l for h, l in zip(highs, lows)) >= SWING_C:
+        hints.append("layers for cool mornings and evenings")
+    return hints
+
+
+def _feel(highs: List[float]) -> str:
+    mean = sum(highs) / len(highs)
+    return "hot" if mean >= HOT_C else "warm" if mean >= WARM_C else "mild" if mean > COLD_C else "cold"
+
+
+def _rain(precips: List[int], days: int) -> str:
+    if not precips:
+        return ""
+    rainy = sum(p >= RAINY_PCT for p in precips)
+    if rainy:
+        return ", rain likely" if days == 1 else f", rain likely on {rainy} of {days} days"
+    return ", a chance of showers" if max(precips) >= SHOWER_PCT else ", mostly dry"
+
+
+def render(state: Dict[str, Any], place: Optional[str], now: str) -> Optional[str]:
+    """The full answer for a pure weather turn, or None when the LLM should compose it."""
+    data = state.get("data") or {}
+    if not place or data.get("units", "metric") != "metric" or not is_pure_weather(state):
+        return None
+    facts = data.get("facts") or {}
+    if facts.get("unavailable"):
+        return None
+    wx = (facts.get("weather_by_place") or {}).get(place)
+    target_dates = [d for d in (facts.get("target_dates") or [facts.get("today")]) if d]
+    if not wx or not target_dates:
+        return None
+    rows = forecast_rows(wx["forecast"], target_dates)
+    if len(rows) != len(target_dates) or any(tmax is None or tmin is None for _, tmax, tmin, _ in rows):
+        return None
+
+    name = wx["place"]["name"]
+    highs = [r[1] for r in rows]
+    lows = [r[2] for r in rows]
+    precips = [r[3] for r in rows if r[3] is not None]
+    days = len(rows)
+    span = f"on {rows[0][0]}" if days == 1 else f"from {rows[0][0]} to {rows[-1][0]}"
+    if days == 1:
+        temps = f": high {highs[0]:g}°C, low {lows[0]:g}°C"
+    elif days < SUMMARY_MIN_DAYS:
+        temps = f": highs {min(highs):g}–{max(highs):g}°C"
+    else:
+        temps = ""   # the range bullets carry the numbers
+    lines = [f"As of {now}, {name} looks {_feel(highs)} {span}{temps}{_rain(precips, days)}."]
+
+    if days >= SUMMARY_MIN_DAYS:
+        s = summarize_forecast(wx["forecast"], target_dates)
+
+        def day(d: Dict[str, Any]) -> str:
+            seg = f"{d['date']} ({_deg(d['tmax'])}/{_deg(d['tmin'])}"
+            return seg + (f", precip {d['precip']}%)" if d["precip"] is not None else ")")
+
+        lines.append(f"- Highs {s['high_min']:g}–{s['high_max']:g}°C, lows from {s['low_min']:g}°C")
+        rainy = f"- Rainy days (≥{RAINY_PCT}% precip): {s['rainy_days']}"
+        if s["rainy_dates"]:
+            rainy += " (" + ", ".join(s["rainy_dates"][:5]) + ("…" if len(s["rainy_dates"]) > 5 else "") + ")"
+        lines.append(rainy)
+        lines.append(f"- Best day: {day(s['best'])}")
+        lines.append(f"- Worst day: {day(s['worst'])}")
+    else:
+        for d, tmax, tmin, p in rows:
+            lines.append(f"- {d}: {_deg(tmax)}/{_deg(tmin)}" + (f" (precip {p}%)" if p is not None else ""))
+
+    hints = packing_hints(highs, lows, precips)
+    if hints:
+        lines.append("- Pack: " + ", ".join(hints))
+    return "\n".join(lines)
@@ -1,22 +1,29 @@
-import re
+from .helpers.keywords import ACKNOWLEDGEMENTS, FOLLOWUP_WORDS, scan
 
 # Heuristic fallbacks used when the LLM's tool plan is uncertain.
+# All of them read the feature set of helpers.keywords.scan(), one cached pass per message.
+
+def is_acknowledgement(user_msg: str) -> bool:
+    """Return True for a bare acknowledgement such as "ok", "thanks!" or "got it"."""
+    return "ack" in scan(user_msg)
+
+def is_bare_time_followup(user_msg: str) -> bool:
+    """Return True if the message only shifts the time, e.g. "and tomorrow?"."""
+    f = scan(user_msg)
+    return "followup_words" in f and "followup_time" in f
 
 def hint_weather(user_msg: str) -> bool:
     """Return True if the message likely implies a weather query.
 
     Matches common weather terms or explicit ISO dates.
     """
-    weather_terms = r"(weather|rain|temperature|forecast|sunny|snow|wind)"
-    date_terms = r"(today|tomorrow|weekend|\b\d{4}-\d{2}-\d{2}\b)"
-    return bool(re.search(weather_terms, user_msg, re.I)) or bool(re.search(date_terms, user_msg, re.I))
+    f = scan(user_msg)
+    return "weather" in f or "date" in f
 
 def hint_country_facts(user_msg: str) -> bool:
     """Return True if the message likely asks about country logistics/facts."""
-    fact_terms = r"(currency|visa|language|timezone|plug|outlet|capital)"
-    return bool(re.search(fact_terms, user_msg, re.I))
+    return "country_fact" in scan(user_msg)
 
 def hint_web_search(user_msg: str) -> bool:
     """Return True if the message suggests a need for fresh web information."""
-    pat = r"(open\s+today|hours|closed|latest|news|strike|event(s)?\s+(today|tonight|this weekend)|update)"
-    return bool(re.search(pat, user_msg, re.I))
+    return "web" in scan(user_msg)
@@ -1,5 +1,3 @@
-from langchain_core.prompts import PromptTemplate
-
 SYSTEM_PROMPT = """You are a concise, friendly travel assistant.
 Rules:
 - Be helpful and practical.
@@ -52,8 +50,8 @@ REASONING_CHECKLIST = """Plan:
 5) Offer a sensible next step or question if needed.
 """
 
-COMPOSE_TMPL = PromptTemplate.from_template(
-    """{system}
+# Templates are plain str.format strings ({{ }} for literal braces)
+COMPOSE_TMPL = """{system}
 
 [Task]
 Using the conversation and any fetched data, answer the user's latest message.
@@ -72,6 +70,8 @@ Using the conversation and any fetched data, answer the user's latest message.
 - If weather-by-date data is available, output:
   1) A one-line TL;DR.
   2) Then one bullet per date: "- YYYY-MM-DD: X°/Y° (precip P%)".
+- If a weather summary for a date range is available, output a one-line TL;DR, then bullets for
+  the high/low range, rainy days, and the best and worst day. Do NOT list every date.
 - Otherwise, reply in 2–3 crisp sentences.
 - **NEVER** add sources, citations, or "Sources:" lines to weather responses.
 - **NEVER** write placeholders like "[Insert source(s) ...]" or "check a reliable source".
@@ -88,7 +88,6 @@ Return a single JSON object with EXACTLY these keys and types:
 Do not add any other keys. Do not wrap in code fences. No prose outside JSON.
 
 User message: "{user_msg}" """
-)
 
 
 SMALLTALK_REDIRECT_PROMPT = """You received a smalltalk message from the user:
@@ -103,8 +102,7 @@ Important:
 - Do NOT answer the travel request here; only pivot back to travel planning.
 Keep it concise and friendly."""
 
-SUMMARY_TMPL = PromptTemplate.from_template(
-    """Update the running conversation summary.
+SUMMARY_TMPL = """Update the running conversation summary.
 
 Previous summary (may be empty):
 {prev}
@@ -115,7 +113,6 @@ Assistant: {assistant}
 
 Write a concise 3-5 line summary focused on durable facts (destination, dates, preferences, decisions).
 Do NOT include word-for-word quotes; keep it compact and factual."""
-)
 
 PLANNER_SYS = f"""You decide which data tools to call for a travel assistant.
 
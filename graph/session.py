@@ -0,0 +1,186 @@
+from __future__ import annotations
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .checkpoint import Thread, turn_input
+from .helpers.history import HistoryStore
+from .helpers.merge import updated
+from .session_store import SECTIONS, SessionRecord
+from .state import GraphState
+from telemetry import metrics
+
+
+class _Stored:
+    """Session attribute that, on a resumed session, is decoded from the stored record on first read."""
+
+    def __init__(self, load: Callable[[Any], Any] = lambda v: v):
+        self.load = load
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            value = obj.__dict__[self.name] = self.load(obj._record.section(self.name))
+            return value
+
+    def __set__(self, obj, value) -> None:
+        obj.__dict__[self.name] = value
+
+
+class ConversationSession:
+    """One user's conversation with the graph: the state carried from turn to turn.
+
+    Shared by app.py (one per Streamlit session) and the headless runners. With a
+    checkpointer the graph keeps history/profile/summary/data under the session's thread
+    id and each turn only sends the delta; without one the full state is sent every turn.
+    """
+
+    history = _Stored(HistoryStore.load)
+    user_profile = _Stored()
+    summary = _Stored()
+    data = _Stored()
+
+    def __init__(self, graph, user_profile: Optional[Dict[str, Any]] = None, thread_id: Optional[str] = None):
+        self.graph = graph
+        self.checkpointed = graph.checkpointer is not None
+        self.thread = Thread(graph.checkpointer, thread_id)
+        self.history = HistoryStore()  # transcript: hot window + compressed older turns
+        self.intent: Optional[str] = None  # last intent (for sticky-travel rule)
+        self.offtopic_count = 0  # consecutive smalltalk turns
+        self.summary = ""  # running TL;DR
+        self.user_profile: Dict[str, Any] = user_profile or {}  # destinations MRU, dates, style, etc.
+        self.data: Dict[str, Any] = {}  # tool facts, caches, flags (web_allowed, units), etc.
+        self.location_synced = False
+        self._record: Optional[SessionRecord] = None
+
+    def set_location(self, location_data: Dict[str, Any]) -> None:
+        """Record the user's detected location; sent to the graph with the next turn."""
+        self.user_profile = updated(
+            self.user_profile, current_location=location_data["location_string"], location_data=location_data,
+        )
+
+    def graph_input(self, user_msg: str) -> GraphState:
+        if self.checkpointed:
+            # The checkpointer already holds history, profile, summary and data: send only the delta
+            state: GraphState = turn_input(user_msg)
+            if self.user_profile.get("location_data") and not self.location_synced:
+                # Session profile mirrors the checkpointed one, plus the newly detected location
+                state["user_profile"] = self.user_profile
+                self.location_synced = True
+            return state
+        return {
+            "history": self.history.hot(),
+            "user_msg": user_msg,
+            "user_profile": self.user_profile,
+            "summary": self.summary,
+            "data": {**(self.data or {}), "web_allowed": True, "units": "metric"},
+            "intent": self.intent,
+            "offtopic_count": self.offtopic_count,
+        }
+
+    @property
+    def config(self) -> Optional[Dict[str, Any]]:
+        return self.thread.config if self.checkpointed else None
+
+    def begin_turn(self, user_msg: str) -> GraphState:
+        """Record the user's message and return the graph input for this turn."""
+        self.history.append("user", user_msg)
+        return self.graph_input(user_msg)
+
+    def finish_turn(self, out: Dict[str, Any]) -> str:
+        """Carry the turn's output state to the next turn and return the reply."""
+        self.intent = out.get("intent", self.intent)
+        self.offtopic_count = out.get("offtopic_count", self.offtopic_count)
+        # Only assign what the turn returned: reading a default would decode a stored section
+        for key in ("summary", "user_profile", "data"):
+            if key in out:
+                setattr(self, key, out[key])
+
+        reply = out.get("final") or out.get("draft", "(no reply)")
+        self.history.append("assistant", reply)
+        return reply
+
+    def turn(self, user_msg: str) -> str:
+        """Run one turn through the graph and return the assistant's reply."""
+        state = self.begin_turn(user_msg)
+        t0 = time.perf_counter()
+        out = self.graph.invoke(state, self.config)
+        metrics.observe("turn", time.perf_counter() - t0)
+        return self.finish_turn(out)
+
+    def export(self) -> Dict[str, Any]:
+        """Picklable snapshot of the conversation, e.g. to move it to another process."""
+        state = {
+            "thread_id": self.thread.thread_id,
+            "history": list(self.history.messages()),
+            "intent": self.intent,
+            "offtopic_count": self.offtopic_count,
+            "summary": self.summary,
+            "user_profile": self.user_profile,
+            "data": self.data,
+            "location_synced": self.location_synced,
+        }
+        if self.checkpointed:
+            state["checkpoint"] = self.graph.get_state(self.config).values
+        return state
+
+    @classmethod
+    def restore(cls, graph, state: Dict[str, Any]) -> "ConversationSession":
+        """Rebuild a session from export() on this process's graph."""
+        session = cls(graph, state["user_profile"], thread_id=state["thread_id"])
+        for m in state["history"]:
+            session.history.append(m["role"], m["content"])
+        session.intent = state["intent"]
+        session.offtopic_count = state["offtopic_count"]
+        session.summary = state["summary"]
+        session.data = state["data"]
+        session.location_synced = state["location_synced"]
+        if session.checkpointed and state.get("checkpoint"):
+            # Seed the thread as if the last turn had just finished
+            graph.update_state(session.config, state["checkpoint"], as_node="update_summary")
+        return session
+
+    def sections(self) -> Dict[str, Any]:
+        """Sections for the session store; ones never read since resume are passed through encoded."""
+        out: Dict[str, Any] = {"meta": {
+            "thread_id": self.thread.thread_id,
+            "intent": self.intent,
+            "offtopic_count": self.offtopic_count,
+            "location_synced": self.location_synced,
+        }}
+        for name in SECTIONS[1:]:
+            if name not in self.__dict__ and self._record is not None and name in self._record:
+                out[name] = self._record.raw(name)
+            else:
+                value = getattr(self, name)
+                out[name] = value.dump() if name == "history" else value
+        return out
+
+    @classmethod
+    def resume(cls, graph, record: SessionRecord) -> "ConversationSession":
+        """Rebuild a session from a stored record; sections are decoded when first read."""
+        meta = record.section("meta")
+        session = cls.__new__(cls)
+        session.graph = graph
+        session.checkpointed = graph.checkpointer is not None
+        session.thread = Thread(graph.checkpointer, meta["thread_id"])
+        session.intent = meta["intent"]
+        session.offtopic_count = meta["offtopic_count"]
+        session.location_synced = meta["location_synced"]
+        session._record = record
+        if session.checkpointed and not graph.get_state(session.config).values:
+            # The checkpointer lost this thread (restart, other host): seed it from the record
+            graph.update_state(session.config, {
+                "history": session.history.hot(),
+                "user_profile": session.user_profile,
+                "summary": session.summary,
+                "data": session.data,
+                "intent": session.intent,
+                "offtopic_count": session.offtopic_count,
+            }, as_node="update_summary")
+        return session
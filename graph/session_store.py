@@ -0,0 +1,362 @@
+from __future__ import annotations
+import os
+import queue
+import sqlite3
+import struct
+import threading
+import zlib
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import ormsgpack
+
+# Durable conversation sessions.
+# A session is stored as one record made of independently compressed sections (meta, history,
+# user_profile, summary, data). Sections are msgpack + zlib; array.array forecast columns are
+# stored as raw bytes. Loading a record only reads the section table, so a resumed session
+# decodes a section the first time something reads it (see ConversationSession), and a section
+# that was never read is written back as the same bytes.
+# Saves are encoded in the caller and written by a background thread; repeated saves of the
+# same session before the write happens collapse into one.
+
+SESSION_STORE = os.getenv("SESSION_STORE", "none")   # "none", "memory", "sqlite" or "log"
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", "")
+WRITE_BEHIND = os.getenv("SESSION_STORE_WRITE_BEHIND", "1").lower() in ("1", "true", "yes")
+# The log backend compacts once superseded bytes exceed live bytes and this floor
+LOG_COMPACT_MIN_BYTES = int(os.getenv("SESSION_STORE_COMPACT_MIN_BYTES", str(1 << 20)))
+
+SECTIONS = ("meta", "history", "user_profile", "summary", "data")
+_MAGIC = b"TS1"
+_EXT_ARRAY = 1
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, array):
+        return ormsgpack.Ext(_EXT_ARRAY, obj.typecode.encode("ascii") + obj.tobytes())
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"cannot store {type(obj).__name__}")
+
+
+def _ext_hook(code: int, payload: bytes) -> Any:
+    if code == _EXT_ARRAY:
+        return array(payload[:1].decode("ascii"), payload[1:])
+    raise ValueError(f"unknown extension type {code}")
+
+
+def encode_section(value: Any) -> bytes:
+    return zlib.compress(ormsgpack.packb(value, default=_default, option=ormsgpack.OPT_NON_STR_KEYS), 3)
+
+
+def decode_section(blob: bytes) -> Any:
+    return ormsgpack.unpackb(zlib.decompress(blob), ext_hook=_ext_hook, option=ormsgpack.OPT_NON_STR_KEYS)
+
+
+class Encoded(bytes):
+    """A section that is already encoded (read from a record and never decoded)."""
+
+
+def encode_record(sections: Dict[str, Any]) -> bytes:
+    """Pack sections as: magic, count, then (name, length) entries, then the section blobs."""
+    blobs = [(name.encode("ascii"), value if isinstance(value, Encoded) else encode_section(value))
+             for name, value in sections.items()]
+    header = [_MAGIC, struct.pack("<B", len(blobs))]
+    for name, blob in blobs:
+        header.append(struct.pack("<B", len(name)) + name + struct.pack("<I", len(blob)))
+    return b"".join(header + [blob for _, blob in blobs])
+
+
+class SessionRecord:
+    """A stored session whose sections are decoded on first access."""
+
+    def __init__(self, raw: bytes):
+        if raw[:3] != _MAGIC:
+            raise ValueError("not a session record")
+        self._raw = memoryview(raw)
+        self._spans: Dict[str, Tuple[int, int]] = {}
+        self._decoded: Dict[str, Any] = {}
+        pos, (count,) = 4, struct.unpack_from("<B", raw, 3)
+        entries = []
+        for _ in range(count):
+            (n,) = struct.unpack_from("<B", raw, pos)
+            name = bytes(raw[pos + 1:pos + 1 + n]).decode("ascii")
+            (length,) = struct.unpack_from("<I", raw, pos + 1 + n)
+            entries.append((name, length))
+            pos += 1 + n + 4
+        for name, length in entries:
+            self._spans[name] = (pos, length)
+            pos += length
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._spans
+
+    def section(self, name: str, default: Any = None) -> Any:
+        if name not in self._spans:
+            return default
+        if name not in self._decoded:
+            start, length = self._spans[name]
+            self._decoded[name] = decode_section(self._raw[start:start + length])
+        return self._decoded[name]
+
+    def raw(self, name: str) -> Encoded:
+        start, length = self._spans[name]
+        return Encoded(self._raw[start:start + length])
+
+    def decoded(self) -> List[str]:
+        """Sections decoded so far (for checking that a turn stayed lazy)."""
+        return list(self._decoded)
+
+    @property
+    def size(self) -> int:
+        return len(self._raw)
+
+
+# ------------------------------- backends --------------------------------
+
+class MemoryBackend:
+    def __init__(self):
+        self._blobs: Dict[str, bytes] = {}
+
+    def put(self, sid: str, blob: bytes) -> None:
+        self._blobs[sid] = blob
+
+    def get(self, sid: str) -> Optional[bytes]:
+        return self._blobs.get(sid)
+
+    def delete(self, sid: str) -> None:
+        self._blobs.pop(sid, None)
+
+    def close(self) -> None:
+        pass
+
+
+class SqliteBackend:
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS sessions (sid TEXT PRIMARY KEY, blob BLOB NOT NULL)")
+        self._lock = threading.Lock()
+
+    def put(self, sid: str, blob: bytes) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO sessions (sid, blob) VALUES (?, ?)", (sid, blob))
+
+    def get(self, sid: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT blob FROM sessions WHERE sid = ?", (sid,)).fetchone()
+        return bytes(row[0]) if row else None
+
+    def delete(self, sid: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class LogBackend:
+    """Append-only log of (sid, record) entries with an in-memory index; single writer process.
+
+    Each entry is <u32 length><u8 sid length><sid><record>; an empty record is a delete.
+    The log is compacted (on open, and after a put or delete) once more than half of it is
+    superseded entries and those are at least `compact_min_bytes`.
+    """
+
+    _HEAD = struct.Struct("<IB")
+
+    def __init__(self, path: str, compact_min_bytes: int = LOG_COMPACT_MIN_BYTES):
+        self.path = path
+        self.compact_min_bytes = compact_min_bytes
+        self._lock = threading.Lock()
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._garbage = 0
+        self._live = 0
+        self._fh = open(path, "a+b")
+        self._scan()
+        self._live = self._live_bytes()
+        if self._should_compact():
+            self.compact()
+
+    def _entries(self) -> Iterator[Tuple[str, int, int, int]]:
+        """(sid, record offset, record length, entry length) for every entry in the file."""
+        self._fh.seek(0)
+        pos = 0
+        while True:
+            head = self._fh.read(self._HEAD.size)
+            if len(head) < self._HEAD.size:
+                return
+            length, n = self._HEAD.unpack(head)
+            sid = self._fh.read(n).decode("utf-8")
+            start = pos + self._HEAD.size + n
+            if start + length > os.fstat(self._fh.fileno()).st_size:
+                return  # torn write at the tail
+            self._fh.seek(start + length)
+            yield sid, start, length, self._HEAD.size + n + length
+            pos = start + length
+
+    def _scan(self) -> None:
+        for sid, start, length, size in self._entries():
+            if sid in self._index:
+                self._garbage += self._index[sid][1]
+            if length:
+                self._index[sid] = (start, length)
+            else:
+                self._index.pop(sid, None)
+                self._garbage += size
+
+    def _live_bytes(self) -> int:
+        return sum(length for _, length in self._index.values())
+
+    def _should_compact(self) -> bool:
+        return self._garbage > self._live and self._garbage >= self.compact_min_bytes
+
+    def _append(self, sid: str, blob: bytes) -> Tuple[int, int]:
+        key = sid.encode("utf-8")
+        self._fh.seek(0, os.SEEK_END)
+        start = self._fh.tell() + self._HEAD.size + len(key)
+        self._fh.write(self._HEAD.pack(len(blob), len(key)) + key + blob)
+        self._fh.flush()
+        return start, len(blob)
+
+    def put(self, sid: str, blob: bytes) -> None:
+        with self._lock:
+            if sid in self._index:
+                self._garbage += self._index[sid][1]
+                self._live -= self._index[sid][1]
+            self._index[sid] = self._append(sid, blob)
+            self._live += len(blob)
+            if self._should_compact():
+                self._compact()
+
+    def get(self, sid: str) -> Optional[bytes]:
+        with self._lock:
+            span = self._index.get(sid)
+            if span is None:
+                return None
+            return os.pread(self._fh.fileno(), span[1], span[0])
+
+    def delete(self, sid: str) -> None:
+        with self._lock:
+            span = self._index.pop(sid, None)
+            if span is not None:
+                self._append(sid, b"")
+                key_len = len(sid.encode("utf-8"))
+                self._garbage += span[1] + self._HEAD.size + key_len
+                self._live -= span[1]
+                if self._should_compact():
+                    self._compact()
+
+    def compact(self) -> None:
+        """Rewrite the log with only the latest record of each live session."""
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        tmp = self.path + ".compact"
+        index: Dict[str, Tuple[int, int]] = {}
+        with open(tmp, "wb") as out:
+            for sid, (start, length) in self._index.items():
+                key = sid.encode("utf-8")
+                blob = os.pread(self._fh.fileno(), length, start)
+                index[sid] = (out.tell() + self._HEAD.size + len(key), length)
+                out.write(self._HEAD.pack(length, len(key)) + key + blob)
+            out.flush()
+            os.fsync(out.fileno())
+        self._fh.close()
+        os.replace(tmp, self.path)
+        self._fh = open(self.path, "a+b")
+        print(f"DEBUG: compacted session log {self.path}: {self._garbage} superseded bytes dropped")
+        self._index, self._garbage = index, 0
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+# ------------------------------- store -----------------------------------
+
+class SessionStore:
+    """Save and load sessions on a backend, writing behind on a background thread."""
+
+    def __init__(self, backend, write_behind: bool = WRITE_BEHIND):
+        self.backend = backend
+        self.write_behind = write_behind
+        self._pending: Dict[str, bytes] = {}
+        self._pending_lock = threading.Lock()
+        self._wake: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        if write_behind:
+            self._writer = threading.Thread(target=self._write_loop, name="session-store", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self) -> None:
+        while True:
+            sid = self._wake.get()
+            if sid is None:
+                return
+            with self._pending_lock:
+                blob = self._pending.pop(sid, None)
+            if blob is not None:
+                try:
+                    self.backend.put(sid, blob)
+                except Exception as e:
+                    print(f"DEBUG: session store write failed for {sid}: {e}")
+            self._wake.task_done()
+
+    def save(self, sid: str, sections: Dict[str, Any]) -> int:
+        """Encode and store a session's sections; returns the record size in bytes."""
+        blob = encode_record(sections)
+        self.put(sid, blob)
+        return len(blob)
+
+    def put(self, sid: str, blob: bytes) -> None:
+        """Store an encoded record (e.g. one encoded in a worker process)."""
+        if not self.write_behind:
+            self.backend.put(sid, blob)
+            return
+        with self._pending_lock:
+            queued = sid in self._pending
+            self._pending[sid] = blob
+        if not queued:
+            self._wake.put(sid)
+
+    def get(self, sid: str) -> Optional[bytes]:
+        """The encoded record, including a save that has not been written yet."""
+        with self._pending_lock:
+            blob = self._pending.get(sid)
+        return blob if blob is not None else self.backend.get(sid)
+
+    def load(self, sid: str) -> Optional[SessionRecord]:
+        blob = self.get(sid)
+        return SessionRecord(blob) if blob else None
+
+    def delete(self, sid: str) -> None:
+        with self._pending_lock:
+            self._pending.pop(sid, None)
+        self.backend.delete(sid)
+
+    def flush(self) -> None:
+        """Block until every queued write has reached the backend."""
+        if self._writer is not None:
+            self._wake.join()
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._wake.put(None)
+            self._writer.join()
+        self.backend.close()
+
+
+def make_session_store(kind: Optional[str] = None, path: Optional[str] = None) -> Optional[SessionStore]:
+    """Return a SessionStore for `kind` ("memory", "sqlite", "log"), or None when disabled."""
+    kind = (kind if kind is not None else SESSION_STORE).lower()
+    path = path or SESSION_STORE_PATH
+    if kind in ("", "none", "off"):
+        return None
+    if kind == "memory":
+        return SessionStore(MemoryBackend())
+    if kind == "sqlite":
+        return SessionStore(SqliteBackend(path or "sessions.sqlite"))
+    if kind == "log":
+        return SessionStore(LogBackend(path or "sessions.log"))
+    raise ValueError(f"Unknown session store: {kind!r}")
@@ -1,6 +1,11 @@
-from typing import TypedDict, List, Dict, Any, Optional
+from typing import TypedDict, List, Dict, Any, Optional, Annotated
 
-from langchain_core.runnables import history
+# Messages kept in graph state; older turns only live in the UI transcript.
+HISTORY_WINDOW = 12
+
+def append_history(left: Optional[List[Dict[str, str]]], right: Optional[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+    """Reducer for `history`: append new messages and keep the last HISTORY_WINDOW."""
+    return ((left or []) + (right or []))[-HISTORY_WINDOW:]
 
 class GraphState(TypedDict, total=False):
     """Shared state passed between graph nodes.
@@ -8,7 +13,7 @@ class GraphState(TypedDict, total=False):
     total=False allows nodes to perform partial updates without specifying all fields.
 
     Keys:
-    - history: list of chat messages {role, content}
+    - history: list of chat messages {role, content}; updates are appended (see append_history)
     - user_msg: latest user message (normalized)
     - intent: routed intent label (e.g., weather, attractions)
     - user_profile: durable slots such as destination and dates
@@ -16,12 +21,15 @@ class GraphState(TypedDict, total=False):
     - draft: intermediate draft used for critique
     - final: finalized assistant reply
     - critique_needed: gate for critique step
+    - draft_issues: fact-check issues found in the draft by compose (read by critique)
     - critique_notes: critique output, if any
     - offtopic_counter: smalltalk redirection level
+    - offtopic_count: consecutive smalltalk turns (set by route_intent/smalltalk)
     - summary: compact, durable conversation summary
+    - preplan: node the rule-based preplanner continues the turn at ("route" = LLM router)
     """
 
-    history: List[Dict[str, str]]
+    history: Annotated[List[Dict[str, str]], append_history]
     user_msg: str
     intent: str
     user_profile: Dict[str, Any]
@@ -29,6 +37,9 @@ class GraphState(TypedDict, total=False):
     draft: str
     final: str
     critique_needed: bool
+    draft_issues: List[str]
     critique_notes: Optional[str]
     offtopic_counter: int
-    summary: str
\ No newline at end of file
+    offtopic_count: int
+    summary: str
+    preplan: str
\ No newline at end of file
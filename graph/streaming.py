@@ -0,0 +1,181 @@
+from __future__ import annotations
+import json
+import re
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from .helpers.facts_store import forecast_rows
+from .session import ConversationSession
+from telemetry import metrics
+
+# Streaming a turn as a sequence of events, for the Streamlit app, server-sent events and other push clients:
+#   {"event": "stage", "data": {"node": "fetch", "label": "Fetching weather for Lyon…"}}  a node started
+#   {"event": "node",  "data": {"node": "fetch", "ms": 412.3}}    a node finished, with its wall time
+#   {"event": "facts", "data": {"weather": {...}, "country": {...}}} what fetch_data found (see facts_preview)
+#   {"event": "token", "data": {"node": "compose", "text": "..."}} answer text as the LLM writes it
+#   {"event": "done",  "data": {"reply": "...", "intent": "...", "timings": {...}, "total_ms": ...}}
+# Token events cover the nodes that write the user-facing answer. If critique/revise rewrites
+# the draft, the revised tokens follow; clients should show the "done" reply once it arrives.
+# "done" repeats the per-node times (ms, summed if a node ran twice) for logging.
+
+# What the user is told while a node runs; fetch is labelled from its plan (see stage_label)
+STAGE_LABELS = {
+    "preplan": "Reading your message…",
+    "route": "Understanding your request…",
+    "handler": "Understanding your request…",
+    "smalltalk": "Writing a reply…",
+    "resolve_place": "Resolving place…",
+    "plan": "Planning lookups…",
+    "plan_time": "Working out dates…",
+    "clarify": "Preparing a question…",
+    "fetch": "Fetching data…",
+    "compose": "Writing answer…",
+    "critique": "Checking the answer against the facts…",
+    "revise": "Revising answer…",
+    "update_summary": "Wrapping up…",
+}
+
+ANSWER_NODES = {"compose", "revise", "smalltalk"}
+JSON_ANSWER_NODES = {"compose"}  # these answer in JSON mode: stream only the "answer" string
+
+_ANSWER_KEY = re.compile(r'"(?:answer|summary|text|content)"\s*:\s*"')
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class AnswerExtractor:
+    """Incrementally decode the "answer" string out of a JSON object being streamed in chunks."""
+
+    def __init__(self):
+        self._buf = ""
+        self._pos: Optional[int] = None  # index just past the opening quote, once found
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        self._buf += chunk
+        if self.done:
+            return ""
+        if self._pos is None:
+            m = _ANSWER_KEY.search(self._buf)
+            if not m:
+                return ""
+            self._pos = m.end()
+        out = []
+        i, buf = self._pos, self._buf
+        while i < len(buf):
+            c = buf[i]
+            if c == '"':
+                self.done = True
+                i += 1
+                break
+            if c == "\\":
+                if i + 1 >= len(buf):
+                    break  # escape split across chunks
+                e = buf[i + 1]
+                if e == "u":
+                    if i + 6 > len(buf):
+                        break
+                    out.append(chr(int(buf[i + 2:i + 6], 16)))
+                    i += 6
+                    continue
+                out.append(_ESCAPES.get(e, e))
+                i += 2
+                continue
+            out.append(c)
+            i += 1
+        self._pos = i
+        return "".join(out)
+
+
+def stage_label(node: str, state: Optional[Dict[str, Any]] = None) -> str:
+    """Status line for a node that is starting, given its input state."""
+    if node == "fetch":
+        plan = ((state or {}).get("data") or {}).get("plan") or {}
+        parts = []
+        if plan.get("weather"):
+            parts.append(f"weather for {plan['place']}" if plan.get("place") else "weather")
+        if plan.get("country"):
+            parts.append("country facts")
+        if plan.get("web"):
+            parts.append("web results")
+        if parts:
+            return "Fetching " + " and ".join(parts) + "…"
+    return STAGE_LABELS.get(node, f"{node}…")
+
+
+def facts_preview(data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """JSON-ready digest of what this turn's fetch found, to show before the answer is written."""
+    data = data or {}
+    facts = data.get("facts") or {}
+    plan = data.get("plan") or {}
+    out: Dict[str, Any] = {}
+    wx = (facts.get("weather_by_place") or {}).get(facts.get("weather_current")) if plan.get("weather") else None
+    dates = [d for d in (facts.get("target_dates") or [facts.get("today")]) if d]
+    if wx and dates:
+        out["weather"] = {
+            "place": wx["place"]["name"],
+            "days": [{"date": d, "tmax": tmax, "tmin": tmin, "precip": p}
+                     for d, tmax, tmin, p in forecast_rows(wx["forecast"], dates)],
+        }
+    cf = facts.get("country")
+    if plan.get("country") and cf:
+        out["country"] = {"name": cf.get("name"), "capital": cf.get("capital"), "currencies": list(cf.get("currencies") or [])}
+    if plan.get("web") and facts.get("web"):
+        out["web"] = [{"title": w.get("title"), "url": w.get("url")} for w in facts["web"]]
+    if facts.get("unavailable"):
+        out["unavailable"] = list(facts["unavailable"])
+    return out
+
+
+def _chunk_text(msg: Any) -> str:
+    content = getattr(msg, "content", "")
+    return content if isinstance(content, str) else ""
+
+
+def stream_turn(session: ConversationSession, user_msg: str) -> Iterator[Dict[str, Any]]:
+    """Run one session turn, yielding stage/node/facts/token events and a final "done" event."""
+    state = session.begin_turn(user_msg)
+    t0 = last = time.perf_counter()
+    extractors: Dict[str, AnswerExtractor] = {}
+    started: Dict[str, float] = {}
+    timings: Dict[str, float] = {}
+    out: Dict[str, Any] = {}
+    for mode, chunk in session.graph.stream(state, session.config, stream_mode=["tasks", "updates", "messages", "values"]):
+        if mode == "tasks":
+            # Task events come in pairs; the one with "input" is the node starting
+            if "input" in chunk:
+                node = chunk["name"]
+                started[node] = time.perf_counter()
+                yield {"event": "stage", "data": {"node": node, "label": stage_label(node, chunk["input"])}}
+        elif mode == "messages":
+            msg, meta = chunk
+            node = meta.get("langgraph_node")
+            if node not in ANSWER_NODES:
+                continue
+            text = _chunk_text(msg)
+            if node in JSON_ANSWER_NODES:
+                text = extractors.setdefault(f"{node}:{meta.get('langgraph_step')}", AnswerExtractor()).feed(text)
+            if text:
+                yield {"event": "token", "data": {"node": node, "text": text}}
+        elif mode == "updates":
+            now = time.perf_counter()
+            for node, update in chunk.items():
+                ms = round((now - started.pop(node, last)) * 1000, 1)
+                timings[node] = round(timings.get(node, 0.0) + ms, 1)
+                yield {"event": "node", "data": {"node": node, "ms": ms}}
+                if node == "fetch" and isinstance(update, dict) and update.get("data"):
+                    preview = facts_preview(update["data"])
+                    if preview:
+                        yield {"event": "facts", "data": preview}
+            last = now
+        else:
+            out = chunk
+    total = time.perf_counter() - t0
+    metrics.observe("turn", total)
+    reply = session.finish_turn(out)
+    yield {"event": "done", "data": {"reply": reply, "intent": session.intent,
+                                     "timings": timings, "total_ms": round(total * 1000, 1)}}
+
+
+def sse(event: Dict[str, Any]) -> str:
+    """Format one event as a server-sent event frame."""
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'], ensure_ascii=False)}\n\n"
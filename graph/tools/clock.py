@@ -1,16 +1,26 @@
 from datetime import datetime
-from zoneinfo import ZoneInfo
+from typing import Optional
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-DEFAULT_TIMEZONE = "Asia/Jerusalem"
+from .timezones import timezone_at, timezone_for_country
 
-def now_iso(tz: str = DEFAULT_TIMEZONE) -> str:
-    return datetime.now(ZoneInfo(tz)).isoformat(timespec="seconds")
+DEFAULT_TIMEZONE = "Asia/Jerusalem"
 
-def today(tz: str | None = None) -> str:
-    tz = tz or DEFAULT_TIMEZONE
+def _zone(tz: Optional[str]) -> ZoneInfo:
     try:
-        return datetime.now(ZoneInfo(tz)).date().isoformat()
-    except ZoneInfoNotFoundError:
+        return ZoneInfo(tz or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
         # fallback to default if an invalid tz was passed
-        return datetime.now(ZoneInfo(DEFAULT_TIMEZONE)).date().isoformat()
\ No newline at end of file
+        return ZoneInfo(DEFAULT_TIMEZONE)
+
+def now_iso(tz: str | None = None) -> str:
+    return datetime.now(_zone(tz)).isoformat(timespec="seconds")
+
+def today(tz: str | None = None) -> str:
+    return datetime.now(_zone(tz)).date().isoformat()
+
+def local_timezone(lat: float | None = None, lon: float | None = None, country_code: str | None = None) -> str:
+    """Timezone for a place from coordinates or country code, resolved offline."""
+    if lat is not None and lon is not None:
+        return timezone_at(lat, lon, country_code)
+    return timezone_for_country(country_code) or DEFAULT_TIMEZONE
@@ -1,16 +1,20 @@
-import requests
+from .http import request_json, status_code
 BASE = "https://restcountries.com/v3.1/name/{name}"
 
 def country_facts(name: str):
     url = BASE.format(name=name)
-    params = {"fullText": "false", "fields": "name,currencies,languages,timezones,capital,idd"}
-    r = requests.get(url, params=params, timeout=20)
-    r.raise_for_status()
-    arr = r.json()
+    params = {"fullText": "false", "fields": "name,cca2,currencies,languages,timezones,capital,idd"}
+    try:
+        arr = request_json("restcountries", "GET", url, params=params, timeout=20)
+    except Exception as e:
+        if status_code(e) == 404:   # no such country (e.g. a city name)
+            return None
+        raise
     if not arr: return None
     c = arr[0]
     return {
         "name": c["name"]["common"],
+        "code": c.get("cca2"),
         "capital": (c.get("capital") or ["?"])[0],
         "currencies": list((c.get("currencies") or {}).keys()),
         "languages": list((c.get("languages") or {}).values()),
@@ -0,0 +1,234 @@
+from __future__ import annotations
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from telemetry.metrics import observe, incr
+
+if TYPE_CHECKING:   # requests is imported with the session, on the first tool call
+    import requests
+
+# Per-endpoint circuit breakers for the external tools (Open-Meteo, restcountries, Tavily, ...).
+# A breaker opens after consecutive failures or slow calls and then fails fast until a
+# cool-down has passed; the next call is a single half-open probe that closes it again on success.
+
+FAILURE_THRESHOLD = int(os.getenv("TOOLS_BREAKER_FAILURES", "3"))
+SLOW_CALL_S = float(os.getenv("TOOLS_BREAKER_SLOW_S", "8"))
+RESET_TIMEOUT_S = float(os.getenv("TOOLS_BREAKER_RESET_S", "30"))
+
+# Hedging: once an endpoint has enough latency samples, an idempotent GET that is still
+# running after the given percentile of recent latencies gets a second, identical request.
+HEDGE_ENABLED = os.getenv("TOOLS_HEDGE", "").lower() in ("1", "true", "yes")
+HEDGE_PERCENTILE = float(os.getenv("TOOLS_HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = 20
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose breaker is open."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"{endpoint} temporarily unavailable (retry in {retry_in:.0f}s)")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        slow_call_s: float = SLOW_CALL_S,
+        reset_timeout_s: float = RESET_TIMEOUT_S,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_s = slow_call_s
+        self.reset_timeout_s = reset_timeout_s
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.latencies: deque = deque(maxlen=100)
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through (closed, or the half-open probe)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            elapsed = time.monotonic() - self.opened_at
+            if self.state == OPEN and elapsed >= self.reset_timeout_s:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            raise CircuitOpenError(self.name, max(0.0, self.reset_timeout_s - elapsed))
+
+    def record(self, ok: bool, latency: float) -> None:
+        """Record one call outcome; slow successes count as failures."""
+        with self._lock:
+            self._probing = False
+            if ok:
+                self.latencies.append(latency)
+            if ok and latency < self.slow_call_s:
+                self.state = CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def latency_percentile(self, p: float) -> Optional[float]:
+        samples = sorted(self.latencies)
+        if not samples:
+            return None
+        idx = min(len(samples) - 1, int(round(p / 100.0 * (len(samples) - 1))))
+        return samples[idx]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            retry_in = 0.0
+            if self.state == OPEN:
+                retry_in = max(0.0, self.reset_timeout_s - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": round(retry_in, 1),
+            "p50": self.latency_percentile(50),
+            "p95": self.latency_percentile(95),
+        }
+
+
+# One pooled session per process so every tool call reuses open connections.
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+_HEDGE_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    with _BREAKERS_LOCK:
+        if endpoint not in _BREAKERS:
+            _BREAKERS[endpoint] = CircuitBreaker(endpoint)
+        return _BREAKERS[endpoint]
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every breaker, keyed by endpoint name."""
+    with _BREAKERS_LOCK:
+        breakers = list(_BREAKERS.values())
+    return {b.name: b.snapshot() for b in breakers}
+
+
+def unavailable_endpoints() -> List[str]:
+    """Endpoints currently failing fast (breaker open)."""
+    return [name for name, s in breaker_states().items() if s["state"] == OPEN]
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    """HTTP status of a raise_for_status() error, None for network errors."""
+    return getattr(getattr(error, "response", None), "status_code", None)
+
+
+def is_client_error(error: BaseException) -> bool:
+    status = status_code(error)
+    return status is not None and 400 <= status < 500 and status != 429
+
+
+def _session() -> requests.Session:
+    """The process-wide pooled session, created on first use."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                import requests
+                session = requests.Session()
+                session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=16))
+                _SESSION = session
+    return _SESSION
+
+
+def _send(method: str, url: str, **kwargs) -> requests.Response:
+    r = _session().request(method, url, **kwargs)
+    r.raise_for_status()
+    return r
+
+
+def _send_hedged(breaker: CircuitBreaker, url: str, **kwargs) -> requests.Response:
+    """GET with a second request fired if the first outlives the latency percentile."""
+    delay = breaker.latency_percentile(HEDGE_PERCENTILE)
+    first = _HEDGE_POOL.submit(_send, "GET", url, **kwargs)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+    second = _HEDGE_POOL.submit(_send, "GET", url, **kwargs)
+    pending = {first, second}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            if fut.exception() is None:
+                return fut.result()
+            error = fut.exception()
+    raise error
+
+
+def request_json(
+    endpoint: str,
+    method: str,
+    url: str,
+    *,
+    timeout: float = 20,
+    hedge: Optional[bool] = None,
+    **kwargs,
+) -> Any:
+    """Call `url` through the endpoint's breaker and return the decoded JSON body.
+
+    Raises CircuitOpenError without touching the network while the breaker is open;
+    request errors are recorded against the breaker (4xx other than 429 count as successes)
+    and re-raised.
+    """
+    breaker = get_breaker(endpoint)
+    breaker.before_call()
+    hedge = HEDGE_ENABLED if hedge is None else hedge
+    can_hedge = hedge and method.upper() == "GET" and len(breaker.latencies) >= HEDGE_MIN_SAMPLES
+    t0 = time.monotonic()
+    try:
+        if can_hedge:
+            r = _send_hedged(breaker, url, timeout=timeout, **kwargs)
+        else:
+            r = _send(method, url, timeout=timeout, **kwargs)
+        body = r.json()
+    except Exception as e:
+        # A 4xx answer ("not found") means the endpoint is up; only 429 and 5xx/network errors trip it
+        client_error = is_client_error(e)
+        breaker.record(client_error, time.monotonic() - t0)
+        observe(f"tool.{endpoint}", time.monotonic() - t0)
+        incr(f"tool.{endpoint}.client_errors" if client_error else f"tool.{endpoint}.errors")
+        raise
+    breaker.record(True, time.monotonic() - t0)
+    observe(f"tool.{endpoint}", time.monotonic() - t0)
+    return body
+
+
+def preconnect(urls: List[str], timeout: float = 3.0) -> Dict[str, bool]:
+    """Open pooled connections to the given hosts ahead of the first real call.
+
+    Uses HEAD requests outside the breakers; failures are reported, not raised.
+    """
+    opened = {}
+    for url in urls:
+        try:
+            _session().head(url, timeout=timeout)
+            opened[url] = True
+        except Exception:
+            opened[url] = False
+    return opened
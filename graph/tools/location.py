@@ -1,6 +1,8 @@
-import requests
 from typing import Optional, Dict, Any
 
+from .http import request_json
+from .timezones import timezone_at
+
 BIGDATACLOUD_REVERSE_URL = "https://api.bigdatacloud.net/data/reverse-geocode-client"
 """Reverse geocoding endpoint to map coordinates to a human-readable location."""
 
@@ -9,7 +11,9 @@ def get_client_location_data(latitude: float, longitude: float) -> Optional[Dict
     try:
         # 1) Reverse geocoding if coordinates
         if latitude is not None and longitude is not None:
-            r = requests.get(
+            data = request_json(
+                "bigdatacloud",
+                "GET",
                 BIGDATACLOUD_REVERSE_URL,
                 params={
                     "latitude": latitude,
@@ -18,8 +22,6 @@ def get_client_location_data(latitude: float, longitude: float) -> Optional[Dict
                 },
                 timeout=10,
             )
-            r.raise_for_status()
-            data = r.json()
             city = data.get("city") or data.get("locality") or ""
             region = data.get("principalSubdivision") or ""
             country = data.get("countryName") or ""
@@ -36,6 +38,7 @@ def get_client_location_data(latitude: float, longitude: float) -> Optional[Dict
                 "country_code": country_code,
                 "latitude": lat,
                 "longitude": lon,
+                "timezone": timezone_at(lat, lon, country_code),
                 "detected_via": "browser_geolocation",
             }
             
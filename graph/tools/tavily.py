@@ -1,4 +1,5 @@
-import os, requests
+import os
+from .http import request_json
 BASE = "https://api.tavily.com/search"
 API_KEY = os.environ.get("TAVILY_API_KEY")
 
@@ -7,6 +8,4 @@ def web_search(query: str, max_results: int = 5):
         return {"error": "Missing TAVILY_API_KEY"}
     headers = {"Authorization": f"Bearer {API_KEY}"}
     body = {"query": query, "max_results": max_results}
-    r = requests.post(BASE, headers=headers, json=body, timeout=20)
-    r.raise_for_status()
-    return r.json()
+    return request_json("tavily", "POST", BASE, headers=headers, json=body, timeout=20)
@@ -0,0 +1,490 @@
+import math
+from typing import Dict, List, Optional, Tuple
+
+# Offline timezone lookup from coordinates.
+# A compact table of anchor points (IANA zone, lat, lon, ISO country) is bucketed into a
+# coarse lat/lon grid on first use; a lookup scans the nearest cells for the closest anchor,
+# preferring anchors in the given country. Points far from any anchor (open ocean) fall back
+# to the nautical Etc/GMT±N zone for their longitude. The first anchor listed for a country
+# is its capital.
+
+CELL_DEG = 10
+MAX_ANCHOR_KM = 1500
+
+_ANCHORS = """
+Europe/London 51.51 -0.13 GB
+Europe/London 55.95 -3.19 GB
+Europe/London 54.60 -5.93 GB
+Europe/Dublin 53.35 -6.26 IE
+Europe/Lisbon 38.72 -9.14 PT
+Europe/Lisbon 41.15 -8.61 PT
+Atlantic/Madeira 32.65 -16.91 PT
+Atlantic/Azores 37.74 -25.67 PT
+Europe/Madrid 40.42 -3.70 ES
+Atlantic/Canary 28.12 -15.43 ES
+Atlantic/Canary 28.46 -16.25 ES
+Europe/Madrid 41.39 2.17 ES
+Europe/Madrid 37.39 -5.98 ES
+Europe/Madrid 39.47 -0.38 ES
+Europe/Madrid 39.57 2.65 ES
+Europe/Paris 48.86 2.35 FR
+Europe/Paris 45.76 4.84 FR
+Europe/Paris 43.30 5.37 FR
+Europe/Paris 43.70 7.27 FR
+Europe/Paris 44.84 -0.58 FR
+Europe/Paris 48.11 -1.68 FR
+Europe/Paris 48.57 7.75 FR
+Europe/Paris 41.93 8.74 FR
+Europe/Brussels 50.85 4.35 BE
+Europe/Amsterdam 52.37 4.90 NL
+Europe/Luxembourg 49.61 6.13 LU
+Europe/Berlin 52.52 13.40 DE
+Europe/Berlin 48.14 11.58 DE
+Europe/Berlin 53.55 9.99 DE
+Europe/Berlin 50.94 6.96 DE
+Europe/Berlin 50.11 8.68 DE
+Europe/Zurich 47.38 8.54 CH
+Europe/Zurich 46.20 6.14 CH
+Europe/Vienna 48.21 16.37 AT
+Europe/Vienna 47.27 11.39 AT
+Europe/Rome 41.90 12.50 IT
+Europe/Rome 45.46 9.19 IT
+Europe/Rome 40.85 14.27 IT
+Europe/Rome 45.44 12.32 IT
+Europe/Rome 43.77 11.26 IT
+Europe/Rome 38.12 13.36 IT
+Europe/Rome 39.22 9.12 IT
+Europe/Malta 35.90 14.51 MT
+Europe/Monaco 43.73 7.42 MC
+Europe/Copenhagen 55.68 12.57 DK
+Europe/Oslo 59.91 10.75 NO
+Europe/Oslo 60.39 5.32 NO
+Europe/Oslo 69.65 18.96 NO
+Europe/Stockholm 59.33 18.07 SE
+Europe/Stockholm 57.71 11.97 SE
+Europe/Stockholm 65.58 22.15 SE
+Europe/Helsinki 60.17 24.94 FI
+Europe/Helsinki 65.01 25.47 FI
+Atlantic/Reykjavik 64.15 -21.94 IS
+Europe/Tallinn 59.44 24.75 EE
+Europe/Riga 56.95 24.11 LV
+Europe/Vilnius 54.69 25.28 LT
+Europe/Warsaw 52.23 21.01 PL
+Europe/Warsaw 50.06 19.94 PL
+Europe/Warsaw 54.35 18.65 PL
+Europe/Prague 50.08 14.44 CZ
+Europe/Bratislava 48.15 17.11 SK
+Europe/Budapest 47.50 19.04 HU
+Europe/Ljubljana 46.06 14.51 SI
+Europe/Zagreb 45.81 15.98 HR
+Europe/Zagreb 43.51 16.44 HR
+Europe/Zagreb 42.65 18.09 HR
+Europe/Sarajevo 43.86 18.41 BA
+Europe/Belgrade 44.79 20.45 RS
+Europe/Podgorica 42.44 19.26 ME
+Europe/Skopje 41.99 21.43 MK
+Europe/Tirane 41.33 19.82 AL
+Europe/Athens 37.98 23.73 GR
+Europe/Athens 40.64 22.94 GR
+Europe/Athens 35.34 25.14 GR
+Europe/Sofia 42.70 23.32 BG
+Europe/Sofia 43.21 27.91 BG
+Europe/Bucharest 44.43 26.10 RO
+Europe/Bucharest 46.77 23.60 RO
+Europe/Chisinau 47.01 28.86 MD
+Europe/Kyiv 50.45 30.52 UA
+Europe/Kyiv 49.84 24.03 UA
+Europe/Kyiv 46.48 30.72 UA
+Europe/Minsk 53.90 27.56 BY
+Europe/Istanbul 41.01 28.98 TR
+Europe/Istanbul 39.93 32.86 TR
+Europe/Istanbul 36.90 30.70 TR
+Europe/Istanbul 37.87 40.23 TR
+Asia/Nicosia 35.17 33.36 CY
+Europe/Moscow 55.76 37.62 RU
+Europe/Kaliningrad 54.71 20.51 RU
+Europe/Moscow 59.94 30.31 RU
+Europe/Samara 53.20 50.15 RU
+Asia/Yekaterinburg 56.84 60.61 RU
+Asia/Omsk 54.99 73.37 RU
+Asia/Novosibirsk 55.03 82.92 RU
+Asia/Krasnoyarsk 56.01 92.87 RU
+Asia/Irkutsk 52.29 104.28 RU
+Asia/Yakutsk 62.03 129.73 RU
+Asia/Vladivostok 43.12 131.89 RU
+Asia/Magadan 59.56 150.80 RU
+Asia/Kamchatka 53.04 158.65 RU
+Asia/Tbilisi 41.72 44.79 GE
+Asia/Yerevan 40.18 44.51 AM
+Asia/Baku 40.41 49.87 AZ
+Asia/Jerusalem 31.77 35.21 IL
+Asia/Jerusalem 32.09 34.78 IL
+Asia/Jerusalem 32.79 34.99 IL
+Asia/Jerusalem 29.56 34.95 IL
+Asia/Gaza 31.50 34.47 PS
+Asia/Hebron 31.90 35.20 PS
+Asia/Amman 31.95 35.93 JO
+Asia/Amman 29.53 35.01 JO
+Asia/Beirut 33.89 35.50 LB
+Asia/Damascus 33.51 36.29 SY
+Asia/Baghdad 33.31 44.36 IQ
+Asia/Riyadh 24.71 46.68 SA
+Asia/Riyadh 21.49 39.19 SA
+Asia/Kuwait 29.38 47.99 KW
+Asia/Bahrain 26.23 50.59 BH
+Asia/Qatar 25.29 51.53 QA
+Asia/Dubai 25.20 55.27 AE
+Asia/Dubai 24.45 54.38 AE
+Asia/Muscat 23.59 58.41 OM
+Asia/Aden 12.79 45.02 YE
+Asia/Tehran 35.69 51.39 IR
+Asia/Tehran 29.59 52.58 IR
+Asia/Kabul 34.56 69.21 AF
+Asia/Karachi 24.86 67.00 PK
+Asia/Karachi 31.55 74.34 PK
+Asia/Tashkent 41.30 69.24 UZ
+Asia/Samarkand 39.65 66.96 UZ
+Asia/Almaty 43.24 76.89 KZ
+Asia/Almaty 51.17 71.45 KZ
+Asia/Bishkek 42.87 74.59 KG
+Asia/Dushanbe 38.56 68.79 TJ
+Asia/Ashgabat 37.96 58.33 TM
+Asia/Kolkata 28.61 77.21 IN
+Asia/Kolkata 19.08 72.88 IN
+Asia/Kolkata 12.97 77.59 IN
+Asia/Kolkata 13.08 80.27 IN
+Asia/Kolkata 22.57 88.36 IN
+Asia/Kolkata 15.50 73.83 IN
+Asia/Colombo 6.93 79.85 LK
+Indian/Maldives 4.18 73.51 MV
+Asia/Kathmandu 27.72 85.32 NP
+Asia/Thimphu 27.47 89.64 BT
+Asia/Dhaka 23.81 90.41 BD
+Asia/Yangon 16.87 96.20 MM
+Asia/Bangkok 13.76 100.50 TH
+Asia/Bangkok 18.79 98.98 TH
+Asia/Bangkok 7.88 98.39 TH
+Asia/Vientiane 17.98 102.63 LA
+Asia/Phnom_Penh 11.56 104.92 KH
+Asia/Ho_Chi_Minh 10.82 106.63 VN
+Asia/Bangkok 21.03 105.85 VN
+Asia/Kuala_Lumpur 3.14 101.69 MY
+Asia/Kuching 1.55 110.34 MY
+Asia/Singapore 1.35 103.82 SG
+Asia/Jakarta -6.21 106.85 ID
+Asia/Jakarta -7.80 110.36 ID
+Asia/Makassar -8.65 115.22 ID
+Asia/Makassar -5.15 119.43 ID
+Asia/Jayapura -2.53 140.72 ID
+Asia/Manila 14.60 120.98 PH
+Asia/Manila 10.32 123.89 PH
+Asia/Shanghai 31.23 121.47 CN
+Asia/Shanghai 39.90 116.41 CN
+Asia/Shanghai 23.13 113.26 CN
+Asia/Shanghai 30.57 104.07 CN
+Asia/Shanghai 34.34 108.94 CN
+Asia/Urumqi 43.83 87.62 CN
+Asia/Shanghai 29.65 91.17 CN
+Asia/Hong_Kong 22.32 114.17 HK
+Asia/Macau 22.20 113.54 MO
+Asia/Taipei 25.03 121.57 TW
+Asia/Ulaanbaatar 47.89 106.91 MN
+Asia/Hovd 48.01 91.64 MN
+Asia/Seoul 37.57 126.98 KR
+Asia/Seoul 35.18 129.08 KR
+Asia/Pyongyang 39.04 125.76 KP
+Asia/Tokyo 35.68 139.69 JP
+Asia/Tokyo 34.69 135.50 JP
+Asia/Tokyo 43.06 141.35 JP
+Asia/Tokyo 26.21 127.68 JP
+Asia/Tokyo 33.59 130.40 JP
+Asia/Dili -8.56 125.57 TL
+Australia/Sydney -35.28 149.13 AU
+Australia/Perth -31.95 115.86 AU
+Australia/Darwin -12.46 130.84 AU
+Australia/Adelaide -34.93 138.60 AU
+Australia/Brisbane -27.47 153.03 AU
+Australia/Brisbane -16.92 145.77 AU
+Australia/Sydney -33.87 151.21 AU
+Australia/Melbourne -37.81 144.96 AU
+Australia/Hobart -42.88 147.33 AU
+Australia/Broken_Hill -31.95 141.45 AU
+Pacific/Auckland -36.85 174.76 NZ
+Pacific/Auckland -41.29 174.78 NZ
+Pacific/Auckland -43.53 172.64 NZ
+Pacific/Port_Moresby -9.44 147.18 PG
+Pacific/Guadalcanal -9.43 159.95 SB
+Pacific/Noumea -22.28 166.46 NC
+Pacific/Fiji -18.14 178.44 FJ
+Pacific/Tongatapu -21.14 -175.20 TO
+Pacific/Apia -13.83 -171.76 WS
+Pacific/Tahiti -17.53 -149.57 PF
+Pacific/Guam 13.44 144.79 GU
+America/New_York 38.91 -77.04 US
+Pacific/Honolulu 21.31 -157.86 US
+Pacific/Honolulu 19.71 -155.08 US
+America/Anchorage 61.22 -149.90 US
+America/Anchorage 64.84 -147.72 US
+America/Juneau 58.30 -134.42 US
+America/Los_Angeles 34.05 -118.24 US
+America/Los_Angeles 37.77 -122.42 US
+America/Los_Angeles 47.61 -122.33 US
+America/Los_Angeles 45.52 -122.68 US
+America/Los_Angeles 36.17 -115.14 US
+America/Los_Angeles 32.72 -117.16 US
+America/Phoenix 33.45 -112.07 US
+America/Boise 43.62 -116.20 US
+America/Denver 39.74 -104.99 US
+America/Denver 40.76 -111.89 US
+America/Denver 35.08 -106.65 US
+America/Denver 46.87 -113.99 US
+America/Chicago 41.88 -87.63 US
+America/Chicago 29.76 -95.37 US
+America/Chicago 32.78 -96.80 US
+America/Chicago 44.98 -93.27 US
+America/Chicago 29.95 -90.07 US
+America/Chicago 39.10 -94.58 US
+America/Chicago 36.16 -86.78 US
+America/Chicago 30.27 -97.74 US
+America/New_York 40.71 -74.01 US
+America/New_York 42.36 -71.06 US
+America/New_York 25.76 -80.19 US
+America/New_York 33.75 -84.39 US
+America/New_York 28.54 -81.38 US
+America/New_York 39.95 -75.17 US
+America/Detroit 42.33 -83.05 US
+America/Indiana/Indianapolis 39.77 -86.16 US
+America/Puerto_Rico 18.47 -66.11 PR
+America/Toronto 45.42 -75.70 CA
+America/Vancouver 49.28 -123.12 CA
+America/Edmonton 53.55 -113.49 CA
+America/Edmonton 51.05 -114.07 CA
+America/Regina 50.45 -104.62 CA
+America/Winnipeg 49.90 -97.14 CA
+America/Toronto 43.65 -79.38 CA
+America/Toronto 45.50 -73.57 CA
+America/Toronto 46.81 -71.21 CA
+America/Halifax 44.65 -63.57 CA
+America/St_Johns 47.56 -52.71 CA
+America/Whitehorse 60.72 -135.06 CA
+America/Yellowknife 62.45 -114.37 CA
+America/Iqaluit 63.75 -68.52 CA
+America/Nuuk 64.18 -51.72 GL
+America/Mexico_City 19.43 -99.13 MX
+America/Mexico_City 20.66 -103.35 MX
+America/Monterrey 25.69 -100.32 MX
+America/Cancun 21.16 -86.85 MX
+America/Mazatlan 23.25 -106.41 MX
+America/Tijuana 32.51 -117.04 MX
+America/Hermosillo 29.07 -110.96 MX
+America/Guatemala 14.63 -90.51 GT
+America/Belize 17.25 -88.77 BZ
+America/El_Salvador 13.69 -89.22 SV
+America/Tegucigalpa 14.07 -87.19 HN
+America/Managua 12.11 -86.24 NI
+America/Costa_Rica 9.93 -84.09 CR
+America/Panama 8.98 -79.52 PA
+America/Havana 23.11 -82.37 CU
+America/Jamaica 17.97 -76.79 JM
+America/Port-au-Prince 18.59 -72.31 HT
+America/Santo_Domingo 18.49 -69.93 DO
+America/Nassau 25.05 -77.34 BS
+America/Barbados 13.10 -59.61 BB
+America/Port_of_Spain 10.66 -61.51 TT
+America/Martinique 14.62 -61.06 MQ
+America/Curacao 12.11 -68.93 CW
+America/Bogota 4.71 -74.07 CO
+America/Bogota 6.24 -75.58 CO
+America/Bogota 10.39 -75.48 CO
+America/Caracas 10.48 -66.90 VE
+America/Guyana 6.80 -58.16 GY
+America/Paramaribo 5.85 -55.20 SR
+America/Cayenne 4.92 -52.31 GF
+America/Guayaquil -0.18 -78.47 EC
+America/Guayaquil -2.17 -79.92 EC
+Pacific/Galapagos -0.90 -89.61 EC
+America/Lima -12.05 -77.04 PE
+America/Lima -13.53 -71.97 PE
+America/La_Paz -16.50 -68.15 BO
+America/La_Paz -17.78 -63.18 BO
+America/Sao_Paulo -23.55 -46.63 BR
+America/Sao_Paulo -22.91 -43.17 BR
+America/Sao_Paulo -15.79 -47.88 BR
+America/Sao_Paulo -19.92 -43.94 BR
+America/Sao_Paulo -25.43 -49.27 BR
+America/Sao_Paulo -30.03 -51.23 BR
+America/Bahia -12.97 -38.50 BR
+America/Recife -8.05 -34.88 BR
+America/Fortaleza -3.73 -38.53 BR
+America/Belem -1.46 -48.50 BR
+America/Manaus -3.12 -60.02 BR
+America/Cuiaba -15.60 -56.10 BR
+America/Porto_Velho -8.76 -63.90 BR
+America/Rio_Branco -9.97 -67.81 BR
+America/Noronha -3.85 -32.42 BR
+America/Asuncion -25.26 -57.58 PY
+America/Montevideo -34.90 -56.16 UY
+America/Argentina/Buenos_Aires -34.60 -58.38 AR
+America/Argentina/Cordoba -31.42 -64.18 AR
+America/Argentina/Mendoza -32.89 -68.84 AR
+America/Argentina/Salta -24.78 -65.41 AR
+America/Argentina/Ushuaia -54.80 -68.30 AR
+America/Argentina/Rio_Gallegos -51.62 -69.22 AR
+America/Santiago -33.45 -70.67 CL
+America/Santiago -23.65 -70.40 CL
+America/Punta_Arenas -53.16 -70.91 CL
+Pacific/Easter -27.11 -109.35 CL
+Atlantic/Stanley -51.70 -57.85 FK
+Africa/Casablanca 33.57 -7.59 MA
+Africa/Casablanca 31.63 -8.01 MA
+Africa/Casablanca 35.76 -5.83 MA
+Africa/El_Aaiun 27.15 -13.20 EH
+Africa/Algiers 36.75 3.06 DZ
+Africa/Algiers 27.88 -0.29 DZ
+Africa/Tunis 36.81 10.18 TN
+Africa/Tripoli 32.89 13.19 LY
+Africa/Tripoli 32.12 20.07 LY
+Africa/Cairo 30.04 31.24 EG
+Africa/Cairo 31.20 29.92 EG
+Africa/Cairo 25.69 32.64 EG
+Africa/Cairo 27.26 33.81 EG
+Africa/Khartoum 15.50 32.56 SD
+Africa/Juba 4.85 31.58 SS
+Africa/Addis_Ababa 9.03 38.74 ET
+Africa/Asmara 15.32 38.93 ER
+Africa/Djibouti 11.59 43.15 DJ
+Africa/Mogadishu 2.05 45.32 SO
+Africa/Nairobi -1.29 36.82 KE
+Africa/Nairobi -4.04 39.67 KE
+Africa/Kampala 0.35 32.58 UG
+Africa/Kigali -1.94 30.06 RW
+Africa/Dar_es_Salaam -6.79 39.21 TZ
+Africa/Dar_es_Salaam -3.37 36.68 TZ
+Africa/Dar_es_Salaam -6.17 39.19 TZ
+Africa/Lusaka -15.39 28.32 ZM
+Africa/Harare -17.83 31.05 ZW
+Africa/Maputo -25.97 32.57 MZ
+Africa/Blantyre -15.79 35.01 MW
+Indian/Antananarivo -18.88 47.51 MG
+Indian/Mauritius -20.16 57.50 MU
+Indian/Reunion -20.88 55.45 RE
+Indian/Mahe -4.62 55.45 SC
+Africa/Johannesburg -26.20 28.05 ZA
+Africa/Johannesburg -33.92 18.42 ZA
+Africa/Johannesburg -29.86 31.02 ZA
+Africa/Windhoek -22.56 17.08 NA
+Africa/Gaborone -24.63 25.92 BW
+Africa/Maseru -29.31 27.48 LS
+Africa/Mbabane -26.31 31.14 SZ
+Africa/Luanda -8.84 13.23 AO
+Africa/Kinshasa -4.44 15.27 CD
+Africa/Lubumbashi -11.66 27.48 CD
+Africa/Brazzaville -4.26 15.24 CG
+Africa/Libreville 0.42 9.47 GA
+Africa/Douala 4.05 9.77 CM
+Africa/Lagos 6.52 3.38 NG
+Africa/Lagos 9.08 7.40 NG
+Africa/Lagos 12.00 8.52 NG
+Africa/Accra 5.60 -0.19 GH
+Africa/Abidjan 5.36 -4.01 CI
+Africa/Lome 6.13 1.22 TG
+Africa/Porto-Novo 6.50 2.60 BJ
+Africa/Ouagadougou 12.37 -1.52 BF
+Africa/Niamey 13.51 2.11 NE
+Africa/Ndjamena 12.13 15.06 TD
+Africa/Bamako 12.64 -8.00 ML
+Africa/Bamako 16.77 -3.01 ML
+Africa/Dakar 14.72 -17.47 SN
+Africa/Banjul 13.45 -16.58 GM
+Africa/Conakry 9.64 -13.58 GN
+Africa/Freetown 8.47 -13.23 SL
+Africa/Monrovia 6.30 -10.80 LR
+Africa/Nouakchott 18.09 -15.98 MR
+Atlantic/Cape_Verde 14.93 -23.51 CV
+"""
+
+_parsed: Optional[List[Tuple[str, float, float, str]]] = None
+_grid: Optional[Dict[Tuple[int, int], List[int]]] = None
+
+
+def _index() -> Tuple[List[Tuple[str, float, float, str]], Dict[Tuple[int, int], List[int]]]:
+    """Parse the anchor table and bucket it by grid cell (built once, on first lookup)."""
+    global _parsed, _grid
+    if _grid is None:
+        parsed = []
+        grid: Dict[Tuple[int, int], List[int]] = {}
+        for line in _ANCHORS.strip().splitlines():
+            tz, lat, lon, cc = line.split()
+            parsed.append((tz, float(lat), float(lon), cc))
+            grid.setdefault(_cell(float(lat), float(lon)), []).append(len(parsed) - 1)
+        _parsed, _grid = parsed, grid
+    return _parsed, _grid
+
+
+def _cell(lat: float, lon: float) -> Tuple[int, int]:
+    return int((lat + 90) // CELL_DEG), int(((lon + 180) % 360) // CELL_DEG)
+
+
+def _distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(min(1.0, a)))
+
+
+def _nautical_zone(lon: float) -> str:
+    offset = int(round(lon / 15.0))
+    if offset == 0:
+        return "Etc/GMT"
+    # Etc/GMT zones use POSIX signs: UTC+3 is "Etc/GMT-3"
+    return f"Etc/GMT{'-' if offset > 0 else '+'}{abs(offset)}"
+
+
+def _ring(grid: Dict[Tuple[int, int], List[int]], row: int, col: int, ring: int) -> List[int]:
+    n_cols = 360 // CELL_DEG
+    out: List[int] = []
+    for dr in range(-ring, ring + 1):
+        for dc in range(-ring, ring + 1):
+            if max(abs(dr), abs(dc)) == ring:
+                out.extend(grid.get((row + dr, (col + dc) % n_cols), ()))
+    return out
+
+
+def timezone_at(lat: float, lon: float, country_code: Optional[str] = None) -> str:
+    """Return the IANA timezone for a coordinate without any network call."""
+    anchors, grid = _index()
+    row, col = _cell(lat, lon)
+    # Collect cells ring by ring until something is found, plus one more ring so a
+    # closer anchor just across a cell edge is not missed.
+    candidates: List[int] = []
+    first_hit = None
+    for ring in range(0, 180 // CELL_DEG + 1):
+        candidates.extend(_ring(grid, row, col, ring))
+        if candidates and first_hit is None:
+            first_hit = ring
+        if first_hit is not None and ring > first_hit:
+            break
+
+    cc = (country_code or "").upper()
+    if cc:
+        in_country = [i for i in candidates if anchors[i][3] == cc]
+        if not in_country:
+            in_country = [i for i, a in enumerate(anchors) if a[3] == cc]
+        if in_country:
+            candidates = in_country
+    if not candidates:
+        return _nautical_zone(lon)
+
+    dist, tz = min((_distance_km(lat, lon, anchors[i][1], anchors[i][2]), anchors[i][0]) for i in candidates)
+    if dist > MAX_ANCHOR_KM and not cc:
+        return _nautical_zone(lon)
+    return tz
+
+
+def timezone_for_country(country_code: Optional[str]) -> Optional[str]:
+    """Return the timezone of the first listed anchor (the capital) of a country."""
+    if not country_code:
+        return None
+    anchors, _ = _index()
+    cc = country_code.upper()
+    return next((tz for tz, _, _, acc in anchors if acc == cc), None)
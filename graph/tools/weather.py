@@ -1,11 +1,9 @@
-import requests
+from .http import request_json
 GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
 FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
 
 def geocode(place: str):
-    r = requests.get(GEOCODE_URL, params={"name": place, "count": 1}, timeout=20)
-    r.raise_for_status()
-    data = r.json()
+    data = request_json("open-meteo-geocode", "GET", GEOCODE_URL, params={"name": place, "count": 1}, timeout=20)
     if not data.get("results"): return None
     top = data["results"][0]
     return {
@@ -13,7 +11,8 @@ def geocode(place: str):
         "lon": top["longitude"], 
         "name": top["name"], 
         "country": top.get("country"),
-        "country_code": top.get("country_code")
+        "country_code": top.get("country_code"),
+        "timezone": top.get("timezone"),
     }
 
 def forecast_daily(lat: float, lon: float, units: str = "metric"):
@@ -24,6 +23,4 @@ def forecast_daily(lat: float, lon: float, units: str = "metric"):
         "timezone": "auto",
         "temperature_unit": "celsius" if units == "metric" else "fahrenheit",
     }
-    r = requests.get(FORECAST_URL, params=params, timeout=20)
-    r.raise_for_status()
-    return r.json()
+    return request_json("open-meteo-forecast", "GET", FORECAST_URL, params=params, timeout=20)
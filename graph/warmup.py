@@ -0,0 +1,52 @@
+from __future__ import annotations
+import os
+import time
+from typing import Any, Dict
+
+# Process start-up warm-up: compile the shared graph, import heavy modules, build the LLM
+# clients and open pooled connections, so the first message of a new session is not the
+# slowest one. app.py runs it once per process; `python -m graph.warmup` prints the timings.
+
+# Temperatures used by the nodes; one cached client is built per value.
+NODE_TEMPERATURES = (0.0, 0.1, 0.2, 0.5)
+
+
+def warm_up() -> Dict[str, Any]:
+    """Run every warm-up step and return per-step wall time in milliseconds."""
+    timings: Dict[str, Any] = {}
+
+    def step(name, fn):
+        t0 = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            print(f"DEBUG: warm-up step {name} failed: {e}")
+            result = None
+        timings[name] = round((time.perf_counter() - t0) * 1000, 1)
+        return result
+
+    from . import get_graph
+    step("compile_graph", get_graph)
+
+    def _llm_clients():
+        from llm.llm_client import _chat, load_env, ComposeOut, ToolPlan, TimePlan, PlacePlan
+        load_env()
+        for schema in (ComposeOut, ToolPlan, TimePlan, PlacePlan):
+            schema.model_json_schema()
+        if os.getenv("GROQ_API_KEY"):
+            for t in NODE_TEMPERATURES:
+                _chat(temperature=t)
+    step("llm_clients", _llm_clients)
+
+    def _connections():
+        from .tools.http import preconnect
+        from .tools.weather import GEOCODE_URL, FORECAST_URL
+        from .tools.countries import BASE as COUNTRIES_URL
+        urls = [GEOCODE_URL, FORECAST_URL, COUNTRIES_URL.split("{")[0]]
+        return preconnect(urls)
+    timings["connections_opened"] = step("connections", _connections)
+    return timings
+
+
+if __name__ == "__main__":
+    print(warm_up())
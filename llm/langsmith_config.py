@@ -1,16 +1,20 @@
 """
 LangSmith configuration utilities for the travel assistant.
 """
+from __future__ import annotations
 import os
-from typing import Optional
-from langsmith import Client
-from langchain_core.tracers import LangChainTracer
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:   # imported on first use
+    from langsmith import Client
+    from langchain_core.tracers import LangChainTracer
 
 
 def get_langsmith_client() -> Optional[Client]:
     """Initialize LangSmith client if API key is available."""
     api_key = os.getenv("LANGCHAIN_API_KEY")
     if api_key:
+        from langsmith import Client
         return Client(api_key=api_key)
     return None
 
@@ -19,6 +23,7 @@ def get_langsmith_tracer() -> Optional[LangChainTracer]:
     """Get LangSmith tracer for tracing."""
     client = get_langsmith_client()
     if client:
+        from langchain_core.tracers import LangChainTracer
         return LangChainTracer(
             client=client,
             project_name=os.getenv("LANGCHAIN_PROJECT", "travel-assistant")
@@ -1,30 +1,44 @@
+from __future__ import annotations
 import os
 import re
-from dotenv import load_dotenv
-from typing import List, Dict, Optional, Type, TypeVar, Literal
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Optional, Type, TypeVar, Literal
 from pydantic import BaseModel,Field, ConfigDict, AliasChoices
-from langchain_groq import ChatGroq
 from langchain_core.messages import SystemMessage,HumanMessage,AIMessage
 import json
 
-from langsmith import Client
-from langchain_core.tracers import LangChainTracer
+from telemetry.metrics import timer, incr
+
+# langchain_groq, langsmith and the tracer are imported on first use, and .env is read by
+# load_env() (entry points call it first; the first client build calls it too).
+if TYPE_CHECKING:
+    from langchain_groq import ChatGroq
+    from langsmith import Client
+    from langchain_core.tracers import LangChainTracer
 
-load_dotenv()
 T = TypeVar("T", bound=BaseModel)
 
+@lru_cache(maxsize=1)
+def load_env() -> None:
+    """Load .env into os.environ once per process."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
 # Initialize LangSmith client
 def _get_langsmith_client() -> Optional[Client]:
     """Initialize LangSmith client if API key is available."""
     api_key = os.getenv("LANGCHAIN_API_KEY")
     if api_key:
+        from langsmith import Client
         return Client(api_key=api_key)
     return None
 
+@lru_cache(maxsize=1)
 def _get_langsmith_tracer() -> Optional[LangChainTracer]:
-    """Get LangSmith tracer for tracing."""
+    """Get LangSmith tracer for tracing (one per process)."""
     client = _get_langsmith_client()
     if client:
+        from langchain_core.tracers import LangChainTracer
         return LangChainTracer(
             client=client,
             project_name=os.getenv("LANGCHAIN_PROJECT", "travel-assistant")
@@ -40,8 +54,15 @@ def _to_lc_message(m:Dict):
     return AIMessage(content=content)
 
 def _chat(model: str | None = None, temperature: float = 0.2) -> ChatGroq:
+    load_env()
     model_name = model or os.getenv("GROQ_MODEL") or "llama-3.1-8b-instant"
-    
+    return _chat_client(model_name, temperature)
+
+@lru_cache(maxsize=16)
+def _chat_client(model_name: str, temperature: float) -> ChatGroq:
+    """Process-wide chat client per (model, temperature); clients are thread-safe and pool connections."""
+    from langchain_groq import ChatGroq
+
     # Get LangSmith tracer
     tracer = _get_langsmith_tracer()
     
@@ -77,7 +98,8 @@ def _clean_json_response(content: str) -> str:
 
 def chat_completion_simple(messages: List[Dict], model: str | None = None, temperature: float = 0.2) -> str:
     llm = _chat(model=model, temperature=temperature)
-    res = llm.invoke([_to_lc_message(m) for m in messages])
+    with timer("llm.simple"):
+        res = llm.invoke([_to_lc_message(m) for m in messages])
     return res.content
 
 def chat_completion_structured(
@@ -87,6 +109,10 @@ def chat_completion_structured(
     temperature: float = 0.2,
 ) -> T:
     """Return a validated Pydantic object of type `schema`. Robust to Groq JSON-mode failures."""
+    with timer(f"llm.structured.{schema.__name__}"):
+        return _chat_completion_structured(messages, schema, model, temperature)
+
+def _chat_completion_structured(messages: List[Dict], schema: Type[T], model: Optional[str], temperature: float) -> T:
     llm = _chat(model=model, temperature=temperature)
 
     # Always include an explicit JSON hint to satisfy Groq's requirement
@@ -100,6 +126,7 @@ def chat_completion_structured(
         llm_struct = llm.with_structured_output(schema, method="json_mode")
         return llm_struct.invoke([_to_lc_message(m) for m in base_msgs])
     except Exception as e1:
+        incr("llm.structured.retries")
         # Attempt 2: plain call + local parse into the schema
         try:
             res = llm.invoke([_to_lc_message(m) for m in base_msgs])
@@ -107,6 +134,7 @@ def chat_completion_structured(
             obj = json.loads(cleaned_content)
             return schema.model_validate(obj)
         except Exception as e2:
+            incr("llm.structured.retries")
             # Attempt 3: one strict retry, zero temperature
             try:
                 llm_strict = _chat(model=model, temperature=0.0)
@@ -0,0 +1,110 @@
+"""Headless batch runner: drive multi-turn conversations through the graph and report throughput.
+
+    python -m scripts.batch_run conversations.jsonl --concurrency 8 [--out report.json]
+
+Each input line is one conversation:
+    {"id": "paris-weekend", "turns": ["weather in Paris this weekend", "and tomorrow?", "thanks"],
+     "user_profile": {...}}   # user_profile is optional
+
+Conversations run concurrently (one ConversationSession each, sharing the compiled graph);
+turns within a conversation run in order, carrying state exactly as app.py does.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from llm.llm_client import load_env
+load_env()   # before the graph modules read their settings
+
+from graph import build_graph
+from graph.checkpoint import make_checkpointer
+from graph.session import ConversationSession
+from telemetry import metrics
+
+
+def load_conversations(path: str) -> List[Dict[str, Any]]:
+    fh = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    convs = []
+    for i, line in enumerate(fh):
+        line = line.strip()
+        if line:
+            conv = json.loads(line)
+            conv.setdefault("id", f"conv-{i}")
+            convs.append(conv)
+    return convs
+
+
+def run_conversation(graph, conv: Dict[str, Any]) -> Dict[str, Any]:
+    session = ConversationSession(graph, user_profile=dict(conv.get("user_profile") or {}))
+    latencies, errors, replies = [], 0, []
+    for msg in conv["turns"]:
+        t0 = time.perf_counter()
+        try:
+            replies.append(session.turn(msg))
+        except Exception as e:
+            errors += 1
+            replies.append(f"ERROR: {e}")
+        latencies.append(time.perf_counter() - t0)
+    return {"id": conv["id"], "latencies": latencies, "errors": errors, "replies": replies}
+
+
+def _percentile(samples: List[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    s = sorted(samples)
+    return s[min(len(s) - 1, int(round(p / 100.0 * (len(s) - 1))))]
+
+
+def summarize(results: List[Dict[str, Any]], wall_s: float) -> Dict[str, Any]:
+    lat = [x for r in results for x in r["latencies"]]
+    snap = metrics.snapshot()
+    calls = {k: v["count"] for k, v in snap["latency_ms"].items()}
+    llm = {k: n for k, n in calls.items() if k.startswith("llm.")}
+    tools = {k: n for k, n in calls.items() if k.startswith("tool.")}
+    ms = lambda s: round(s * 1000, 1)
+    return {
+        "conversations": len(results),
+        "turns": len(lat),
+        "errors": sum(r["errors"] for r in results),
+        "wall_s": round(wall_s, 3),
+        "turns_per_s": round(len(lat) / wall_s, 3) if wall_s else 0.0,
+        "turn_ms": {"p50": ms(_percentile(lat, 50)), "p95": ms(_percentile(lat, 95)),
+                    "p99": ms(_percentile(lat, 99)), "max": ms(max(lat, default=0.0))},
+        "llm_calls": sum(llm.values()),
+        "llm_calls_by_kind": llm,
+        "tool_calls": sum(tools.values()),
+        "tool_calls_by_endpoint": tools,
+        "counters": snap["counters"],
+    }
+
+
+def main(argv: List[str]) -> Dict[str, Any]:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("conversations", help="JSONL file with one conversation per line ('-' for stdin)")
+    ap.add_argument("--concurrency", type=int, default=1, help="conversations run in parallel")
+    ap.add_argument("--checkpointer", default=None, help="memory | sqlite | none (default: GRAPH_CHECKPOINTER)")
+    ap.add_argument("--out", default=None, help="write the JSON report (and replies) here")
+    args = ap.parse_args(argv)
+
+    convs = load_conversations(args.conversations)
+    graph = build_graph(checkpointer=make_checkpointer(args.checkpointer))
+    metrics.reset()
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        results = list(pool.map(lambda c: run_conversation(graph, c), convs))
+    report = summarize(results, time.perf_counter() - t0)
+    report["concurrency"] = args.concurrency
+
+    print(json.dumps({k: v for k, v in report.items() if k != "counters"}, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({**report, "replies": {r["id"]: r["replies"] for r in results}}, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,405 @@
+"""Concurrency soak test: memory growth and sustained throughput of many long sessions.
+
+    python -m scripts.soak --sessions 50 --turns 60 --concurrency 8 --budget-kb 512
+    python -m scripts.soak --llm-ms 300 --tool-ms 80 --out soak.json     # closer to real latencies
+    python -m scripts.soak --standins mypkg.fakes:SlowLLM                 # other stand-ins
+
+Every session is a ConversationSession on one build_graph() graph, running a scripted
+multi-turn conversation (weather, follow-ups, date ranges, country facts, web questions, acks)
+that moves across destinations. The LLM and tools are local stand-ins (scripts/standins.py by
+default; --standins takes any "module:factory" whose result has install()). All sessions stay
+alive until the end, as in a long-running server; worker threads take turns from whichever
+session is ready, so sessions interleave.
+
+Memory is sampled over time for the whole process (RSS and tracemalloc, divided by the live
+sessions) and, every --field-every turns, for each session's state, split by field: history,
+transcript, summary, user_profile, data.facts.weather_by_place, the rest of data.facts, the rest
+of data, and the session's checkpoints. The report gives each field's size and growth per turn,
+the throughput in the first and second half of the run, and fails (exit status 1) when the
+memory per session exceeds --budget-kb. tracemalloc slows turns several times over, so compare
+throughput between runs with the same flags.
+"""
+import argparse
+import contextlib
+import gc
+import importlib
+import json
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from llm.llm_client import load_env
+load_env()   # before the graph modules read their settings
+
+from graph import build_graph
+from graph.checkpoint import make_checkpointer
+from graph.session import ConversationSession
+from scripts.batch_run import summarize
+from scripts.standins import CITIES
+from telemetry import metrics
+
+DEFAULT_STANDINS = "scripts.standins:StandIns"
+FIELDS = ["history", "transcript", "summary", "user_profile", "data.facts.weather_by_place",
+          "data.facts (other)", "data (other)", "checkpoints"]
+
+# One conversation script; {city}/{next_city} rotate per session so the facts store keeps filling
+SCRIPT = [
+    "What's the weather in {city} tomorrow?",
+    "and the weekend?",
+    "weather in {city} from {start} to {end}",
+    "what currency do they use there and do I need a visa?",
+    "things to do in {city}",
+    "is the main museum in {city} open today?",
+    "what should I pack for {city}?",
+    "thanks!",
+    "how about {next_city} tomorrow?",
+    "ok",
+]
+
+
+def conversation(index: int, turns: int, cities: List[str]) -> List[str]:
+    """Scripted turns for session `index`, moving to the next city every len(SCRIPT) turns."""
+    start = date.today() + timedelta(days=3)
+    msgs = []
+    for i in range(turns):
+        k = index + i // len(SCRIPT)
+        msgs.append(SCRIPT[i % len(SCRIPT)].format(
+            city=cities[k % len(cities)], next_city=cities[(k + 1) % len(cities)],
+            start=start.isoformat(), end=(start + timedelta(days=4)).isoformat(),
+        ))
+    return msgs
+
+
+# ------------------------------- memory -------------------------------
+
+def deep_size(obj: Any, seen: Optional[set] = None) -> int:
+    """Bytes held by `obj` and everything it references, each object counted once per `seen`."""
+    seen = set() if seen is None else seen
+    stack, total = [obj], 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, (type, type(sys), type(deep_size))):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif not isinstance(o, (str, bytes, bytearray, int, float, bool)):
+            if hasattr(o, "__dict__"):
+                stack.append(vars(o))
+            for slot in getattr(type(o), "__slots__", ()):
+                if hasattr(o, slot):
+                    stack.append(getattr(o, slot))
+    return total
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process (peak RSS where /proc is not available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def checkpoint_bytes(checkpointer) -> Dict[str, int]:
+    """Serialized bytes per thread id held by an InMemorySaver ({} for other checkpointers)."""
+    per_thread: Dict[str, int] = {}
+    for attr in ("storage", "writes", "blobs"):   # the saver's own tables, keyed by thread id first
+        table = getattr(checkpointer, attr, None)
+        if not isinstance(table, dict):
+            return {}
+        for key, value in list(table.items()):
+            thread_id = key if attr == "storage" else key[0]
+            per_thread[thread_id] = per_thread.get(thread_id, 0) + deep_size(value)
+    return per_thread
+
+
+def state_fields(session: ConversationSession) -> Dict[str, int]:
+    """Bytes per state field of one session (checkpoints are measured separately)."""
+    data = session.data or {}
+    facts = data.get("facts") or {}
+    hot = session.graph.get_state(session.config).values.get("history", []) if session.checkpointed \
+        else session.history.hot()
+    seen: set = set()   # most specific field first, so shared objects are counted once
+    return {
+        "history": deep_size(hot, seen),
+        "transcript": deep_size(session.history, seen),
+        "summary": deep_size(session.summary, seen),
+        "user_profile": deep_size(session.user_profile, seen),
+        "data.facts.weather_by_place": deep_size(facts.get("weather_by_place") or {}, seen),
+        "data.facts (other)": deep_size(facts, seen),
+        "data (other)": deep_size(data, seen),
+    }
+
+
+# ------------------------------- running -------------------------------
+
+class SoakSession:
+    def __init__(self, graph, index: int, turns: List[str]):
+        self.id = f"soak-{index}"
+        self.session = ConversationSession(graph)
+        self.turns = turns
+        self.next_turn = 0
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.fields: List[Dict[str, Any]] = []   # {"turn": n, field: bytes, ...}
+
+    def step(self, field_every: int) -> bool:
+        """Run the next turn; False once the script is done."""
+        t0 = time.perf_counter()
+        try:
+            self.session.turn(self.turns[self.next_turn])
+        except Exception as e:
+            self.errors += 1
+            print(f"DEBUG: soak {self.id} turn {self.next_turn} failed: {e}", file=sys.stderr)
+        self.latencies.append(time.perf_counter() - t0)
+        self.next_turn += 1
+        if self.next_turn % field_every == 0 or self.next_turn == len(self.turns):
+            self.fields.append({"turn": self.next_turn, **state_fields(self.session)})
+        return self.next_turn < len(self.turns)
+
+
+class Sampler(threading.Thread):
+    """Process memory and completed turns every `interval` seconds."""
+
+    def __init__(self, interval: float, sessions: List[SoakSession], checkpointer, baseline: Dict[str, int]):
+        super().__init__(daemon=True, name="soak-sampler")
+        self.interval = interval
+        self.sessions = sessions
+        self.checkpointer = checkpointer
+        self.baseline = baseline
+        self.samples: List[Dict[str, Any]] = []
+        self._done = threading.Event()
+        self.t0 = time.perf_counter()
+
+    def sample(self) -> Dict[str, Any]:
+        n = len(self.sessions)
+        rss, traced = rss_bytes(), tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        ckpt = checkpoint_bytes(self.checkpointer)
+        s = {
+            "t_s": round(time.perf_counter() - self.t0, 2),
+            "turns": sum(x.next_turn for x in self.sessions),
+            "rss_mb": round(rss / 2**20, 1),
+            "traced_mb": round(traced / 2**20, 1),
+            "rss_kb_per_session": round((rss - self.baseline["rss"]) / 1024 / n, 1),
+            "traced_kb_per_session": round((traced - self.baseline["traced"]) / 1024 / n, 1),
+            "checkpoint_kb_per_session": round(sum(ckpt.get(x.session.thread.thread_id, 0) for x in self.sessions) / 1024 / n, 1),
+        }
+        self.samples.append(s)
+        return s
+
+    def run(self) -> None:
+        while not self._done.wait(self.interval):
+            self.sample()
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+
+def load_standins(spec: str, llm_ms: float, tool_ms: float):
+    module, _, attr = spec.partition(":")
+    factory = getattr(importlib.import_module(module), attr or "StandIns")
+    return factory(llm_latency_s=llm_ms / 1000, tool_latency_s=tool_ms / 1000)
+
+
+def run_soak(sessions: List[SoakSession], concurrency: int, field_every: int) -> float:
+    """Run every session's script on `concurrency` threads; returns wall seconds."""
+    ready: "queue.Queue[Optional[SoakSession]]" = queue.Queue()
+    for s in sessions:
+        ready.put(s)
+    remaining = [len(sessions)]
+    lock = threading.Lock()
+
+    def worker() -> None:
+        while True:
+            s = ready.get()
+            if s is None:
+                return
+            if s.step(field_every):
+                ready.put(s)
+                continue
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    for _ in range(concurrency):
+                        ready.put(None)
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=worker, name=f"soak-{i}") for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0
+
+
+# ------------------------------- report -------------------------------
+
+def attribute(sessions: List[SoakSession], checkpoints: Dict[str, int]) -> Dict[str, Dict[str, float]]:
+    """Per field: mean size at the first and last sample, growth per turn, and the largest session."""
+    out: Dict[str, Dict[str, float]] = {}
+    measured = [s for s in sessions if s.fields]
+    for f in FIELDS:
+        if f == "checkpoints":
+            ends = [checkpoints.get(s.session.thread.thread_id, 0) for s in measured]
+            starts, turns = [0] * len(measured), [s.next_turn for s in measured]
+        else:
+            starts = [s.fields[0][f] for s in measured]
+            ends = [s.fields[-1][f] for s in measured]
+            turns = [s.fields[-1]["turn"] - s.fields[0]["turn"] for s in measured]
+        if not ends:
+            continue
+        growth = [(e - b) / t for b, e, t in zip(starts, ends, turns) if t]
+        out[f] = {
+            "start_kb": round(statistics.mean(starts) / 1024, 1),
+            "end_kb": round(statistics.mean(ends) / 1024, 1),
+            "max_kb": round(max(ends) / 1024, 1),
+            "growth_b_per_turn": round(statistics.mean(growth), 1) if growth else 0.0,
+        }
+    total = sum(v["end_kb"] for v in out.values()) or 1.0
+    for v in out.values():
+        v["share"] = round(v["end_kb"] / total, 3)
+    return out
+
+
+def throughput(samples: List[Dict[str, Any]], wall_s: float, turns: int) -> Dict[str, float]:
+    """Turns/s overall and over the first and second half of the run."""
+    half = wall_s / 2
+    mid = min(samples, key=lambda s: abs(s["t_s"] - half)) if samples else None
+    out = {"overall": round(turns / wall_s, 2) if wall_s else 0.0}
+    if mid and 0 < mid["t_s"] < wall_s:
+        out["first_half"] = round(mid["turns"] / mid["t_s"], 2)
+        out["second_half"] = round((turns - mid["turns"]) / (wall_s - mid["t_s"]), 2)
+    return out
+
+
+def check_budget(report: Dict[str, Any], budget_kb: float) -> List[str]:
+    failures = []
+    end = report["memory"]["end"]
+    process_kb = end["traced_kb_per_session"] if report["tracemalloc"] else end["rss_kb_per_session"]
+    if process_kb > budget_kb:
+        failures.append(f"process memory per session {process_kb:.0f} KB > budget {budget_kb:.0f} KB")
+    largest = report["memory"]["largest_session_kb"]
+    if largest > budget_kb:
+        failures.append(f"largest session (state + checkpoints) {largest:.0f} KB > budget {budget_kb:.0f} KB")
+    return failures
+
+
+def _print(report: Dict[str, Any]) -> None:
+    r = report
+    print(f"{r['sessions']} sessions x {r['turns_per_session']} turns, concurrency {r['concurrency']}, "
+          f"checkpointer {r['checkpointer']}: {r['turns']} turns in {r['wall_s']:.1f}s, {r['errors']} errors")
+    tp = r["throughput_turns_per_s"]
+    print(f"throughput: {tp['overall']} turns/s"
+          + (f" (first half {tp['first_half']}, second half {tp['second_half']})" if "first_half" in tp else ""))
+    print(f"turn latency ms: {r['turn_ms']}")
+    end = r["memory"]["end"]
+    print(f"memory per session: traced {end['traced_kb_per_session']} KB, RSS {end['rss_kb_per_session']} KB, "
+          f"largest session (state + checkpoints) {r['memory']['largest_session_kb']} KB (budget {r['budget_kb']} KB)")
+    print("\nmemory over time:")
+    samples = r["memory"]["samples"]
+    rows = samples[::max(1, len(samples) // 20)]   # about 20 rows; --out has them all
+    for s in rows + [x for x in samples[-1:] if x is not rows[-1]]:
+        print(f"  {s['t_s']:7.1f}s  {s['turns']:6d} turns  rss {s['rss_mb']:7.1f} MB  traced {s['traced_mb']:7.1f} MB  "
+              f"per session: traced {s['traced_kb_per_session']:7.1f} KB, checkpoints {s['checkpoint_kb_per_session']:7.1f} KB")
+    print("\nstate per session by field (mean KB):")
+    print(f"  {'field':<30}{'start':>9}{'end':>9}{'max':>9}{'B/turn':>10}{'share':>8}")
+    for f, v in sorted(r["fields"].items(), key=lambda kv: kv[1]["end_kb"], reverse=True):
+        print(f"  {f:<30}{v['start_kb']:>9.1f}{v['end_kb']:>9.1f}{v['max_kb']:>9.1f}"
+              f"{v['growth_b_per_turn']:>10.0f}{v['share']:>8.1%}")
+    for line in r["failures"]:
+        print(f"FAIL: {line}")
+
+
+def main(argv: List[str]) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=50, help="concurrent sessions, all alive until the end")
+    ap.add_argument("--turns", type=int, default=60, help="turns per session")
+    ap.add_argument("--concurrency", type=int, default=8, help="worker threads running turns")
+    ap.add_argument("--checkpointer", default=None, help="memory | sqlite | none (default: GRAPH_CHECKPOINTER)")
+    ap.add_argument("--standins", default=DEFAULT_STANDINS, help="module:factory for the LLM and tool stand-ins")
+    ap.add_argument("--llm-ms", type=float, default=0.0, help="simulated latency per LLM call")
+    ap.add_argument("--tool-ms", type=float, default=0.0, help="simulated latency per tool call")
+    ap.add_argument("--budget-kb", type=float, default=512.0, help="fail above this much memory per session")
+    ap.add_argument("--sample-s", type=float, default=1.0, help="seconds between process memory samples")
+    ap.add_argument("--field-every", type=int, default=10, help="measure each session's fields every N turns")
+    ap.add_argument("--no-tracemalloc", action="store_true", help="sample RSS only (tracemalloc slows turns)")
+    ap.add_argument("--verbose", action="store_true", help="keep the nodes' DEBUG output")
+    ap.add_argument("--out", default=None, help="write the JSON report here")
+    args = ap.parse_args(argv)
+
+    undo = load_standins(args.standins, args.llm_ms, args.tool_ms).install()
+    checkpointer = make_checkpointer(args.checkpointer)
+    graph = build_graph(checkpointer=checkpointer)
+    cities = list(CITIES)
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+    try:
+        with quiet:
+            # Lazy imports and first-use caches are process start-up, not per-session growth:
+            # run one full script in a throwaway session (its checkpoints go with it)
+            warm = ConversationSession(graph)
+            for msg in conversation(0, len(SCRIPT), cities):
+                warm.turn(msg)
+            del warm
+            metrics.reset()
+            if not args.no_tracemalloc:
+                tracemalloc.start()
+            gc.collect()
+            baseline = {"rss": rss_bytes(), "traced": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0}
+
+            sessions = [SoakSession(graph, i, conversation(i, args.turns, cities)) for i in range(args.sessions)]
+            sampler = Sampler(args.sample_s, sessions, checkpointer, baseline)
+            sampler.start()
+            wall = run_soak(sessions, max(1, args.concurrency), max(1, args.field_every))
+            sampler.stop()
+            gc.collect()
+            end = sampler.sample()
+    finally:
+        undo()
+        tracemalloc.stop()
+
+    results = [{"id": s.id, "latencies": s.latencies, "errors": s.errors} for s in sessions]
+    summary = summarize(results, wall)
+    checkpoints = checkpoint_bytes(checkpointer)
+    largest = max((sum(v for k, v in s.fields[-1].items() if k != "turn") + checkpoints.get(s.session.thread.thread_id, 0)
+                   for s in sessions if s.fields), default=0)
+    report: Dict[str, Any] = {
+        "sessions": args.sessions,
+        "turns_per_session": args.turns,
+        "concurrency": args.concurrency,
+        "checkpointer": type(checkpointer).__name__ if checkpointer else "none",
+        "tracemalloc": not args.no_tracemalloc,
+        "turns": summary["turns"],
+        "errors": summary["errors"],
+        "wall_s": summary["wall_s"],
+        "throughput_turns_per_s": throughput(sampler.samples, wall, summary["turns"]),
+        "turn_ms": summary["turn_ms"],
+        "llm_calls": summary["llm_calls"],
+        "tool_calls": summary["tool_calls"],
+        "budget_kb": args.budget_kb,
+        "memory": {"end": end, "largest_session_kb": round(largest / 1024, 1), "samples": sampler.samples},
+        "fields": attribute(sessions, checkpoints),
+    }
+    report["failures"] = check_budget(report, args.budget_kb)
+    _print(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
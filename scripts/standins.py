@@ -0,0 +1,199 @@
+"""Local stand-ins for the LLM and the external tools, for load and soak runs without network.
+
+    from scripts.standins import StandIns
+    undo = StandIns(llm_latency_s=0.05, tool_latency_s=0.02).install()
+    ...
+    undo()
+
+install() swaps the functions graph.nodes calls (chat_completion_simple/_structured, geocode,
+forecast_daily, country_facts, web_search) for the methods of this object. Replies are
+deterministic functions of the prompt, shaped like the real ones: an intent word for the
+router, a 3-5 line summary, schema objects for the planners, and Open-Meteo / restcountries /
+Tavily shaped tool results. The latencies are slept, so concurrent sessions overlap the way they
+do on real I/O. Subclass and override a method to plug in different behaviour.
+"""
+from __future__ import annotations
+import hashlib
+import re
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from graph.helpers.keywords import scan
+
+# name -> (country, country code, lat, lon, timezone)
+CITIES: Dict[str, Tuple[str, str, float, float, str]] = {
+    "Paris": ("France", "FR", 48.85, 2.35, "Europe/Paris"),
+    "Lyon": ("France", "FR", 45.76, 4.84, "Europe/Paris"),
+    "Rome": ("Italy", "IT", 41.9, 12.5, "Europe/Rome"),
+    "Lisbon": ("Portugal", "PT", 38.72, -9.14, "Europe/Lisbon"),
+    "Barcelona": ("Spain", "ES", 41.39, 2.17, "Europe/Madrid"),
+    "Sofia": ("Bulgaria", "BG", 42.7, 23.32, "Europe/Sofia"),
+    "Berlin": ("Germany", "DE", 52.52, 13.4, "Europe/Berlin"),
+    "Athens": ("Greece", "GR", 37.98, 23.73, "Europe/Athens"),
+    "Tokyo": ("Japan", "JP", 35.68, 139.69, "Asia/Tokyo"),
+    "New York": ("United States", "US", 40.71, -74.0, "America/New_York"),
+    "Cairo": ("Egypt", "EG", 30.04, 31.24, "Africa/Cairo"),
+    "Amman": ("Jordan", "JO", 31.95, 35.93, "Asia/Amman"),
+}
+# country -> (capital, currency, language)
+COUNTRIES: Dict[str, Tuple[str, str, str]] = {
+    "France": ("Paris", "EUR", "French"), "Italy": ("Rome", "EUR", "Italian"),
+    "Portugal": ("Lisbon", "EUR", "Portuguese"), "Spain": ("Madrid", "EUR", "Spanish"),
+    "Bulgaria": ("Sofia", "BGN", "Bulgarian"), "Germany": ("Berlin", "EUR", "German"),
+    "Greece": ("Athens", "EUR", "Greek"), "Japan": ("Tokyo", "JPY", "Japanese"),
+    "United States": ("Washington, D.C.", "USD", "English"), "Egypt": ("Cairo", "EGP", "Arabic"),
+    "Jordan": ("Amman", "JOD", "Arabic"),
+}
+FORECAST_DAYS = 16
+
+_USER_LINE = re.compile(r"^(?:User|Message|message|User message):\s*\"?(.*?)\"?\s*$", re.M)
+_PREV_SUMMARY = re.compile(r"Previous summary \(may be empty\):\n(.*?)\n\nNew exchange:", re.S)
+
+
+def _seed(*parts: Any) -> int:
+    return int.from_bytes(hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=4).digest(), "big")
+
+
+def _city_in(text: str) -> Optional[str]:
+    lowered = text.lower()
+    return next((c for c in CITIES if c.lower() in lowered), None)
+
+
+class StandIns:
+    """Deterministic LLM and tool replies with simulated latency."""
+
+    def __init__(self, llm_latency_s: float = 0.0, tool_latency_s: float = 0.0):
+        self.llm_latency_s = llm_latency_s
+        self.tool_latency_s = tool_latency_s
+
+    # ------------------------------ LLM ------------------------------
+
+    def _user_msg(self, messages: List[Dict[str, str]]) -> str:
+        found = _USER_LINE.findall(messages[-1]["content"])
+        return found[-1] if found else messages[-1]["content"]
+
+    def intent(self, msg: str) -> str:
+        features = scan(msg)
+        lowered = msg.lower()
+        if "ack" in features:
+            return "smalltalk"
+        if features & {"weather", "date", "time_word"}:
+            return "weather"
+        if "pack" in lowered or "wear" in lowered:
+            return "packing"
+        if "distance" in features:
+            return "destinations"
+        if "country_fact" in features or "web" in features:
+            return "logistics"
+        return "attractions"
+
+    def chat_completion_simple(self, messages: List[Dict[str, str]], model: Optional[str] = None,
+                               temperature: float = 0.2) -> str:
+        time.sleep(self.llm_latency_s)
+        prompt = messages[-1]["content"]
+        if prompt.startswith("Classify the user's message"):
+            return self.intent(self._user_msg(messages))
+        if prompt.startswith("Update the running conversation summary"):
+            m = _PREV_SUMMARY.search(prompt)
+            prev = [l for l in (m.group(1) if m else "").splitlines() if l and l != "(none)"]
+            user = self._user_msg(messages)
+            return "\n".join((prev + [f"- Asked: {user[:80]}"])[-5:])
+        if prompt.startswith("Draft:"):
+            return prompt.split("\n\nCritique:")[0][len("Draft:\n"):] + "\n(Revised.)"
+        return "Happy to help! Where are you heading next, and when?"
+
+    def chat_completion_structured(self, messages: List[Dict[str, str]], schema, model: Optional[str] = None,
+                                   temperature: float = 0.2):
+        time.sleep(self.llm_latency_s)
+        prompt = messages[-1]["content"]
+        msg = self._user_msg(messages)
+        name = schema.__name__
+        if name == "PlacePlan":
+            city = _city_in(msg)
+            if city:
+                return schema(resolved_place=city, resolution="explicit", rationale="named in the message")
+            active = re.search(r"^active_destination: (.+)$", prompt, re.M)
+            if active and active.group(1) not in ("None", ""):
+                return schema(resolved_place=active.group(1), resolution="implicit_previous", rationale="active")
+            return schema(resolution="none", rationale="no place")
+        if name == "ToolPlan":
+            features = scan(msg)
+            return schema(need_weather=bool(features & {"weather", "date", "time_word"}),
+                          need_country="country_fact" in features, need_web="web" in features,
+                          place_hint=_city_in(msg), rationale="keywords")
+        if name == "TimePlan":
+            features = scan(msg)
+            for word in ("today", "tomorrow", "weekend"):
+                if word in msg.lower():
+                    return schema(target_type=word, rationale="keyword")
+            return schema(target_type="today" if "time_word" in features else "unspecified", rationale="default")
+        if name == "ComposeOut":
+            place = _city_in(msg) or "your destination"
+            bullets = [f"- Idea {i + 1} for {place}: a short, practical suggestion with a reason to go."
+                       for i in range(4)]
+            answer = "\n".join([f"Here is a quick plan for {place}.", *bullets, "TL;DR: a few easy picks to start."])
+            return schema(answer=answer, confidence=0.8)
+        raise ValueError(f"no stand-in for schema {name}")
+
+    # ----------------------------- tools -----------------------------
+
+    def geocode(self, place: str) -> Optional[Dict[str, Any]]:
+        time.sleep(self.tool_latency_s)
+        city = _city_in(place) or place.split(",")[0].strip().title()
+        country, code, lat, lon, tz = CITIES.get(city) or (
+            "Utopia", "UT", (_seed(city) % 1800) / 10 - 90, (_seed(city, "lon") % 3600) / 10 - 180, "UTC")
+        return {"lat": lat, "lon": lon, "name": city, "country": country, "country_code": code, "timezone": tz}
+
+    def forecast_daily(self, lat: float, lon: float, units: str = "metric") -> Dict[str, Any]:
+        time.sleep(self.tool_latency_s)
+        start = date.today() - timedelta(days=1)   # covers "today" in every timezone
+        seed = _seed(lat, lon, start)
+        days = [(start + timedelta(days=i)).isoformat() for i in range(FORECAST_DAYS)]
+        highs = [round(8 + (seed >> i) % 22 + ((seed >> (i + 3)) % 10) / 10, 1) for i in range(FORECAST_DAYS)]
+        tz = next((v[4] for v in CITIES.values() if (v[2], v[3]) == (lat, lon)), "UTC")
+        return {
+            "timezone": tz,
+            "daily": {
+                "time": days,
+                "temperature_2m_max": highs,
+                "temperature_2m_min": [round(h - 6 - (seed >> (i + 5)) % 5, 1) for i, h in enumerate(highs)],
+                "precipitation_probability_max": [(seed >> (i + 7)) % 101 for i in range(FORECAST_DAYS)],
+            },
+        }
+
+    def country_facts(self, name: str) -> Optional[Dict[str, Any]]:
+        time.sleep(self.tool_latency_s)
+        city = _city_in(name)
+        country = CITIES[city][0] if city else next((c for c in COUNTRIES if c.lower() == name.lower().strip()), None)
+        if not country:
+            return None
+        capital, currency, language = COUNTRIES[country]
+        code = next(v[1] for v in CITIES.values() if v[0] == country)
+        return {"name": country, "code": code, "capital": capital, "currencies": [currency],
+                "languages": [language], "timezones": ["UTC+01:00"], "dial": "+0"}
+
+    def web_search(self, query: str, max_results: int = 5) -> Dict[str, Any]:
+        time.sleep(self.tool_latency_s)
+        return {"query": query, "results": [
+            {"title": f"Result {i + 1} for {query[:40]}", "url": f"https://example.com/{_seed(query, i)}",
+             "content": f"Snippet {i + 1}: opening hours, events and practical notes related to {query[:60]}."}
+            for i in range(max_results)
+        ]}
+
+    # ---------------------------- install ----------------------------
+
+    NAMES = ("chat_completion_simple", "chat_completion_structured", "geocode", "forecast_daily",
+             "country_facts", "web_search")
+
+    def install(self) -> Callable[[], None]:
+        """Point graph.nodes at these stand-ins; returns a function that restores the originals."""
+        from graph import nodes
+        saved = {n: getattr(nodes, n) for n in self.NAMES}
+        for n in self.NAMES:
+            setattr(nodes, n, getattr(self, n))
+
+        def undo() -> None:
+            for n, fn in saved.items():
+                setattr(nodes, n, fn)
+        return undo
@@ -0,0 +1,25 @@
+"""Local time-parser coverage over app logs.
+
+    python -m scripts.time_coverage app.log [more.log ...]   # or pipe logs on stdin
+"""
+import sys
+from typing import List
+
+from graph.helpers.timeparse import LOG_MSG, coverage
+
+
+def main(paths: List[str]) -> None:
+    lines: List[str] = []
+    for path in paths or ["-"]:
+        fh = sys.stdin if path == "-" else open(path, encoding="utf-8", errors="replace")
+        lines.extend(fh.read().splitlines())
+    msgs = [m[1] for m in (LOG_MSG.match(line.strip()) for line in lines) if m]
+    report = coverage(msgs)
+    print(f"messages: {report['messages']}, parsed locally: {report['parsed']} ({report['coverage']})")
+    print(f"by type: {report['by_type']}")
+    for msg in report["fallback"]:
+        print(f"  needs LLM: {msg}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
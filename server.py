@@ -0,0 +1,326 @@
+"""HTTP API for the travel graph, independent of the Streamlit UI.
+
+    uvicorn server:app --host 0.0.0.0 --port 8000
+
+With SERVER_WORKERS=N the graph runs in N worker processes (see workers.py) and this
+process only dispatches; each session is pinned to one worker by its id.
+
+Sessions are held in memory by this server and evicted when idle. With SESSION_STORE set
+(see graph/session_store.py) every turn is also saved there, and a session this server does
+not hold is resumed from the store, so conversations survive restarts and can move hosts.
+
+Endpoints (route a session's requests to the same server while it is active):
+    POST   /sessions                       {"user_profile": {...}}     -> {"session_id"}
+    GET    /sessions/{id}                                               -> session state
+    DELETE /sessions/{id}
+    POST   /sessions/{id}/messages         {"message": "..."}          -> {"reply", "intent"}
+    POST   /sessions/{id}/messages/stream  {"message": "..."}          -> text/event-stream
+    GET    /healthz
+    GET    /metrics                                                     -> Prometheus text
+"""
+import asyncio
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from llm.llm_client import load_env
+load_env()   # before the graph modules read their settings
+
+from graph import get_graph
+from graph.session import ConversationSession
+from graph.session_store import make_session_store
+from graph.streaming import sse, stream_turn
+from graph.warmup import warm_up
+from telemetry import metrics
+from workers import WorkerPool
+
+SESSION_TTL_S = float(os.getenv("SERVER_SESSION_TTL_S", "1800"))
+MAX_SESSIONS = int(os.getenv("SERVER_MAX_SESSIONS", "10000"))
+# Graph turns are synchronous and run on this pool, off the event loop
+GRAPH_THREADS = int(os.getenv("SERVER_GRAPH_THREADS", "32"))
+# Worker processes for the graph; 0 runs it in this process
+WORKERS = int(os.getenv("SERVER_WORKERS", "0"))
+
+_executor = ThreadPoolExecutor(max_workers=GRAPH_THREADS, thread_name_prefix="turn")
+
+
+class _Entry:
+    def __init__(self, session: Optional[ConversationSession]):
+        self.session = session
+        self.lock = asyncio.Lock()  # one turn at a time per session
+        self.last_used = time.monotonic()
+
+
+class LiveSessions:
+    """Server-side conversations keyed by session id, evicted after SESSION_TTL_S idle."""
+
+    def __init__(self, ttl_s: float = SESSION_TTL_S, max_sessions: int = MAX_SESSIONS, store=None):
+        self.ttl_s = ttl_s
+        self.max_sessions = max_sessions
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self.pool: Optional[WorkerPool] = None  # set when the graph runs in worker processes
+        self.store = store  # durable copy of every session, if configured
+
+    def _make_room(self) -> None:
+        evicted = []
+        with self._lock:
+            if len(self._entries) >= self.max_sessions:
+                oldest = min(self._entries, key=lambda k: self._entries[k].last_used)
+                del self._entries[oldest]
+                evicted.append(oldest)
+        self._release(evicted)
+
+    def create(self, user_profile: Optional[dict] = None) -> str:
+        self.sweep()
+        sid = uuid.uuid4().hex
+        self._make_room()
+        if self.pool:
+            self.pool.create(sid, user_profile)
+            entry = _Entry(None)
+        else:
+            entry = _Entry(ConversationSession(get_graph(), user_profile, thread_id=sid))
+            self.save(sid, entry)
+        with self._lock:
+            self._entries[sid] = entry
+        return sid
+
+    def get(self, sid: str) -> Optional[_Entry]:
+        """The live session, resumed from the store if this server does not hold it."""
+        with self._lock:
+            entry = self._entries.get(sid)
+        if entry is None and self.store:
+            entry = self._resume(sid)
+        if entry:
+            entry.last_used = time.monotonic()
+        return entry
+
+    def _resume(self, sid: str) -> Optional[_Entry]:
+        if self.pool:
+            blob = self.store.get(sid)
+            if blob is None:
+                return None
+            self.pool.resume(sid, blob)
+            entry = _Entry(None)
+        else:
+            record = self.store.load(sid)
+            if record is None:
+                return None
+            entry = _Entry(ConversationSession.resume(get_graph(), record))
+        self._make_room()
+        with self._lock:
+            # Two requests may resume the same session at once: keep the first
+            entry = self._entries.setdefault(sid, entry)
+        metrics.incr("session_store.resumed")
+        return entry
+
+    def save(self, sid: str, entry: _Entry) -> None:
+        """Write an in-process session to the store (worker sessions are saved by the pool)."""
+        if self.store and entry.session is not None:
+            metrics.observe("session_store.record_kb", self.store.save(sid, entry.session.sections()) / 1024)
+
+    def delete(self, sid: str) -> bool:
+        with self._lock:
+            found = self._entries.pop(sid, None) is not None
+        if found:
+            self._release([sid])
+        if self.store:
+            found = found or self.store.get(sid) is not None
+            self.store.delete(sid)
+        return found
+
+    def _release(self, sids) -> None:
+        """Drop evicted sessions from their workers (in-process sessions just go out of scope)."""
+        if self.pool:
+            for sid in sids:
+                self.pool.delete(sid)
+
+    def sweep(self) -> int:
+        cutoff = time.monotonic() - self.ttl_s
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if e.last_used < cutoff and not e.lock.locked()]
+            for k in stale:
+                del self._entries[k]
+        self._release(stale)
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+sessions = LiveSessions(store=make_session_store())
+
+
+async def _run(fn, *args):
+    """Run a blocking call (graph turn, worker round trip) off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+
+
+def _not_found(sid: str) -> JSONResponse:
+    return JSONResponse({"error": f"unknown session {sid}"}, status_code=404)
+
+
+async def _message(request: Request) -> Optional[str]:
+    try:
+        body = await request.json()
+    except Exception:
+        return None
+    msg = (body or {}).get("message")
+    return msg.strip() if isinstance(msg, str) and msg.strip() else None
+
+
+async def create_session(request: Request) -> Response:
+    try:
+        body = await request.json()
+    except Exception:
+        body = {}
+    sid = await _run(sessions.create, (body or {}).get("user_profile"))
+    return JSONResponse({"session_id": sid}, status_code=201)
+
+
+async def get_session(request: Request) -> Response:
+    sid = request.path_params["sid"]
+    entry = await _run(sessions.get, sid)
+    if not entry:
+        return _not_found(sid)
+    if sessions.pool:
+        return JSONResponse(await _run(sessions.pool.get_state, sid))
+    s = entry.session
+    return JSONResponse({
+        "session_id": sid,
+        "intent": s.intent,
+        "summary": s.summary,
+        "user_profile": s.user_profile,
+        "history": s.history.hot(),
+        "history_stats": s.history.stats(),
+    })
+
+
+async def delete_session(request: Request) -> Response:
+    sid = request.path_params["sid"]
+    return Response(status_code=204) if await _run(sessions.delete, sid) else _not_found(sid)
+
+
+async def post_message(request: Request) -> Response:
+    sid = request.path_params["sid"]
+    entry = await _run(sessions.get, sid)
+    if not entry:
+        return _not_found(sid)
+    msg = await _message(request)
+    if not msg:
+        return JSONResponse({"error": "body must be {\"message\": \"...\"}"}, status_code=400)
+    async with entry.lock:
+        if sessions.pool:
+            result = await _run(sessions.pool.turn, sid, msg)
+            return JSONResponse({"reply": result["reply"], "intent": result["intent"]})
+        reply = await _run(entry.session.turn, msg)
+        sessions.save(sid, entry)
+    return JSONResponse({"reply": reply, "intent": entry.session.intent})
+
+
+async def stream_message(request: Request) -> Response:
+    sid = request.path_params["sid"]
+    entry = await _run(sessions.get, sid)
+    if not entry:
+        return _not_found(sid)
+    msg = await _message(request)
+    if not msg:
+        return JSONResponse({"error": "body must be {\"message\": \"...\"}"}, status_code=400)
+
+    async def events():
+        async with entry.lock:
+            loop = asyncio.get_running_loop()
+            queue: asyncio.Queue = asyncio.Queue()
+
+            def produce():
+                # The whole turn runs in one worker thread; events hop back to the loop.
+                # A client that disconnects does not cancel the turn, so session state stays whole.
+                try:
+                    source = sessions.pool.stream(sid, msg) if sessions.pool else stream_turn(entry.session, msg)
+                    for ev in source:
+                        loop.call_soon_threadsafe(queue.put_nowait, ev)
+                    sessions.save(sid, entry)
+                except Exception as e:
+                    print(f"DEBUG: streamed turn failed for session {sid}: {e}")
+                    loop.call_soon_threadsafe(queue.put_nowait, {"event": "error", "data": {"message": str(e)}})
+                finally:
+                    loop.call_soon_threadsafe(queue.put_nowait, None)
+
+            task = loop.run_in_executor(_executor, produce)
+            try:
+                while True:
+                    ev = await queue.get()
+                    if ev is None:
+                        break
+                    yield sse(ev)
+            finally:
+                # On disconnect the generator is cancelled here; keep the lock until the turn is done
+                await asyncio.shield(task)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+async def healthz(request: Request) -> Response:
+    body = {"ok": True, "sessions": len(sessions)}
+    if sessions.pool:
+        body["workers_alive"] = sessions.pool.alive()
+        body["ok"] = all(body["workers_alive"])
+    return JSONResponse(body, status_code=200 if body["ok"] else 503)
+
+
+def _pool_prometheus() -> str:
+    """Each worker's metrics, labelled with its index."""
+    lines, seen = [], set()
+    for st in sessions.pool.stats():
+        for line in st["prometheus"].splitlines():
+            if line.startswith("#"):
+                if line not in seen:
+                    seen.add(line)
+                    lines.append(line)
+            else:
+                lines.append(line.replace('{name=', f'{{worker="{st["worker"]}",name=', 1))
+    return "\n".join(lines) + "\n"
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    text = await _run(_pool_prometheus) if sessions.pool else metrics.prometheus_text()
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    if WORKERS > 0:
+        # Workers warm up their own graph and clients while starting
+        sessions.pool = await _run(lambda: WorkerPool(WORKERS, store=sessions.store))
+        print(f"DEBUG: started {WORKERS} graph workers")
+    else:
+        print(f"DEBUG: warm-up: {await _run(warm_up)}")
+    yield
+    if sessions.pool:
+        await _run(sessions.pool.close)
+    if sessions.store:
+        await _run(sessions.store.close)
+    _executor.shutdown(wait=False)
+
+
+app = Starlette(
+    routes=[
+        Route("/sessions", create_session, methods=["POST"]),
+        Route("/sessions/{sid}", get_session, methods=["GET"]),
+        Route("/sessions/{sid}", delete_session, methods=["DELETE"]),
+        Route("/sessions/{sid}/messages", post_message, methods=["POST"]),
+        Route("/sessions/{sid}/messages/stream", stream_message, methods=["POST"]),
+        Route("/healthz", healthz, methods=["GET"]),
+        Route("/metrics", metrics_endpoint, methods=["GET"]),
+    ],
+    lifespan=lifespan,
+)
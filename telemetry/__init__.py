@@ -0,0 +1 @@
+"""In-process telemetry for the travel assistant (latency metrics, profiling)."""
@@ -0,0 +1,147 @@
+from __future__ import annotations
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List
+
+# Low-overhead latency metrics kept in process.
+# Every observation lands in a fixed log-spaced histogram (0.5 ms .. ~2 min), so recording is a
+# bisect plus two increments and p50/p95/p99 come from the bucket counts. Names follow
+# "node.<graph node>", "tool.<endpoint>" and "llm.<call>"; counters track discrete events.
+
+_BOUNDS: List[float] = []
+_b = 0.0005
+while _b < 120:
+    _BOUNDS.append(round(_b, 6))
+    _b *= 1.25
+
+EXPORT_PATH = os.getenv("METRICS_EXPORT")   # *.prom for Prometheus text, anything else JSON
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """Estimate the p-th percentile by interpolating inside its bucket (capped at the max)."""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            if c and seen + c >= rank:
+                lo = _BOUNDS[i - 1] if i > 0 else 0.0
+                hi = _BOUNDS[i] if i < len(_BOUNDS) else self.max
+                return min(lo + (hi - lo) * (rank - seen) / c, self.max)
+            seen += c
+        return self.max
+
+
+_lock = threading.Lock()
+_histograms: Dict[str, Histogram] = {}
+_counters: Dict[str, int] = {}
+
+
+def observe(name: str, seconds: float) -> None:
+    with _lock:
+        h = _histograms.get(name)
+        if h is None:
+            h = _histograms[name] = Histogram()
+        h.observe(seconds)
+
+
+def incr(name: str, n: int = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+@contextmanager
+def timer(name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - t0)
+
+
+def timed(name: str) -> Callable:
+    """Decorator recording each call's wall time under `name`."""
+    def deco(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - t0)
+        return wrapper
+    return deco
+
+
+def snapshot() -> Dict[str, Any]:
+    """JSON-friendly view: per-name count, mean and p50/p95/p99/max in ms, plus counters."""
+    with _lock:
+        hists = {k: (h.count, h.total, h.percentile(50), h.percentile(95), h.percentile(99), h.max) for k, h in _histograms.items()}
+        counters = dict(_counters)
+    ms = lambda s: round(s * 1000, 2)
+    return {
+        "latency_ms": {
+            k: {"count": n, "mean": ms(total / n) if n else 0.0, "p50": ms(p50), "p95": ms(p95), "p99": ms(p99), "max": ms(mx)}
+            for k, (n, total, p50, p95, p99, mx) in sorted(hists.items())
+        },
+        "counters": dict(sorted(counters.items())),
+    }
+
+
+def prometheus_text(prefix: str = "travel_assistant") -> str:
+    """Prometheus text exposition of all histograms and counters."""
+    lines = [f"# TYPE {prefix}_latency_seconds histogram"]
+    with _lock:
+        items = [(k, list(h.counts), h.count, h.total) for k, h in sorted(_histograms.items())]
+        counters = sorted(_counters.items())
+    for name, counts, count, total in items:
+        cum = 0
+        for bound, c in zip(_BOUNDS, counts):
+            cum += c
+            lines.append(f'{prefix}_latency_seconds_bucket{{name="{name}",le="{bound}"}} {cum}')
+        lines.append(f'{prefix}_latency_seconds_bucket{{name="{name}",le="+Inf"}} {count}')
+        lines.append(f'{prefix}_latency_seconds_sum{{name="{name}"}} {total:.6f}')
+        lines.append(f'{prefix}_latency_seconds_count{{name="{name}"}} {count}')
+    lines.append(f"# TYPE {prefix}_events_total counter")
+    for name, v in counters:
+        lines.append(f'{prefix}_events_total{{name="{name}"}} {v}')
+    return "\n".join(lines) + "\n"
+
+
+def export(path: str | None = None) -> None:
+    """Write the current metrics to `path` (default METRICS_EXPORT); *.prom writes Prometheus text."""
+    path = path or EXPORT_PATH
+    if not path:
+        return
+    body = prometheus_text() if path.endswith(".prom") else json.dumps(snapshot(), indent=2)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+import cProfile
+import contextlib
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+# Opt-in per-turn profiling.
+# PROFILE_TURNS=N profiles the next N turns in this process ("all" for every turn). A profiled
+# turn runs under cProfile and tracemalloc; each graph node gets its own allocation snapshot
+# diff. Files are written to PROFILE_DIR, tagged with the turn id:
+#   <turn>.prof           cProfile stats (open with pstats or snakeviz)
+#   <turn>.allocs.json    top allocation sites per node
+#   <turn>.summary.json   wall/CPU time and time spent per category (deep_merge, I/O wait, ...)
+
+PROFILE_TURNS = os.getenv("PROFILE_TURNS", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+TOP_ALLOCS = 10
+
+# Category -> substrings matched against "<file>:<function>" of each profiled function.
+CATEGORIES: Dict[str, List[str]] = {
+    "deep_merge": ["helpers/merge.py:deep_merge"],
+    "pydantic_validation": ["validate_python", "validate_json", "model_validate", "pydantic/main.py:__init__"],
+    "prompt_formatting": ["langchain_core/prompts/", "<method 'format' of 'str' objects>"],
+    "json_parsing": ["json/decoder.py", "json/__init__.py:loads", "_clean_json_response", "orjson"],
+    "streamlit_rendering": ["/streamlit/"],
+    "io_wait": [
+        "<method 'recv_into' of '_socket.socket' objects>",
+        "<method 'read' of '_ssl._SSLSocket' objects>",
+        "<method 'connect' of '_socket.socket' objects>",
+        "<method 'do_handshake' of '_ssl._SSLSocket' objects>",
+        "<built-in method _socket.getaddrinfo>",
+        "<built-in method select.select>",
+        "<built-in method time.sleep>",
+    ],
+}
+
+# Keep the profiler's own bookkeeping out of the allocation diffs
+_NOISE_FILES = (tracemalloc.__file__, __file__, contextlib.__file__)
+
+_lock = threading.Lock()
+_remaining: Optional[int] = None
+# The turn being profiled, per thread: concurrent turns each see their own profile (LangGraph
+# copies the context into the threads it runs nodes on)
+_current: ContextVar[Optional["TurnProfile"]] = ContextVar("profiled_turn", default=None)
+# Profiled turns in flight; tracemalloc is stopped when the last one ends, if we started it
+_tracing_turns = 0
+_started_tracemalloc = False
+
+
+def _take_budget() -> bool:
+    """Consume one profiled turn from the PROFILE_TURNS budget."""
+    global _remaining
+    if not PROFILE_TURNS:
+        return False
+    if PROFILE_TURNS.lower() == "all":
+        return True
+    with _lock:
+        if _remaining is None:
+            _remaining = int(PROFILE_TURNS)
+        if _remaining <= 0:
+            return False
+        _remaining -= 1
+        return True
+
+
+class TurnProfile:
+    def __init__(self, turn_id: str, out_dir: str):
+        self.turn_id = turn_id
+        self.out_dir = out_dir
+        self.allocs: Dict[str, List[Dict[str, Any]]] = {}
+        self.profiler = cProfile.Profile()
+        self._overhead = 0.0
+
+    def start(self) -> None:
+        global _tracing_turns, _started_tracemalloc
+        with _lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(8)
+                _started_tracemalloc = True
+            _tracing_turns += 1
+        self._wall0, self._cpu0 = time.perf_counter(), time.process_time()
+        self.profiler.enable()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        # Snapshots are expensive; keep them out of the CPU profile
+        self.profiler.disable()
+        t0 = time.perf_counter()
+        try:
+            return tracemalloc.take_snapshot()
+        finally:
+            self._overhead += time.perf_counter() - t0
+            self.profiler.enable()
+
+    @contextmanager
+    def node(self, name: str):
+        before = self._snapshot()
+        try:
+            yield
+        finally:
+            diffs = self._snapshot().compare_to(before, "lineno")
+            diffs = [d for d in diffs if d.traceback[0].filename not in _NOISE_FILES][:TOP_ALLOCS]
+            self.allocs[name] = [
+                {"site": str(d.traceback[0]), "size_kb": round(d.size_diff / 1024, 1), "count": d.count_diff}
+                for d in diffs
+            ]
+
+    def finish(self) -> Dict[str, Any]:
+        global _tracing_turns, _started_tracemalloc
+        self.profiler.disable()
+        wall, cpu = time.perf_counter() - self._wall0, time.process_time() - self._cpu0
+        peak = tracemalloc.get_traced_memory()[1]
+        with _lock:
+            _tracing_turns -= 1
+            if _tracing_turns == 0 and _started_tracemalloc:
+                tracemalloc.stop()
+                _started_tracemalloc = False
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, self.turn_id)
+        self.profiler.dump_stats(base + ".prof")
+        summary = {
+            "turn_id": self.turn_id,
+            "wall_s": round(wall, 4),
+            "cpu_s": round(cpu, 4),
+            "snapshot_overhead_s": round(self._overhead, 4),  # included in wall_s/cpu_s
+            "peak_traced_kb": round(peak / 1024, 1),
+            "categories_s": categorize(pstats.Stats(self.profiler)),
+        }
+        with open(base + ".allocs.json", "w") as f:
+            json.dump(self.allocs, f, indent=2)
+        with open(base + ".summary.json", "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"DEBUG: profiled turn {self.turn_id}: {summary}")
+        return summary
+
+
+def categorize(stats: pstats.Stats) -> Dict[str, float]:
+    """Cumulative seconds per category (categories can overlap, e.g. JSON parsing inside validation)."""
+    totals = {k: 0.0 for k in CATEGORIES}
+    for (filename, _, func), (_, _, _, cumtime, callers) in stats.stats.items():
+        key = f"{filename.replace(os.sep, '/')}:{func}"
+        for cat, needles in CATEGORIES.items():
+            if any(n in key for n in needles):
+                # Only count entry points into the category, not its internal frames
+                inner = any(
+                    any(n in f"{cf.replace(os.sep, '/')}:{cfn}" for n in needles) for (cf, _, cfn) in callers
+                )
+                if not inner:
+                    totals[cat] += cumtime
+    return {k: round(v, 4) for k, v in totals.items()}
+
+
+def begin_turn(turn_id: Optional[str] = None, out_dir: Optional[str] = None) -> Optional[TurnProfile]:
+    """Start profiling a turn if the PROFILE_TURNS budget allows; returns None otherwise.
+
+    Prefer profile_turn(), which ends the profile even if the turn raises.
+    """
+    if not _take_budget():
+        return None
+    turn_id = turn_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    prof = TurnProfile(turn_id, out_dir or PROFILE_DIR)
+    _current.set(prof)
+    prof.start()
+    return prof
+
+
+def end_turn(prof: Optional[TurnProfile]) -> Optional[Dict[str, Any]]:
+    if prof is None:
+        return None
+    _current.set(None)
+    return prof.finish()
+
+
+@contextmanager
+def profile_turn(turn_id: Optional[str] = None, out_dir: Optional[str] = None):
+    prof = begin_turn(turn_id, out_dir)
+    try:
+        yield prof
+    finally:
+        end_turn(prof)
+
+
+def node_scope(name: str):
+    """Allocation snapshot scope for one node while a turn is being profiled."""
+    prof = _current.get()
+    return prof.node(name) if prof is not None else nullcontext()
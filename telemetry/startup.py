@@ -0,0 +1,170 @@
+"""Cold-start report: where a fresh process spends its time before the first reply.
+
+    python -m telemetry.startup                                  # import cost of the graph
+    python -m telemetry.startup --modules server                 # import cost of other modules
+    python -m telemetry.startup --turn "weather in Paris tomorrow"   # plus warm-up and a first turn
+
+Imports are measured in a fresh interpreter with `-X importtime`; the report breaks the cost
+down by top-level package (with the first-party module that pulled each one in) and lists the
+slowest modules by cumulative time. --turn also times load_env + imports, warm_up() and the
+first ConversationSession.turn in another fresh process (real LLM and tool calls, so it needs
+GROQ_API_KEY unless the process is patched with stand-ins).
+"""
+from __future__ import annotations
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_MODULES = ["graph", "graph.session", "graph.streaming"]
+# Top-level packages of this repo; an imported package is attributed to the last of these on its import chain
+FIRST_PARTY = frozenset(["graph", "llm", "telemetry", "benchmarks", "scripts", "workers", "app", "server"])
+
+_FIRST_TURN = """
+import json, sys, time
+t0 = time.perf_counter()
+from llm.llm_client import load_env
+load_env()
+from graph import get_graph
+from graph.session import ConversationSession
+t1 = time.perf_counter()
+warm = {}
+if sys.argv[2] == "1":
+    from graph.warmup import warm_up
+    warm = warm_up()
+t2 = time.perf_counter()
+session = ConversationSession(get_graph())
+reply = session.turn(sys.argv[1])
+t3 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "warm_up_ms": (t2 - t1) * 1000, "warm_up_steps": warm,
+                  "first_turn_ms": (t3 - t2) * 1000, "reply_chars": len(reply or "")}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Rows of `-X importtime` output in import order: name, depth, self/cumulative ms, parent."""
+    rows: List[Dict[str, Any]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append({"module": name.strip(), "depth": depth,
+                     "self_ms": int(self_us) / 1000, "cumulative_ms": int(cum_us) / 1000, "parent": None})
+    # A module is listed after everything it imports, so its parent is the next row one level up
+    open_parents: Dict[int, Dict[str, Any]] = {}
+    for row in reversed(rows):
+        row["parent"] = open_parents.get(row["depth"] - 1)
+        open_parents[row["depth"]] = row
+    return rows
+
+
+def _package(module: str) -> str:
+    return module.split(".")[0]
+
+
+def _via(row: Dict[str, Any]) -> str:
+    """The innermost first-party module on the import chain of `row` ("" if imported directly)."""
+    p = row["parent"]
+    while p is not None:
+        if _package(p["module"]) in FIRST_PARTY:
+            return p["module"]
+        p = p["parent"]
+    return ""
+
+
+def import_report(rows: List[Dict[str, Any]], top: int = 15) -> Dict[str, Any]:
+    packages: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        pkg = packages.setdefault(_package(row["module"]), {"self_ms": 0.0, "modules": 0, "via": None})
+        pkg["self_ms"] += row["self_ms"]
+        pkg["modules"] += 1
+        if pkg["via"] is None and (row["parent"] is None or _package(row["parent"]["module"]) != _package(row["module"])):
+            pkg["via"] = _via(row)   # where the package was first entered from
+    total = sum(r["self_ms"] for r in rows)
+    by_package = sorted(({"package": k, **v, "self_ms": round(v["self_ms"], 1)} for k, v in packages.items()),
+                        key=lambda p: p["self_ms"], reverse=True)
+    slowest = sorted(rows, key=lambda r: r["cumulative_ms"], reverse=True)[:top]
+    return {
+        "total_ms": round(total, 1),
+        "modules": len(rows),
+        "by_package": by_package[:top],
+        "slowest_modules": [{"module": r["module"], "cumulative_ms": round(r["cumulative_ms"], 1),
+                             "self_ms": round(r["self_ms"], 1), "via": _via(r)} for r in slowest],
+    }
+
+
+def profile_imports(modules: List[str], top: int = 15) -> Dict[str, Any]:
+    """Import `modules` in a fresh interpreter and report where the time went."""
+    stmt = "import " + ", ".join(modules)
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", stmt], capture_output=True, text=True)
+    wall = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"{stmt!r} failed:\n{proc.stderr[-2000:]}")
+    report = import_report(parse_importtime(proc.stderr), top)
+    report.update({"statement": stmt, "process_ms": round(wall, 1)})
+    return report
+
+
+def profile_first_turn(message: str, warm: bool = True) -> Dict[str, Any]:
+    """Time imports, warm-up and the first turn of a fresh process."""
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", _FIRST_TURN, message, "1" if warm else "0"],
+                          capture_output=True, text=True)
+    wall = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"first turn failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result = {k: round(v, 1) if isinstance(v, float) else v for k, v in result.items()}
+    result["process_ms"] = round(wall, 1)
+    return result
+
+
+def _print_imports(r: Dict[str, Any]) -> None:
+    print(f"{r['statement']}: {r['total_ms']:.0f} ms importing {r['modules']} modules "
+          f"({r['process_ms']:.0f} ms for the whole process)")
+    print("\nby package (self time):")
+    for p in r["by_package"]:
+        share = p["self_ms"] / r["total_ms"] * 100 if r["total_ms"] else 0.0
+        via = f"  via {p['via']}" if p["via"] else ""
+        print(f"  {p['self_ms']:8.1f} ms {share:4.0f}%  {p['package']:<24}{via}")
+    print("\nslowest modules (cumulative):")
+    for m in r["slowest_modules"]:
+        via = f"  via {m['via']}" if m["via"] else ""
+        print(f"  {m['cumulative_ms']:8.1f} ms  {m['module']:<40}{via}")
+
+
+def _print_turn(t: Dict[str, Any]) -> None:
+    print("\nfirst turn in a fresh process:")
+    for k in ("import_ms", "warm_up_ms", "first_turn_ms", "process_ms"):
+        print(f"  {k:<14} {t[k]:8.1f}")
+    if t.get("warm_up_steps"):
+        print(f"  warm-up steps  {t['warm_up_steps']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--modules", nargs="+", default=DEFAULT_MODULES, help="modules to import (default: the graph)")
+    ap.add_argument("--top", type=int, default=15, help="rows per table")
+    ap.add_argument("--turn", metavar="MESSAGE", help="also time warm-up and a first turn with this message")
+    ap.add_argument("--no-warm-up", action="store_true", help="with --turn, skip warm_up() before the turn")
+    ap.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = ap.parse_args(argv)
+
+    report: Dict[str, Any] = {"imports": profile_imports(args.modules, args.top)}
+    if args.turn:
+        report["first_turn"] = profile_first_turn(args.turn, warm=not args.no_warm_up)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    _print_imports(report["imports"])
+    if "first_turn" in report:
+        _print_turn(report["first_turn"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
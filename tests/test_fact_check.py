@@ -0,0 +1,44 @@
+from graph.helpers.fact_check import check_draft
+from graph.helpers.facts_store import put_place
+
+DAYS = ["2026-03-14", "2026-03-15"]
+
+
+def _state(units, tmax, tmin):
+    wx = {"timezone": "Europe/Paris", "daily": {
+        "time": DAYS, "temperature_2m_max": tmax, "temperature_2m_min": tmin,
+        "precipitation_probability_max": [10, 60],
+    }}
+    wbp = put_place({}, "Paris", {"name": "Paris", "country": "France"}, wx)
+    return {
+        "user_msg": "weather in Paris this weekend?",
+        "data": {
+            "units": units,
+            "plan": {"weather": True},
+            "facts": {"today": DAYS[0], "target_dates": DAYS, "weather_by_place": wbp},
+        },
+    }
+
+
+def test_metric_draft_matches():
+    state = _state("metric", [22.0, 18.0], [12.0, 9.0])
+    draft = "- 2026-03-14: 22°C/12°C (precip 10%)\n- 2026-03-15: 18°/9° (precip 60%)"
+    assert check_draft(draft, state, "Paris") == []
+
+
+def test_imperial_draft_matches():
+    state = _state("imperial", [72.0, 64.0], [54.0, 48.0])
+    draft = "- 2026-03-14: 72°F/54°F (precip 10%)\n- 2026-03-15: 64° F/48° F (precip 60%)"
+    assert check_draft(draft, state, "Paris") == []
+
+
+def test_imperial_draft_wrong_temperature():
+    state = _state("imperial", [72.0, 64.0], [54.0, 48.0])
+    issues = check_draft("- 2026-03-14: 80°F/54°F", state, "Paris")
+    assert issues == ["2026-03-14: 80°F does not match the forecast (high 72°F, low 54°F)"]
+
+
+def test_other_unit_is_converted():
+    state = _state("metric", [22.0, 18.0], [12.0, 9.0])
+    assert check_draft("- 2026-03-14: 22°C (72°F), low 12°C", state, "Paris") == []
+    assert check_draft("- 2026-03-14: 90°F", state, "Paris") != []
@@ -0,0 +1,39 @@
+import pytest
+
+from graph.helpers.destinations import PLACE_MIN_CONFIDENCE, score_place
+from graph.helpers.places import find_places
+
+PROFILE = {"active_destination": "Paris", "destinations": ["Paris"]}
+
+
+def _score(msg):
+    return score_place({"user_msg": msg, "user_profile": PROFILE, "data": {}})
+
+
+@pytest.mark.parametrize("msg, expected", [
+    ("Weather in Nice tomorrow", ["Nice"]),
+    ("I love Split. Nice too", ["Split"]),
+    ("LA or NYC?", ["Los Angeles", "New York"]),
+    ("Nice, France in May", ["Nice", "France"]),
+    ("Nice! What should I pack?", []),
+    ("Split the budget for me", []),
+    ("that would be nice", []),
+])
+def test_find_places_case_sensitive_aliases(msg, expected):
+    assert [name for name, _, _ in find_places(msg)] == expected
+
+
+@pytest.mark.parametrize("msg", ["Nice! What should I pack?", "Split the budget for me"])
+def test_sentence_initial_word_is_not_a_place(msg):
+    scored = _score(msg)
+    assert scored["place"] is None or scored["confidence"] < PLACE_MIN_CONFIDENCE
+
+
+def test_where_is_not_a_pronoun():
+    assert _score("Where should I go next summer?")["place"] is None
+
+
+def test_pronoun_alone_goes_to_the_llm():
+    scored = _score("what's the weather there tomorrow?")
+    assert scored["place"] == "Paris"
+    assert scored["confidence"] < PLACE_MIN_CONFIDENCE
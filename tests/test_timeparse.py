@@ -0,0 +1,47 @@
+from datetime import date
+
+import pytest
+
+from graph.helpers.timeparse import coverage, parse_time_expression
+
+BASE = date(2026, 10, 19)  # a Monday
+
+
+@pytest.mark.parametrize("msg", [
+    "weather in dec",
+    "in may",
+    "Paris on the 24th",
+    "from the 3rd to the 7th",
+    "on 31 feb",
+    "weekend after next",
+    "next sat",
+    "mon",
+])
+def test_unparsed_time_falls_back_to_llm(msg):
+    assert parse_time_expression(msg, BASE) is None
+
+
+@pytest.mark.parametrize("msg, expected", [
+    ("weather on Dec 3rd", {"target_type": "date", "iso_dates": ["2026-12-03"]}),
+    ("3rd of December", {"target_type": "date", "iso_dates": ["2026-12-03"]}),
+    ("May 3", {"target_type": "date", "iso_dates": ["2027-05-03"]}),
+    ("Dec 3-7", {"target_type": "range", "iso_start": "2026-12-03", "iso_end": "2026-12-07"}),
+    ("tomorrow in Rome", {"target_type": "tomorrow"}),
+    ("may I ask about Paris", {"target_type": "unspecified"}),
+    ("Dec. 3", {"target_type": "date", "iso_dates": ["2026-12-03"]}),
+    # A count followed by a word that starts like a month is not a date
+    ("top 10 markets in Marrakech", {"target_type": "unspecified"}),
+    ("recommend 5 decent hotels in Rome", {"target_type": "unspecified"}),
+    ("give me 2 junior suites", {"target_type": "unspecified"}),
+    ("3 mayors of Paris", {"target_type": "unspecified"}),
+])
+def test_parsed(msg, expected):
+    tp = parse_time_expression(msg, BASE)
+    assert tp is not None
+    assert {k: tp[k] for k in expected} == expected
+
+
+def test_coverage_counts_fallbacks():
+    report = coverage(["weather in dec", "tomorrow in Rome"], BASE)
+    assert report["parsed"] == 1
+    assert report["fallback"] == ["weather in dec"]
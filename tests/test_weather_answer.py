@@ -0,0 +1,28 @@
+from graph.helpers.facts_store import put_place
+from graph.helpers.weather_answer import render
+
+DAYS = ["2026-03-14", "2026-03-15"]
+
+
+def _state(units, tmax, tmin):
+    wx = {"timezone": "Europe/Paris", "daily": {
+        "time": DAYS, "temperature_2m_max": tmax, "temperature_2m_min": tmin,
+        "precipitation_probability_max": [10, 60],
+    }}
+    wbp = put_place({}, "Paris", {"name": "Paris", "country": "France"}, wx)
+    return {
+        "intent": "weather",
+        "user_msg": "weather in Paris this weekend?",
+        "data": {"units": units, "facts": {"today": DAYS[0], "target_dates": DAYS, "weather_by_place": wbp}},
+    }
+
+
+def test_metric_is_rendered_locally():
+    answer = render(_state("metric", [22.0, 18.0], [12.0, 9.0]), "Paris", DAYS[0])
+    assert answer.startswith("As of 2026-03-14, Paris looks warm")
+    assert "highs 18–22°C" in answer
+    assert "- 2026-03-15: 18°/9° (precip 60%)" in answer
+
+
+def test_imperial_is_left_to_the_llm():
+    assert render(_state("imperial", [72.0, 64.0], [54.0, 48.0]), "Paris", DAYS[0]) is None
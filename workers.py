@@ -0,0 +1,342 @@
+"""Multi-process worker pool for serving conversations across CPU cores.
+
+Each worker process builds its own compiled graph and keeps the sessions routed to it.
+The dispatcher maps a session id to a worker with crc32(session_id) % workers, so a
+session's checkpoints, caches and history stay in one warm process. Within a worker, turns
+run on a small thread pool so LLM/tool waits overlap.
+
+Workers are recycled gracefully: new requests for the worker wait, in-flight turns finish,
+its sessions are exported, a fresh process is started and the sessions are imported into it.
+WORKER_MAX_TURNS recycles a worker automatically after that many turns (0 = never).
+
+With a session store (graph.session_store) the worker encodes each session's record after a
+turn and the dispatcher writes it, so sessions a worker does not hold (after a restart, or
+moved by a different worker count) are resumed from the store on first use.
+
+A worker that dies is noticed by the requests waiting on it (they poll its liveness every
+WORKER_POLL_S and fail with an error). It is then respawned, and its sessions are resumed from
+the store; without a store they are lost.
+"""
+from __future__ import annotations
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+WORKER_THREADS = int(os.getenv("WORKER_THREADS", "16"))
+WORKER_MAX_TURNS = int(os.getenv("WORKER_MAX_TURNS", "0"))
+WORKER_START_TIMEOUT_S = float(os.getenv("WORKER_START_TIMEOUT_S", "120"))
+WORKER_POLL_S = float(os.getenv("WORKER_POLL_S", "1"))
+
+_STREAM_END = object()
+
+
+def _worker_main(idx: int, requests: "mp.Queue", responses: "mp.Queue", persist: bool = False) -> None:
+    """Worker process loop: control ops inline, turns on a thread pool."""
+    from graph import get_graph
+    from graph.session import ConversationSession
+    from graph.session_store import SessionRecord, encode_record
+    from graph.streaming import stream_turn
+    from graph.warmup import warm_up
+    from telemetry import metrics
+
+    print(f"DEBUG: worker {idx} (pid {os.getpid()}) warm-up: {warm_up()}")
+    graph = get_graph()
+    sessions: Dict[str, ConversationSession] = {}
+    pool = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix=f"w{idx}-turn")
+    turns = itertools.count(1)
+
+    def run_turn(req_id: int, sid: str, msg: str, stream: bool) -> None:
+        try:
+            session = sessions[sid]
+            if stream:
+                for ev in stream_turn(session, msg):
+                    responses.put((req_id, "event", ev))
+                result = {}
+            else:
+                result = {"reply": session.turn(msg), "intent": session.intent}
+            result["turns"] = next(turns)
+            if persist:
+                result["record"] = encode_record(session.sections())
+            responses.put((req_id, "ok", result))
+        except Exception as e:
+            responses.put((req_id, "error", f"{type(e).__name__}: {e}"))
+
+    responses.put((0, "ready", idx))
+    while True:
+        req_id, op, sid, payload = requests.get()
+        try:
+            if op in ("turn", "stream"):
+                pool.submit(run_turn, req_id, sid, payload, op == "stream")
+                continue
+            if op == "create":
+                sessions[sid] = ConversationSession(graph, payload, thread_id=sid)
+                result: Any = encode_record(sessions[sid].sections()) if persist else None
+            elif op == "resume":
+                sessions[sid] = ConversationSession.resume(graph, SessionRecord(payload))
+                result = None
+            elif op == "get":
+                s = sessions[sid]
+                result = {"session_id": sid, "intent": s.intent, "summary": s.summary,
+                          "user_profile": s.user_profile, "history": s.history.hot(),
+                          "history_stats": s.history.stats()}
+            elif op == "delete":
+                result = sessions.pop(sid, None) is not None
+            elif op == "export":
+                result = [s.export() for s in sessions.values()]
+            elif op == "import":
+                for state in payload:
+                    sessions[state["thread_id"]] = ConversationSession.restore(graph, state)
+                result = len(payload)
+            elif op == "stats":
+                result = {"worker": idx, "pid": os.getpid(), "sessions": len(sessions),
+                          "metrics": metrics.snapshot(), "prometheus": metrics.prometheus_text()}
+            elif op == "stop":
+                pool.shutdown(wait=True)
+                responses.put((req_id, "ok", None))
+                return
+            else:
+                raise ValueError(f"unknown op {op}")
+            responses.put((req_id, "ok", result))
+        except Exception as e:
+            responses.put((req_id, "error", f"{type(e).__name__}: {e}"))
+
+
+class _Slot:
+    """Parent-side handle on one worker process, with the drain gate used for recycling."""
+
+    def __init__(self, idx: int):
+        self.idx = idx
+        self.process: Optional[mp.process.BaseProcess] = None
+        self.requests: Optional[mp.Queue] = None
+        # Per worker, so one killed mid-write (holding the queue's lock) cannot block the others
+        self.responses: Optional[mp.Queue] = None
+        self.cond = threading.Condition()
+        self.inflight = 0
+        self.draining = False
+        self.recycling = False
+        self.respawning = False
+        self.sessions: set = set()  # session ids held by the worker, resumed if it is respawned
+
+
+class WorkerPool:
+    def __init__(self, workers: Optional[int] = None, max_turns: int = WORKER_MAX_TURNS, store=None):
+        self._ctx = mp.get_context("spawn")
+        self._pending: Dict[int, queue.Queue] = {}
+        self._pending_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._ready: Dict[int, threading.Event] = {}
+        self.max_turns = max_turns
+        self.store = store  # graph.session_store.SessionStore, written from this process
+        self.slots = [_Slot(i) for i in range(workers or os.cpu_count() or 1)]
+        for slot in self.slots:
+            self._start(slot)
+
+    # --------------------------- processes ---------------------------
+
+    def _start(self, slot: _Slot) -> None:
+        ready = self._ready[slot.idx] = threading.Event()
+        responses = self._ctx.Queue()
+        slot.requests, slot.responses = self._ctx.Queue(), responses
+        threading.Thread(target=self._read_responses, args=(slot, responses),
+                         name=f"pool-responses-{slot.idx}", daemon=True).start()
+        slot.process = self._ctx.Process(
+            target=_worker_main, args=(slot.idx, slot.requests, responses, self.store is not None),
+            name=f"graph-worker-{slot.idx}", daemon=True,
+        )
+        slot.process.start()
+        if not ready.wait(WORKER_START_TIMEOUT_S):
+            raise RuntimeError(f"worker {slot.idx} did not start within {WORKER_START_TIMEOUT_S:.0f}s")
+
+    def _read_responses(self, slot: _Slot, responses: "mp.Queue") -> None:
+        """Route one worker process's responses to the waiting requests until it is replaced."""
+        while True:
+            try:
+                req_id, kind, payload = responses.get(timeout=WORKER_POLL_S)
+            except queue.Empty:
+                if slot.responses is not responses:
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+            if kind == "ready":
+                self._ready[payload].set()
+                continue
+            with self._pending_lock:
+                q = self._pending.get(req_id)
+            if q is not None:
+                q.put((kind, payload))
+
+    # --------------------------- dispatch ----------------------------
+
+    def worker_for(self, sid: str) -> _Slot:
+        return self.slots[zlib.crc32(sid.encode("utf-8")) % len(self.slots)]
+
+    def _call(self, slot: _Slot, op: str, sid: str = "", payload: Any = None, gate: bool = True) -> Iterator[Tuple[str, Any]]:
+        """Send one request and yield its (kind, payload) responses until it completes."""
+        if gate:
+            with slot.cond:
+                while slot.draining:
+                    slot.cond.wait()
+                slot.inflight += 1
+        req_id = next(self._ids)
+        q: queue.Queue = queue.Queue()
+        with self._pending_lock:
+            self._pending[req_id] = q
+        proc = slot.process
+        try:
+            slot.requests.put((req_id, op, sid, payload))
+            while True:
+                try:
+                    kind, body = q.get(timeout=WORKER_POLL_S)
+                except queue.Empty:
+                    if proc.is_alive():
+                        continue
+                    self._worker_died(slot, proc)
+                    yield "error", f"worker process {proc.pid} exited (code {proc.exitcode})"
+                    return
+                yield kind, body
+                if kind != "event":
+                    return
+        finally:
+            with self._pending_lock:
+                self._pending.pop(req_id, None)
+            if gate:
+                with slot.cond:
+                    slot.inflight -= 1
+                    slot.cond.notify_all()
+
+    def _result(self, slot: _Slot, op: str, sid: str = "", payload: Any = None, gate: bool = True) -> Any:
+        for kind, body in self._call(slot, op, sid, payload, gate):
+            if kind == "error":
+                raise RuntimeError(f"worker {slot.idx}: {body}")
+            if kind == "ok":
+                return body
+
+    def _worker_died(self, slot: _Slot, proc: mp.process.BaseProcess) -> None:
+        """Respawn the slot's worker in the background, once per dead process."""
+        with slot.cond:
+            if slot.respawning or slot.process is not proc:
+                return
+            slot.respawning = True
+        threading.Thread(target=self._respawn, args=(slot, proc), daemon=True).start()
+
+    def _respawn(self, slot: _Slot, dead: mp.process.BaseProcess) -> None:
+        with slot.cond:
+            slot.draining = True
+            while slot.inflight:   # requests still waiting on the dead worker fail within WORKER_POLL_S
+                slot.cond.wait()
+        try:
+            dead.join(timeout=5)
+            self._start(slot)
+            resumed = 0
+            for sid in sorted(slot.sessions):
+                blob = self.store.get(sid) if self.store else None
+                if blob is None:
+                    slot.sessions.discard(sid)
+                    continue
+                self._result(slot, "resume", sid, blob, gate=False)
+                resumed += 1
+            print(f"DEBUG: worker {slot.idx} died (exit code {dead.exitcode}); respawned as pid "
+                  f"{slot.process.pid}, {resumed} sessions resumed from the store")
+        except Exception as e:
+            print(f"DEBUG: respawning worker {slot.idx} failed: {e}")
+        finally:
+            with slot.cond:
+                slot.draining = False
+                slot.respawning = False
+                slot.cond.notify_all()
+
+    def _after_turn(self, slot: _Slot, sid: str, result: Dict[str, Any]) -> None:
+        record = result.pop("record", None)
+        if record is not None:
+            self.store.put(sid, record)
+        if self.max_turns and result.get("turns", 0) >= self.max_turns and not slot.recycling:
+            slot.recycling = True
+            threading.Thread(target=self.recycle, args=(slot.idx,), daemon=True).start()
+
+    # ---------------------------- sessions ---------------------------
+
+    def create(self, sid: str, user_profile: Optional[dict] = None) -> None:
+        slot = self.worker_for(sid)
+        record = self._result(slot, "create", sid, user_profile)
+        slot.sessions.add(sid)
+        if record is not None:
+            self.store.put(sid, record)
+
+    def resume(self, sid: str, record: bytes) -> None:
+        """Load a stored session record into the session's worker."""
+        slot = self.worker_for(sid)
+        self._result(slot, "resume", sid, record)
+        slot.sessions.add(sid)
+
+    def get_state(self, sid: str) -> Dict[str, Any]:
+        return self._result(self.worker_for(sid), "get", sid)
+
+    def delete(self, sid: str) -> bool:
+        slot = self.worker_for(sid)
+        slot.sessions.discard(sid)
+        return self._result(slot, "delete", sid)
+
+    def turn(self, sid: str, msg: str) -> Dict[str, Any]:
+        slot = self.worker_for(sid)
+        result = self._result(slot, "turn", sid, msg)
+        self._after_turn(slot, sid, result)
+        return result
+
+    def stream(self, sid: str, msg: str) -> Iterator[Dict[str, Any]]:
+        """Stream one turn's events (see graph.streaming) from the session's worker."""
+        slot = self.worker_for(sid)
+        for kind, body in self._call(slot, "stream", sid, msg):
+            if kind == "event":
+                yield body
+            elif kind == "error":
+                raise RuntimeError(f"worker {slot.idx}: {body}")
+            else:
+                self._after_turn(slot, sid, body)
+
+    # --------------------------- lifecycle ---------------------------
+
+    def recycle(self, idx: int) -> int:
+        """Replace worker `idx` with a fresh process, carrying its sessions over. Returns sessions moved."""
+        slot = self.slots[idx]
+        with slot.cond:
+            slot.draining = True
+            while slot.inflight:
+                slot.cond.wait()
+        try:
+            sessions = self._result(slot, "export", gate=False)
+            self._result(slot, "stop", gate=False)
+            slot.process.join(timeout=30)
+            self._start(slot)
+            moved = self._result(slot, "import", payload=sessions, gate=False)
+            print(f"DEBUG: recycled worker {idx}: {moved} sessions moved to pid {slot.process.pid}")
+            return moved
+        finally:
+            with slot.cond:
+                slot.draining = False
+                slot.recycling = False
+                slot.cond.notify_all()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [self._result(slot, "stats") for slot in self.slots]
+
+    def alive(self) -> List[bool]:
+        return [bool(slot.process and slot.process.is_alive()) for slot in self.slots]
+
+    def close(self, timeout: float = 30) -> None:
+        """Let in-flight turns finish, then stop every worker."""
+        for slot in self.slots:
+            with slot.cond:
+                slot.draining = True
+                while slot.inflight:
+                    slot.cond.wait(timeout)
+            try:
+                self._result(slot, "stop", gate=False)
+            except Exception as e:
+                print(f"DEBUG: worker {slot.idx} did not stop cleanly: {e}")
+            slot.process.join(timeout)